@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Image Caption Batching Benchmark for RAG-Anything
+
+Compares captioning throughput of one vision request per image (the baseline)
+against multi-image requests built by ImageModalProcessor.generate_descriptions_batch.
+Images the batched request cannot describe fall back to single-image calls, as
+in the processing pipeline, and are counted in the batched run.
+
+Usage:
+    python examples/image_caption_batch_benchmark.py fig1.png fig2.jpg ... \\
+        --batch-size 4 --concurrency 2 --repeat 2 --model gpt-4o
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root directory to Python path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lightrag.llm.openai import openai_complete_if_cache
+from lightrag.utils import EmbeddingFunc
+from raganything import RAGAnything, RAGAnythingConfig
+
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=".env", override=False)
+
+
+def image_items(files):
+    """Build minimal content-list image items for the given files"""
+    return [
+        {
+            "type": "image",
+            "img_path": str(Path(f).resolve()),
+            "image_caption": [],
+            "image_footnote": [],
+        }
+        for f in files
+    ]
+
+
+async def run_single(processor, items, concurrency: int):
+    """Caption every image with its own request"""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def describe(item):
+        async with semaphore:
+            try:
+                await processor.generate_description_only(item, "image")
+            except Exception as e:
+                failures.append((item["img_path"], str(e)))
+
+    start = time.time()
+    await asyncio.gather(*(describe(item) for item in items))
+    return time.time() - start, failures
+
+
+async def run_batched(
+    processor, items, batch_size: int, concurrency: int, max_image_kb: int
+):
+    """Caption images in multi-image requests, with single-image fallbacks"""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+    fallbacks = 0
+
+    async def describe_batch(batch):
+        nonlocal fallbacks
+        async with semaphore:
+            try:
+                described = await processor.generate_descriptions_batch(
+                    [(item, None) for item in batch], max_image_kb=max_image_kb
+                )
+            except Exception as e:
+                failures.extend((item["img_path"], str(e)) for item in batch)
+                return
+        for item, description in zip(batch, described):
+            if description is not None:
+                continue
+            fallbacks += 1
+            async with semaphore:
+                try:
+                    await processor.generate_description_only(item, "image")
+                except Exception as e:
+                    failures.append((item["img_path"], str(e)))
+
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+    start = time.time()
+    await asyncio.gather(*(describe_batch(batch) for batch in batches))
+    return time.time() - start, failures, fallbacks
+
+
+def report(label: str, elapsed: float, count: int, calls: int, failures):
+    print(
+        f"{label:<10} {count} images in {elapsed:8.2f}s "
+        f"({count / elapsed if elapsed else 0:.2f} images/s, {calls} model calls, "
+        f"{len(failures)} failed)"
+    )
+    for image_path, error in failures:
+        print(f"    ✗ {Path(image_path).name}: {error}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark single-image vs multi-image caption requests"
+    )
+    parser.add_argument("files", nargs="+", help="Image files to caption")
+    parser.add_argument(
+        "--batch-size", type=int, default=4, help="Images per batched request"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=2, help="Concurrent model requests"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Times to repeat the file list"
+    )
+    parser.add_argument(
+        "--max-image-kb",
+        type=int,
+        default=512,
+        help="Largest image that may share a request",
+    )
+    parser.add_argument(
+        "--model", default=os.getenv("VISION_MODEL", "gpt-4o"), help="Vision model"
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.getenv("LLM_BINDING_API_KEY"),
+        help="OpenAI API key (defaults to LLM_BINDING_API_KEY env var)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.getenv("LLM_BINDING_HOST"),
+        help="Optional base URL for API",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if not args.api_key:
+        print("An API key is required (--api-key or LLM_BINDING_API_KEY)")
+        return 1
+
+    def vision_model_func(
+        prompt,
+        system_prompt=None,
+        history_messages=[],
+        image_data=None,
+        messages=None,
+        **kwargs,
+    ):
+        if messages is None:
+            content = [{"type": "text", "text": prompt}]
+            if image_data:
+                content.append(
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpeg;base64,{image_data}"},
+                    }
+                )
+            messages = [{"role": "user", "content": content}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+        return openai_complete_if_cache(
+            args.model,
+            "",
+            messages=messages,
+            api_key=args.api_key,
+            base_url=args.base_url,
+            **kwargs,
+        )
+
+    async def unused_embedding(texts):
+        # Captioning never embeds; LightRAG only needs a function to start
+        return np.zeros((len(texts), 8))
+
+    working_dir = Path(tempfile.mkdtemp(prefix="caption_bench_"))
+    rag = RAGAnything(
+        config=RAGAnythingConfig(
+            working_dir=str(working_dir),
+            enable_caption_cache=False,
+        ),
+        llm_model_func=vision_model_func,
+        vision_model_func=vision_model_func,
+        embedding_func=EmbeddingFunc(
+            embedding_dim=8, max_token_size=8192, func=unused_embedding
+        ),
+    )
+
+    try:
+        await rag._ensure_lightrag_initialized()
+        processor = rag.modal_processors["image"]
+        items = image_items(args.files) * args.repeat
+
+        calls = processor.prompt_stats["calls"]
+        elapsed, failures = await run_single(processor, items, args.concurrency)
+        report(
+            "single",
+            elapsed,
+            len(items),
+            processor.prompt_stats["calls"] - calls,
+            failures,
+        )
+        single_rate = len(items) / elapsed if elapsed else 0
+
+        calls = processor.prompt_stats["calls"]
+        elapsed, failures, fallbacks = await run_batched(
+            processor, items, args.batch_size, args.concurrency, args.max_image_kb
+        )
+        report(
+            "batched",
+            elapsed,
+            len(items),
+            processor.prompt_stats["calls"] - calls,
+            failures,
+        )
+        batched_rate = len(items) / elapsed if elapsed else 0
+        print(f"Single-image fallbacks in batched run: {fallbacks}")
+        if single_rate:
+            print(f"Speedup over one image per call: {batched_rate / single_rate:.2f}x")
+    finally:
+        await rag.finalize_storages()
+        shutil.rmtree(working_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+MinerU Worker Pool Benchmark for RAG-Anything
+
+Compares parsing throughput of the cold mineru CLI (one process per file, models
+reloaded every time) against the warm worker pool (models loaded once per worker).
+
+Usage:
+    python examples/mineru_worker_pool_benchmark.py doc1.pdf doc2.pdf ... \\
+        --workers 2 --concurrency 2 --repeat 2
+"""
+
+import argparse
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root directory to Python path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from raganything.parser import MineruParser
+from raganything.mineru_worker import (
+    configure_mineru_worker_pool,
+    get_mineru_worker_pool,
+    shutdown_mineru_worker_pool,
+)
+
+
+async def run_batch(files, output_root: Path, concurrency: int, method: str):
+    """Parse all files with bounded concurrency and return (elapsed, failures)"""
+    parser = MineruParser()
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def parse_one(index: int, file_path: Path):
+        async with semaphore:
+            try:
+                await parser.parse_pdf(
+                    pdf_path=file_path,
+                    output_dir=str(output_root / f"run_{index}"),
+                    method=method,
+                )
+            except Exception as e:
+                failures.append((file_path, str(e)))
+
+    start = time.time()
+    await asyncio.gather(*(parse_one(i, f) for i, f in enumerate(files)))
+    return time.time() - start, failures
+
+
+def report(label: str, elapsed: float, count: int, failures):
+    print(
+        f"{label:<12} {count} files in {elapsed:8.2f}s "
+        f"({count / elapsed if elapsed else 0:.2f} files/s, {len(failures)} failed)"
+    )
+    for file_path, error in failures:
+        print(f"    ✗ {file_path.name}: {error}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark cold MinerU CLI vs warm worker pool"
+    )
+    parser.add_argument("files", nargs="+", help="PDF files to parse")
+    parser.add_argument("--workers", type=int, default=1, help="Worker pool size")
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Concurrent parse jobs"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Times to repeat the file list"
+    )
+    parser.add_argument(
+        "--method", default="auto", help="Parsing method (auto, txt, ocr)"
+    )
+    parser.add_argument("--keep-output", action="store_true", help="Keep parser output")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    files = [Path(f) for f in args.files] * args.repeat
+    output_root = Path(tempfile.mkdtemp(prefix="mineru_bench_"))
+    print(f"Output directory: {output_root}")
+
+    try:
+        # Cold CLI: make sure no pool is active
+        shutdown_mineru_worker_pool()
+        elapsed, failures = await run_batch(
+            files, output_root / "cli", args.concurrency, args.method
+        )
+        report("cold CLI", elapsed, len(files), failures)
+
+        # Warm pool: start the workers first so model loading is reported separately
+        pool = configure_mineru_worker_pool(args.workers)
+        start = time.time()
+        await asyncio.to_thread(pool.start)
+        if get_mineru_worker_pool() is None:
+            print(
+                "Worker pool could not start (is MinerU importable in this environment?)"
+            )
+            return 1
+        print(
+            f"{'pool start':<12} {args.workers} workers in {time.time() - start:8.2f}s"
+        )
+
+        elapsed, failures = await run_batch(
+            files, output_root / "pool", args.concurrency, args.method
+        )
+        report("warm pool", elapsed, len(files), failures)
+        print(f"Pool stats: {pool.stats}")
+    finally:
+        shutdown_mineru_worker_pool()
+        if not args.keep_output:
+            shutil.rmtree(output_root, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
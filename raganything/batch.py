@@ -26,6 +26,9 @@ class BatchMixin:
     # Type hints for methods that will be available from other mixins
     async def _ensure_lightrag_initialized(self) -> None: ...
     async def process_document_complete(self, file_path: str, **kwargs) -> None: ...
+    async def parse_documents_grouped(
+        self, file_paths: List[str], **kwargs
+    ) -> Dict[str, str]: ...
 
     # ==========================================
     # ORIGINAL BATCH PROCESSING METHOD (RESTORED)
@@ -98,6 +101,15 @@ class BatchMixin:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # Parse files in shared MinerU invocations first; results land in the parse cache
+        if self.config.mineru_group_size > 1:
+            await self.parse_documents_grouped(
+                [str(file_path) for file_path in files_to_process],
+                output_dir=output_dir,
+                parse_method=parse_method,
+                max_concurrent_groups=max_workers,
+            )
+
         # Process files with controlled concurrency
         semaphore = asyncio.Semaphore(max_workers)
         tasks = []
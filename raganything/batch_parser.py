@@ -15,7 +15,7 @@ import time
 
 from tqdm import tqdm
 
-from .parser import MineruParser, DoclingParser
+from .parser import get_parser
 
 
 @dataclass
@@ -63,30 +63,28 @@ class BatchParser:
         show_progress: bool = True,
         timeout_per_file: int = 300,
         skip_installation_check: bool = False,
+        group_size: int = 1,
     ):
         """
         Initialize batch parser
 
         Args:
-            parser_type: Type of parser to use ("mineru" or "docling")
+            parser_type: Type of parser to use ("mineru", "docling" or "pymupdf")
             max_workers: Maximum number of parallel workers
             show_progress: Whether to show progress bars
             timeout_per_file: Timeout in seconds for each file
             skip_installation_check: Skip parser installation check (useful for testing)
+            group_size: Number of files parsed by one MinerU invocation (1 disables grouping)
         """
         self.parser_type = parser_type
         self.max_workers = max_workers
         self.show_progress = show_progress
         self.timeout_per_file = timeout_per_file
+        self.group_size = group_size if parser_type == "mineru" else 1
         self.logger = logging.getLogger(__name__)
 
         # Initialize parser
-        if parser_type == "mineru":
-            self.parser = MineruParser()
-        elif parser_type == "docling":
-            self.parser = DoclingParser()
-        else:
-            raise ValueError(f"Unsupported parser type: {parser_type}")
+        self.parser = get_parser(parser_type)
 
         # Check parser installation (optional)
         if not skip_installation_check:
@@ -185,6 +183,9 @@ class BatchParser:
                 method=parse_method,
                 **kwargs,
             )
+            if asyncio.iscoroutine(content_list):
+                # MinerU parsing is asynchronous; each worker thread runs its own loop
+                content_list = asyncio.run(content_list)
 
             processing_time = time.time() - start_time
 
@@ -200,6 +201,64 @@ class BatchParser:
             self.logger.error(error_msg)
             return False, file_path, error_msg
 
+    def process_file_group(
+        self,
+        file_paths: List[str],
+        output_dir: str,
+        parse_method: str = "auto",
+        **kwargs,
+    ) -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Process a group of files with a single MinerU invocation
+
+        Files that fail inside the group are retried one by one.
+
+        Args:
+            file_paths: Paths of the files in the group
+            output_dir: Output directory
+            parse_method: Parsing method
+            **kwargs: Additional parser arguments
+
+        Returns:
+            List of (success, file_path, error_message) tuples
+        """
+        if len(file_paths) == 1:
+            return [
+                self.process_single_file(
+                    file_paths[0], output_dir, parse_method, **kwargs
+                )
+            ]
+
+        try:
+            start_time = time.time()
+            results, errors = asyncio.run(
+                self.parser.parse_file_group(
+                    file_paths,
+                    output_dir=output_dir,
+                    method=parse_method,
+                    **kwargs,
+                )
+            )
+            processing_time = time.time() - start_time
+            self.logger.info(
+                f"Processed group of {len(file_paths)} files in {processing_time:.2f}s"
+            )
+        except Exception as e:
+            error_msg = f"Failed to process group: {str(e)}"
+            self.logger.error(error_msg)
+            return [(False, file_path, error_msg) for file_path in file_paths]
+
+        outcomes = []
+        for file_path in file_paths:
+            key = str(Path(file_path))
+            if key in results:
+                outcomes.append((True, file_path, None))
+            else:
+                error_msg = f"Failed to process {file_path}: {errors.get(key)}"
+                self.logger.error(error_msg)
+                outcomes.append((False, file_path, error_msg))
+        return outcomes
+
     def process_batch(
         self,
         file_paths: List[str],
@@ -257,45 +316,60 @@ class BatchParser:
                 unit="file",
             )
 
+        # Group files so that one MinerU invocation serves several documents
+        if self.group_size > 1:
+            groups = [
+                [str(p) for p in group]
+                for group in self.parser.make_file_groups(
+                    supported_files, self.group_size
+                )
+            ]
+            self.logger.info(
+                f"Grouped {len(supported_files)} files into {len(groups)} MinerU invocations"
+            )
+        else:
+            groups = [[file_path] for file_path in supported_files]
+
+        future_to_group = {}
         try:
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 # Submit all tasks
-                future_to_file = {
+                future_to_group = {
                     executor.submit(
-                        self.process_single_file,
-                        file_path,
+                        self.process_file_group,
+                        group,
                         output_dir,
                         parse_method,
                         **kwargs,
-                    ): file_path
-                    for file_path in supported_files
+                    ): group
+                    for group in groups
                 }
 
                 # Process completed tasks
                 for future in as_completed(
-                    future_to_file, timeout=self.timeout_per_file
+                    future_to_group,
+                    timeout=self.timeout_per_file * max(len(g) for g in groups),
                 ):
-                    success, file_path, error_msg = future.result()
+                    for success, file_path, error_msg in future.result():
+                        if success:
+                            successful_files.append(file_path)
+                        else:
+                            failed_files.append(file_path)
+                            errors[file_path] = error_msg
 
-                    if success:
-                        successful_files.append(file_path)
-                    else:
-                        failed_files.append(file_path)
-                        errors[file_path] = error_msg
-
-                    if pbar:
-                        pbar.update(1)
+                        if pbar:
+                            pbar.update(1)
 
         except Exception as e:
             self.logger.error(f"Batch processing failed: {str(e)}")
             # Mark remaining files as failed
-            for future in future_to_file:
+            for future in future_to_group:
                 if not future.done():
-                    file_path = future_to_file[future]
-                    failed_files.append(file_path)
-                    errors[file_path] = f"Processing interrupted: {str(e)}"
-                    if pbar:
-                        pbar.update(1)
+                    for file_path in future_to_group[future]:
+                        failed_files.append(file_path)
+                        errors[file_path] = f"Processing interrupted: {str(e)}"
+                        if pbar:
+                            pbar.update(1)
 
         finally:
             if pbar:
@@ -361,7 +435,7 @@ def main():
     parser.add_argument("--output", "-o", required=True, help="Output directory")
     parser.add_argument(
         "--parser",
-        choices=["mineru", "docling"],
+        choices=["mineru", "docling", "pymupdf"],
         default="mineru",
         help="Parser to use",
     )
@@ -386,6 +460,12 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=300, help="Timeout per file (seconds)"
     )
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=1,
+        help="Files per MinerU invocation (1 disables grouping)",
+    )
 
     args = parser.parse_args()
 
@@ -402,6 +482,7 @@ def main():
             max_workers=args.workers,
             show_progress=not args.no_progress,
             timeout_per_file=args.timeout,
+            group_size=args.group_size,
         )
 
         # Process files
@@ -0,0 +1,250 @@
+"""
+Content-addressed cache of multimodal caption responses
+
+Captions are keyed by a digest of the item itself (image bytes, or the table or
+equation body with its captions) together with the prompt template, the
+caption model and, optionally, the surrounding context. A logo, banner or
+boilerplate table that recurs across documents is therefore captioned once;
+later occurrences reuse the stored model response without calling the model.
+
+Entries live in a LightRAG KV storage namespace and are evicted least recently
+used first once ``max_entries`` is exceeded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from lightrag.utils import logger
+
+# Bump when the key layout or stored value format changes
+CAPTION_CACHE_VERSION = "1"
+
+
+def _digest(*parts: Any) -> str:
+    """Stable SHA-256 digest of the given parts"""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(str(part).encode("utf-8", errors="replace"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def content_digest(*parts: Any) -> str:
+    """Digest identifying a multimodal item by its content
+
+    Args:
+        *parts: Content fields of the item (image byte digest, table body,
+            captions, footnotes, ...)
+
+    Returns:
+        Hex digest of the parts
+    """
+    return _digest(*parts)
+
+
+class CaptionCache:
+    """
+    Persistent caption cache on top of a LightRAG KV storage
+
+    Concurrent requests for the same key share a single model call, so
+    duplicates within one document are also captioned only once.
+    """
+
+    def __init__(
+        self,
+        storage,
+        model_name: str,
+        include_context: bool = True,
+        max_entries: int = 0,
+        flush_interval: float = 10.0,
+    ):
+        """Initialize the caption cache
+
+        Args:
+            storage: Initialized LightRAG KV storage for the cache entries
+            model_name: Caption model identifier, part of every key. It cannot
+                be derived from the model function, whose name stays the same
+                when the model behind it changes
+            include_context: Whether the surrounding context is part of the key
+            max_entries: Maximum number of entries before LRU eviction (0 = unlimited)
+            flush_interval: Minimum seconds between writes of the storage
+        """
+        if not model_name:
+            raise ValueError("CaptionCache requires an explicit model_name")
+        self.storage = storage
+        self.model_name = model_name
+        self.include_context = include_context
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        self._entry_count: Optional[int] = None
+        self._last_flush = 0.0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def make_key(
+        self,
+        item_digest: str,
+        prompt_template: str,
+        system_prompt: str,
+        context: str = "",
+        entity_name: Optional[str] = None,
+        model_name: Optional[str] = None,
+    ) -> str:
+        """Build the cache key for one caption request
+
+        Args:
+            item_digest: Digest of the item content (see ``content_digest``)
+            prompt_template: Unformatted prompt template used for the request;
+                hashing the template versions the key with the prompt text
+            system_prompt: System prompt of the request
+            context: Surrounding context sent with the item
+            entity_name: Entity name imposed by the caller, if any
+            model_name: Caption model identifier (defaults to ``self.model_name``)
+
+        Returns:
+            Cache key
+        """
+        context_fingerprint = _digest(context) if self.include_context else ""
+        return "caption-" + _digest(
+            CAPTION_CACHE_VERSION,
+            item_digest,
+            _digest(prompt_template, system_prompt),
+            model_name if model_name is not None else self.model_name,
+            entity_name or "",
+            context_fingerprint,
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` and refresh its LRU position
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        cached = await self.storage.get_by_id(key)
+        if not cached or not isinstance(cached.get("response"), str):
+            return None
+        self.stats["hits"] += 1
+        await self.storage.upsert(
+            {
+                key: {
+                    "response": cached["response"],
+                    "cached_at": cached.get("cached_at", time.time()),
+                    "last_access": time.time(),
+                }
+            }
+        )
+        await self._flush()
+        return cached["response"]
+
+    async def put(self, key: str, response: str) -> None:
+        """Store a response obtained outside ``get_or_call``
+
+        Args:
+            key: Key from ``make_key``
+            response: Model response for the request
+        """
+        self.stats["misses"] += 1
+        if isinstance(response, str) and response.strip():
+            await self._store(key, response)
+
+    async def get_or_call(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached response for ``key`` or call the model and store it
+
+        Args:
+            key: Key from ``make_key``
+            call: Coroutine function performing the model call
+
+        Returns:
+            The model response
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["hits"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await call()
+            # Store before leaving the in-flight table so that no concurrent
+            # request for this key falls between the two and calls the model
+            if isinstance(response, str) and response.strip():
+                await self._store(key, response)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unawaited future does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(response)
+        return response
+
+    async def _store(self, key: str, response: str) -> None:
+        """Store a response and evict old entries when over budget"""
+        now = time.time()
+        await self.storage.upsert(
+            {key: {"response": response, "cached_at": now, "last_access": now}}
+        )
+        self.stats["stores"] += 1
+
+        if self.max_entries > 0:
+            if self._entry_count is None:
+                self._entry_count = len(await self.storage.get_all())
+            else:
+                self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                await self._evict(keep=key)
+
+        await self._flush()
+
+    async def _evict(self, keep: str) -> None:
+        """Evict least recently used entries down to 90% of ``max_entries``
+
+        Evicting below the limit amortizes the full scan over many stores.
+
+        Args:
+            keep: Key that must not be evicted (the entry just stored)
+        """
+        entries = sorted(
+            (await self.storage.get_all()).items(),
+            key=lambda item: item[1].get("last_access", item[1].get("cached_at", 0)),
+        )
+        target = max(1, int(self.max_entries * 0.9))
+        excess = len(entries) - target
+        evicted = [key for key, _ in entries if key != keep][: max(0, excess)]
+
+        if evicted:
+            await self.storage.delete(evicted)
+            self.stats["evictions"] += len(evicted)
+            logger.info(f"Evicted {len(evicted)} caption cache entries")
+        self._entry_count = len(entries) - len(evicted)
+
+    async def _flush(self, force: bool = False) -> None:
+        """Persist the storage, at most once per flush interval"""
+        now = time.time()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        await self.storage.index_done_callback()
+
+    async def finalize(self) -> None:
+        """Write pending changes and finalize the storage"""
+        await self.storage.finalize()
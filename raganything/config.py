@@ -18,6 +18,22 @@ class RAGAnythingConfig:
     working_dir: str = field(default=get_env_value("WORKING_DIR", "./rag_storage", str))
     """Directory where RAG storage and cache files are stored."""
 
+    parse_cache_dir: str = field(default=get_env_value("PARSE_CACHE_DIR", "", str))
+    """Directory for a parse cache shared by all RAGAnything instances and processes on the host, one file per entry (empty = keep the cache in working_dir)."""
+
+    parse_cache_max_entries: int = field(
+        default=get_env_value("PARSE_CACHE_MAX_ENTRIES", 0, int)
+    )
+    """Maximum number of cached parse results before least recently used entries are evicted (0 = unlimited)."""
+
+    parse_cache_max_mb: int = field(default=get_env_value("PARSE_CACHE_MAX_MB", 1024, int))
+    """Maximum compressed size in MB of cached parse results before least recently used entries are evicted (0 = unlimited)."""
+
+    parse_cache_flush_interval: float = field(
+        default=get_env_value("PARSE_CACHE_FLUSH_INTERVAL", 10.0, float)
+    )
+    """Minimum seconds between writes of the parse and caption cache indexes; pending changes are also written on finalize."""
+
     # Parser Configuration
     # ---
     parse_method: str = field(default=get_env_value("PARSE_METHOD", "auto", str))
@@ -27,13 +43,23 @@ class RAGAnythingConfig:
     """Default output directory for parsed content."""
 
     parser: str = field(default=get_env_value("PARSER", "mineru", str))
-    """Parser selection: 'mineru' or 'docling'."""
+    """Parser selection: 'mineru', 'docling' or 'pymupdf' (text-layer PDFs, no ML models)."""
 
     display_content_stats: bool = field(
         default=get_env_value("DISPLAY_CONTENT_STATS", True, bool)
     )
     """Whether to display content statistics during parsing."""
 
+    native_text_parsing: bool = field(
+        default=get_env_value("NATIVE_TEXT_PARSING", True, bool)
+    )
+    """Parse .txt/.md files directly into content blocks instead of rendering them to PDF and running the parser."""
+
+    native_office_parsing: bool = field(
+        default=get_env_value("NATIVE_OFFICE_PARSING", False, bool)
+    )
+    """Extract .docx/.pptx/.xlsx files directly with python-docx, python-pptx and openpyxl instead of converting them to PDF."""
+
     # MinerU API Configuration
     # ---
     mineru_use_api: bool = field(default=get_env_value("MINERU_USE_API", False, bool))
@@ -45,6 +71,136 @@ class RAGAnythingConfig:
     mineru_api_key: str = field(default=get_env_value("MINERU_API_KEY", None, str))
     """MinerU API key for authentication (optional for local service)."""
 
+    mineru_api_batch_size: int = field(
+        default=get_env_value("MINERU_API_BATCH_SIZE", 50, int)
+    )
+    """Maximum number of files submitted to the MinerU cloud API in one batch request."""
+
+    mineru_api_batch_window: float = field(
+        default=get_env_value("MINERU_API_BATCH_WINDOW", 1.0, float)
+    )
+    """Seconds to wait for more files before submitting a MinerU cloud API batch."""
+
+    mineru_api_upload_concurrency: int = field(
+        default=get_env_value("MINERU_API_UPLOAD_CONCURRENCY", 4, int)
+    )
+    """Maximum number of concurrent file uploads to the MinerU cloud API."""
+
+    mineru_api_poll_max_interval: float = field(
+        default=get_env_value("MINERU_API_POLL_MAX_INTERVAL", 30.0, float)
+    )
+    """Upper bound in seconds for the adaptive MinerU cloud API result polling interval."""
+
+    mineru_api_timeout: float = field(
+        default=get_env_value("MINERU_API_TIMEOUT", 600.0, float)
+    )
+    """Seconds to wait for a MinerU cloud API extraction result before giving up."""
+
+    # MinerU Performance Configuration
+    # ---
+    mineru_worker_pool_size: int = field(
+        default=get_env_value("MINERU_WORKER_POOL_SIZE", 0, int)
+    )
+    """Number of persistent MinerU worker processes that keep models loaded (0 uses the CLI for every file)."""
+
+    mineru_worker_max_jobs: int = field(
+        default=get_env_value("MINERU_WORKER_MAX_JOBS", 50, int)
+    )
+    """Restart a MinerU worker after this many parse jobs (0 disables recycling)."""
+
+    mineru_group_size: int = field(default=get_env_value("MINERU_GROUP_SIZE", 1, int))
+    """Number of files parsed by one MinerU CLI invocation in folder processing (1 disables grouping)."""
+
+    pdf_preflight: bool = field(default=get_env_value("PDF_PREFLIGHT", False, bool))
+    """Probe PDF pages before parsing with method 'auto': text-layer pages use 'txt', the rest 'ocr'."""
+
+    pdf_preflight_min_chars: int = field(
+        default=get_env_value("PDF_PREFLIGHT_MIN_CHARS", 50, int)
+    )
+    """Characters a page's text layer needs for the page to be parsed with 'txt'."""
+
+    pdf_preflight_max_image_coverage: float = field(
+        default=get_env_value("PDF_PREFLIGHT_MAX_IMAGE_COVERAGE", 0.5, float)
+    )
+    """Fraction of a page covered by images above which the page is parsed with 'ocr'."""
+
+    pdf_preflight_min_range_pages: int = field(
+        default=get_env_value("PDF_PREFLIGHT_MIN_RANGE_PAGES", 8, int)
+    )
+    """Shortest run of text-layer pages parsed as its own 'txt' range; shorter runs are OCRed with their neighbours."""
+
+    pdf_preflight_max_ranges: int = field(
+        default=get_env_value("PDF_PREFLIGHT_MAX_RANGES", 8, int)
+    )
+    """Most page ranges a pre-flight plan may have before the PDF is parsed as a single 'auto' run."""
+
+    # Office Conversion Configuration
+    # ---
+    office_converter_pool_size: int = field(
+        default=get_env_value("OFFICE_CONVERTER_POOL_SIZE", 0, int)
+    )
+    """Number of persistent headless LibreOffice processes for Office-to-PDF conversion (0 = start LibreOffice per document)."""
+
+    office_converter_max_jobs: int = field(
+        default=get_env_value("OFFICE_CONVERTER_MAX_JOBS", 200, int)
+    )
+    """Conversions after which a LibreOffice process is restarted to bound memory growth."""
+
+    office_converter_max_pending: int = field(
+        default=get_env_value("OFFICE_CONVERTER_MAX_PENDING", 16, int)
+    )
+    """Conversions allowed to wait for a free LibreOffice process before falling back to the CLI."""
+
+    # Image Preprocessing Configuration
+    # ---
+    image_ocr_max_edge: int = field(
+        default=get_env_value("IMAGE_OCR_MAX_EDGE", 4096, int)
+    )
+    """Downscale image files longer than this many pixels before OCR (0 = keep full resolution)."""
+
+    image_vlm_max_edge: int = field(
+        default=get_env_value("IMAGE_VLM_MAX_EDGE", 2048, int)
+    )
+    """Downscale images longer than this many pixels before sending them to the vision model (0 = keep full resolution)."""
+
+    image_vlm_format: str = field(
+        default=get_env_value("IMAGE_VLM_FORMAT", "jpeg", str)
+    )
+    """Encoding for vision-model image payloads: 'jpeg', 'webp' or 'png'."""
+
+    image_vlm_quality: int = field(
+        default=get_env_value("IMAGE_VLM_QUALITY", 85, int)
+    )
+    """JPEG/WebP quality for vision-model image payloads (1-100)."""
+
+    image_cache_max_mb: int = field(
+        default=get_env_value("IMAGE_CACHE_MAX_MB", 128, int)
+    )
+    """Memory budget in MB for preprocessed images cached by content hash."""
+
+    # Large Document Configuration
+    # ---
+    mineru_shard_pages: int = field(default=get_env_value("MINERU_SHARD_PAGES", 0, int))
+    """Split PDFs longer than this many pages into page-range shards parsed concurrently (0 disables sharding)."""
+
+    mineru_max_shard_workers: int = field(
+        default=get_env_value("MINERU_MAX_SHARD_WORKERS", 4, int)
+    )
+    """Maximum number of PDF shards parsed at the same time."""
+
+    stream_processing: bool = field(
+        default=get_env_value("STREAM_PROCESSING", False, bool)
+    )
+    """Start multimodal captioning while a document is still being parsed (most useful with PDF sharding)."""
+
+    stream_buffer_size: int = field(default=get_env_value("STREAM_BUFFER_SIZE", 32, int))
+    """Maximum number of parsed multimodal items buffered ahead of the captioning workers."""
+
+    incremental_reingest: bool = field(
+        default=get_env_value("INCREMENTAL_REINGEST", False, bool)
+    )
+    """Fingerprint pages and multimodal blocks so a modified file only re-processes what changed (text is chunked per page)."""
+
     # Multimodal Processing Configuration
     # ---
     enable_image_processing: bool = field(
@@ -62,6 +218,54 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    enable_caption_cache: bool = field(
+        default=get_env_value("ENABLE_CAPTION_CACHE", False, bool)
+    )
+    """Reuse stored model responses for images, tables and equations with identical content (requires caption_model_name)."""
+
+    caption_cache_include_context: bool = field(
+        default=get_env_value("CAPTION_CACHE_INCLUDE_CONTEXT", True, bool)
+    )
+    """Whether the surrounding context is part of the caption cache key; disable to reuse captions of recurring items across documents."""
+
+    caption_cache_max_entries: int = field(
+        default=get_env_value("CAPTION_CACHE_MAX_ENTRIES", 50000, int)
+    )
+    """Maximum number of cached captions before least recently used entries are evicted (0 = unlimited)."""
+
+    caption_model_name: str = field(default=get_env_value("CAPTION_MODEL_NAME", "", str))
+    """Caption model identifier used in caption cache keys; change it whenever the caption models change."""
+
+    enable_image_dedup: bool = field(
+        default=get_env_value("ENABLE_IMAGE_DEDUP", False, bool)
+    )
+    """Caption one representative per group of near-duplicate images in a document and share its description with the others."""
+
+    image_dedup_max_distance: int = field(
+        default=get_env_value("IMAGE_DEDUP_MAX_DISTANCE", 4, int)
+    )
+    """Maximum Hamming distance between 64-bit perceptual hashes for images to count as near-duplicates."""
+
+    image_caption_batch_size: int = field(
+        default=get_env_value("IMAGE_CAPTION_BATCH_SIZE", 1, int)
+    )
+    """Number of images packed into one multi-image vision request (1 = one request per image)."""
+
+    image_caption_batch_max_kb: int = field(
+        default=get_env_value("IMAGE_CAPTION_BATCH_MAX_KB", 512, int)
+    )
+    """Largest encoded image in KB that may share a multi-image request; larger images are captioned alone."""
+
+    llm_analysis_batch_size: int = field(
+        default=get_env_value("LLM_ANALYSIS_BATCH_SIZE", 1, int)
+    )
+    """Number of equations or small tables analyzed together in one LLM request (1 = one request per item)."""
+
+    batch_table_max_chars: int = field(
+        default=get_env_value("BATCH_TABLE_MAX_CHARS", 2000, int)
+    )
+    """Longest table body in characters that may share a batched LLM request; larger tables are analyzed alone."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -114,6 +318,14 @@ class RAGAnythingConfig:
     content_format: str = field(default=get_env_value("CONTENT_FORMAT", "minerU", str))
     """Default content format for context extraction when processing documents."""
 
+    prompt_layout: str = field(default=get_env_value("PROMPT_LAYOUT", "default", str))
+    """Caption prompt layout: 'default' interleaves item fields with context, 'context_first' puts the shared page context first as a stable, cacheable prefix and schedules items page by page."""
+
+    prompt_token_stats: bool = field(
+        default=get_env_value("PROMPT_TOKEN_STATS", False, bool)
+    )
+    """Estimate prompt and shared-prefix token counts of caption calls (tokenizes every prompt; also on with debug logging)."""
+
     def __post_init__(self):
         """Post-initialization setup for backward compatibility"""
         # Support legacy environment variable names for backward compatibility
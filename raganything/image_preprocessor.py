@@ -0,0 +1,496 @@
+"""
+Shared image preprocessing for OCR and vision-model payloads
+
+Images are decoded once, EXIF-rotated, downscaled to a maximum edge length and
+re-encoded in memory. Results are cached by a hash of the source bytes, so the
+parse, caption and VLM-query paths reuse the same optimized bytes instead of
+re-reading (and re-sending) multi-megabyte originals.
+
+Pillow is optional: without it images are passed through unchanged, except for
+formats MinerU cannot read, which still require conversion.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Formats MinerU reads directly; everything else is converted before OCR
+OCR_NATIVE_FORMATS = {".png", ".jpeg", ".jpg"}
+
+# Formats vision models accept as-is when no resizing is needed
+VLM_NATIVE_FORMATS = {"JPEG", "PNG"}
+
+# Pillow save arguments for each VLM encoding
+_VLM_SAVE_OPTIONS = {
+    "jpeg": ("JPEG", {"optimize": False, "progressive": False}),
+    "webp": ("WEBP", {"method": 4}),
+    "png": ("PNG", {"compress_level": 3}),
+}
+
+# Base64 prefixes of common image file signatures
+_BASE64_SIGNATURES = [
+    ("/9j/", "image/jpeg"),
+    ("iVBORw0KGgo", "image/png"),
+    ("UklGR", "image/webp"),
+    ("R0lGOD", "image/gif"),
+]
+
+# EXIF orientation tag
+_ORIENTATION_TAG = 0x0112
+
+# Difference hash grid (8x8 = 64 bits) and decode size for hashing
+_DHASH_SIZE = 8
+_DHASH_DECODE_EDGE = 256
+
+
+class ImagePreprocessor:
+    """
+    Downscale, orientation-fix and re-encode images with a content-hash cache
+
+    Two outputs are produced on demand:
+
+    - ``prepare_for_ocr`` returns a file path MinerU can read. Images that are
+      already in a native format, upright and within ``ocr_max_edge`` are
+      returned unchanged; others are written once to a private cache directory.
+    - ``encode_for_vlm`` returns base64 bytes for a vision model, downscaled to
+      ``vlm_max_edge`` and re-encoded as ``vlm_format``.
+
+    Encoded payloads are kept in an LRU cache bounded by ``cache_max_bytes``.
+    ``perceptual_hash`` provides a difference hash for near-duplicate detection.
+    """
+
+    # Originals below this size are sent to the VLM untouched when they need
+    # no resizing or rotation, since re-encoding them saves little
+    PASSTHROUGH_BYTES = 512 * 1024
+
+    def __init__(
+        self,
+        ocr_max_edge: int = 4096,
+        vlm_max_edge: int = 2048,
+        vlm_format: str = "jpeg",
+        vlm_quality: int = 85,
+        cache_max_bytes: int = 128 * 1024 * 1024,
+    ):
+        """
+        Args:
+            ocr_max_edge: Longest edge in pixels for images sent to OCR (0 = no limit)
+            vlm_max_edge: Longest edge in pixels for VLM payloads (0 = no limit)
+            vlm_format: Encoding for VLM payloads: "jpeg", "webp" or "png"
+            vlm_quality: JPEG/WebP quality for VLM payloads (1-100)
+            cache_max_bytes: Memory budget for cached VLM payloads
+        """
+        vlm_format = vlm_format.lower()
+        if vlm_format not in _VLM_SAVE_OPTIONS:
+            raise ValueError(
+                f"Unsupported VLM image format: {vlm_format}. "
+                f"Supported formats: {', '.join(_VLM_SAVE_OPTIONS)}"
+            )
+        self.ocr_max_edge = ocr_max_edge
+        self.vlm_max_edge = vlm_max_edge
+        self.vlm_format = vlm_format
+        self.vlm_quality = vlm_quality
+        self.cache_max_bytes = cache_max_bytes
+
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> sha256 of the file content
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # digest + encoding options -> base64 VLM payload, in LRU order
+        self._payloads: "OrderedDict[str, str]" = OrderedDict()
+        self._payload_bytes = 0
+        # digest + OCR options -> preprocessed file in the cache directory
+        self._ocr_files: Dict[str, Path] = {}
+        self._cache_dir: Optional[Path] = None
+        # digest -> (difference hash, aspect ratio)
+        self._perceptual_hashes: Dict[str, Optional[Tuple[int, float]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "bytes_in": 0, "bytes_out": 0}
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Constructor options of this preprocessor"""
+        return {
+            "ocr_max_edge": self.ocr_max_edge,
+            "vlm_max_edge": self.vlm_max_edge,
+            "vlm_format": self.vlm_format,
+            "vlm_quality": self.vlm_quality,
+            "cache_max_bytes": self.cache_max_bytes,
+        }
+
+    @property
+    def vlm_mime_type(self) -> str:
+        """MIME type of the payloads returned by ``encode_for_vlm``"""
+        return f"image/{self.vlm_format}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache hits/misses and total source vs. encoded bytes"""
+        with self._lock:
+            return dict(self._stats, cached_payloads=len(self._payloads))
+
+    def content_digest(self, image_path: Union[str, Path]) -> str:
+        """
+        Return the SHA-256 of a file, memoized by path, size and mtime
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            str: Hex digest of the file content
+        """
+        path = Path(image_path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def encode_for_vlm(self, image_path: Union[str, Path]) -> str:
+        """
+        Return a base64 payload of the image optimized for a vision model
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            str: Base64 encoded image bytes
+        """
+        digest = self.content_digest(image_path)
+        key = f"{digest}:vlm:{self.vlm_format}:{self.vlm_max_edge}:{self.vlm_quality}"
+        with self._lock:
+            cached = self._payloads.get(key)
+            if cached is not None:
+                self._payloads.move_to_end(key)
+                self._stats["hits"] += 1
+                return cached
+
+        raw = Path(image_path).read_bytes()
+        data = self._optimize_for_vlm(raw)
+        encoded = base64.b64encode(data).decode("utf-8")
+
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["bytes_in"] += len(raw)
+            self._stats["bytes_out"] += len(data)
+            if key not in self._payloads:
+                self._payloads[key] = encoded
+                self._payload_bytes += len(encoded)
+            while (
+                self._payload_bytes > self.cache_max_bytes and len(self._payloads) > 1
+            ):
+                _, evicted = self._payloads.popitem(last=False)
+                self._payload_bytes -= len(evicted)
+        return encoded
+
+    def perceptual_hash(
+        self, image_path: Union[str, Path]
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Return a 64-bit difference hash (dHash) of the image and its aspect ratio
+
+        Visually identical images with different bytes (re-encoded crops of
+        the same header, watermark or diagram) get hashes within a small
+        Hamming distance of each other. Compare them with ``hamming_distance``.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Tuple of (hash, width / height), or None without Pillow or when
+            the image cannot be read
+        """
+        digest = self.content_digest(image_path)
+        with self._lock:
+            if digest in self._perceptual_hashes:
+                return self._perceptual_hashes[digest]
+
+        result = None
+        Image = _import_pil()
+        if Image is not None:
+            try:
+                with Image.open(image_path) as img:
+                    img = _normalize(img, _DHASH_DECODE_EDGE)
+                    aspect_ratio = img.width / max(1, img.height)
+                    pixels = list(
+                        img.convert("L")
+                        .resize((_DHASH_SIZE + 1, _DHASH_SIZE), Image.LANCZOS)
+                        .getdata()
+                    )
+                value = 0
+                for row in range(_DHASH_SIZE):
+                    offset = row * (_DHASH_SIZE + 1)
+                    for col in range(_DHASH_SIZE):
+                        value = (value << 1) | (
+                            pixels[offset + col] > pixels[offset + col + 1]
+                        )
+                result = (value, aspect_ratio)
+            except Exception as e:
+                logging.debug(f"Could not hash image {image_path}: {e}")
+
+        with self._lock:
+            self._perceptual_hashes[digest] = result
+        return result
+
+    def prepare_for_ocr(self, image_path: Union[str, Path]) -> Path:
+        """
+        Return a path MinerU can read, converting the image only when needed
+
+        The prepared file keeps the original file name stem so MinerU's output
+        directory matches what the caller expects.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Path: The original path, or a cached preprocessed PNG/JPEG
+        """
+        image_path = Path(image_path)
+        ext = image_path.suffix.lower()
+        Image = _import_pil()
+        if Image is None:
+            if ext in OCR_NATIVE_FORMATS:
+                return image_path
+            raise RuntimeError(
+                "PIL/Pillow is required for image format conversion. "
+                "Please install it using: pip install Pillow"
+            )
+
+        digest = self.content_digest(image_path)
+        # The stem is part of the key because MinerU names its output after it
+        key = f"{digest}:ocr:{self.ocr_max_edge}:{image_path.stem}"
+        with self._lock:
+            prepared = self._ocr_files.get(key)
+        if prepared is not None and prepared.exists():
+            with self._lock:
+                self._stats["hits"] += 1
+            return prepared
+
+        with Image.open(image_path) as img:
+            needs_rotation = _exif_orientation(img) not in (None, 1)
+            needs_resize = _needs_resize(img.size, self.ocr_max_edge)
+            if ext in OCR_NATIVE_FORMATS and not needs_rotation and not needs_resize:
+                return image_path
+
+            img = _normalize(img, self.ocr_max_edge)
+            # Keep JPEG sources as JPEG; everything else becomes a fast PNG
+            if ext in (".jpg", ".jpeg"):
+                fmt, suffix, options = "JPEG", ".jpg", {"quality": 95}
+            else:
+                fmt, suffix, options = "PNG", ".png", {"compress_level": 1}
+            buffer = io.BytesIO()
+            img.save(buffer, fmt, **options)
+
+        target_dir = self._ensure_cache_dir() / digest[:16]
+        target_dir.mkdir(parents=True, exist_ok=True)
+        prepared = target_dir / f"{image_path.stem}{suffix}"
+        tmp_path = prepared.with_name(f".{prepared.name}.{threading.get_ident()}")
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, prepared)
+
+        with self._lock:
+            self._ocr_files[key] = prepared
+            self._stats["misses"] += 1
+            self._stats["bytes_in"] += image_path.stat().st_size
+            self._stats["bytes_out"] += buffer.tell()
+        logging.info(
+            f"Preprocessed {image_path.name} for OCR "
+            f"({image_path.stat().st_size / 1024:.1f} KB -> {buffer.tell() / 1024:.1f} KB)"
+        )
+        return prepared
+
+    def clear(self, keep_files: bool = False):
+        """
+        Drop cached payloads and delete prepared OCR files
+
+        Args:
+            keep_files: Keep prepared OCR files on disk, for when a parse may
+                still be reading them
+        """
+        with self._lock:
+            self._payloads.clear()
+            self._payload_bytes = 0
+            self._digests.clear()
+            self._perceptual_hashes.clear()
+            if keep_files:
+                return
+            self._ocr_files.clear()
+            cache_dir, self._cache_dir = self._cache_dir, None
+        if cache_dir is not None:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def _optimize_for_vlm(self, raw: bytes) -> bytes:
+        """Decode, rotate, downscale and re-encode image bytes in memory"""
+        Image = _import_pil()
+        if Image is None:
+            return raw
+        try:
+            with Image.open(io.BytesIO(raw)) as img:
+                needs_rotation = _exif_orientation(img) not in (None, 1)
+                needs_resize = _needs_resize(img.size, self.vlm_max_edge)
+                if (
+                    img.format in VLM_NATIVE_FORMATS
+                    and not needs_rotation
+                    and not needs_resize
+                    and len(raw) <= self.PASSTHROUGH_BYTES
+                ):
+                    return raw
+
+                img = _normalize(img, self.vlm_max_edge)
+                fmt, options = _VLM_SAVE_OPTIONS[self.vlm_format]
+                if fmt in ("JPEG", "WEBP"):
+                    options = dict(options, quality=self.vlm_quality)
+                buffer = io.BytesIO()
+                img.save(buffer, fmt, **options)
+        except Exception as e:
+            logging.warning(f"Image preprocessing failed, sending original bytes: {e}")
+            return raw
+
+        data = buffer.getvalue()
+        # Never send a larger payload than the original when nothing had to change
+        if not needs_rotation and not needs_resize and len(data) >= len(raw):
+            return raw
+        return data
+
+    def _ensure_cache_dir(self) -> Path:
+        with self._lock:
+            if self._cache_dir is None:
+                self._cache_dir = Path(tempfile.mkdtemp(prefix="raganything_images_"))
+            return self._cache_dir
+
+
+def image_mime_type(image_base64: str) -> str:
+    """
+    Guess the MIME type of a base64 encoded image from its leading bytes
+
+    Args:
+        image_base64: Base64 encoded image
+
+    Returns:
+        str: MIME type, "image/jpeg" when the format is not recognized
+    """
+    for prefix, mime_type in _BASE64_SIGNATURES:
+        if image_base64.startswith(prefix):
+            return mime_type
+    return "image/jpeg"
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two perceptual hashes"""
+    return bin(first ^ second).count("1")
+
+
+def _import_pil():
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def _exif_orientation(img) -> Optional[int]:
+    try:
+        return img.getexif().get(_ORIENTATION_TAG)
+    except Exception:
+        return None
+
+
+def _needs_resize(size: Tuple[int, int], max_edge: int) -> bool:
+    return max_edge > 0 and max(size) > max_edge
+
+
+def _normalize(img, max_edge: int):
+    """Apply EXIF orientation, flatten transparency to white and downscale"""
+    from PIL import Image, ImageOps
+
+    # Animated GIF/WebP: keep the first frame only
+    if getattr(img, "is_animated", False):
+        img.seek(0)
+
+    # Let the JPEG decoder downsample large scans while decoding
+    if img.format == "JPEG" and max_edge > 0:
+        img.draft("RGB", (max_edge, max_edge))
+
+    img = ImageOps.exif_transpose(img)
+
+    if img.mode in ("RGBA", "LA", "P"):
+        if img.mode == "P":
+            img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        img = background
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    if _needs_resize(img.size, max_edge):
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    return img
+
+
+# Process-wide preprocessor shared by the parser, modal processors and queries
+_preprocessor: Optional[ImagePreprocessor] = None
+# Replaced preprocessors whose prepared OCR files are deleted at exit
+_retired_preprocessors: List[ImagePreprocessor] = []
+_preprocessor_lock = threading.Lock()
+
+
+def configure_image_preprocessor(**options) -> ImagePreprocessor:
+    """
+    Set the options of the process-wide image preprocessor
+
+    The active preprocessor is kept when the options are unchanged. A replaced
+    one drops its in-memory caches, but its prepared OCR files stay on disk
+    until exit because a running parse may still be reading them.
+
+    Args:
+        **options: Keyword arguments for ImagePreprocessor
+
+    Returns:
+        ImagePreprocessor: The active preprocessor
+    """
+    global _preprocessor
+    candidate = ImagePreprocessor(**options)
+    with _preprocessor_lock:
+        previous = _preprocessor
+        if previous is not None and previous.options == candidate.options:
+            return previous
+        _preprocessor = candidate
+        if previous is not None:
+            _retired_preprocessors.append(previous)
+    if previous is not None:
+        previous.clear(keep_files=True)
+    return candidate
+
+
+def get_image_preprocessor() -> ImagePreprocessor:
+    """Return the process-wide image preprocessor, creating a default one if needed"""
+    global _preprocessor
+    with _preprocessor_lock:
+        if _preprocessor is None:
+            _preprocessor = ImagePreprocessor()
+        return _preprocessor
+
+
+def _clear_image_preprocessor():
+    for preprocessor in _retired_preprocessors + [_preprocessor]:
+        if preprocessor is not None:
+            preprocessor.clear()
+
+
+atexit.register(_clear_image_preprocessor)
@@ -0,0 +1,584 @@
+"""
+Incremental re-ingestion functionality for RAGAnything
+
+Contains methods that fingerprint a document's pages and multimodal blocks and,
+when a modified version of the same file is processed again, only re-run
+chunking, captioning and entity extraction for the parts that changed
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Set, Tuple, TYPE_CHECKING
+
+from lightrag.base import DocStatus
+from lightrag.utils import compute_mdhash_id, get_content_summary
+
+from raganything.image_preprocessor import get_image_preprocessor
+from raganything.utils import separate_content
+
+if TYPE_CHECKING:
+    from .config import RAGAnythingConfig
+
+# Block fields that locate a block rather than describe its content
+_POSITION_FIELDS = {"page_idx", "img_path", "bbox"}
+
+
+def block_fingerprint(item: Dict[str, Any]) -> str:
+    """
+    Fingerprint a content block independently of where it appears
+
+    Images are fingerprinted by their pixel bytes, not their path, so a block
+    re-extracted to the same location with different content is detected.
+
+    Args:
+        item: Content block from a parser content list
+
+    Returns:
+        str: Fingerprint with a ``blk-`` prefix
+    """
+    payload = {k: v for k, v in item.items() if k not in _POSITION_FIELDS}
+    img_path = item.get("img_path")
+    if img_path and os.path.exists(img_path):
+        payload["img_digest"] = get_image_preprocessor().content_digest(img_path)
+    return compute_mdhash_id(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str),
+        prefix="blk-",
+    )
+
+
+def page_texts(content_list: List[Dict[str, Any]]) -> List[Tuple[int, str]]:
+    """
+    Join the text blocks of each page in document order
+
+    Args:
+        content_list: Parser content list
+
+    Returns:
+        List[Tuple[int, str]]: (page_idx, page text) for pages that have text
+    """
+    pages: Dict[int, List[str]] = {}
+    for item in content_list:
+        if item.get("type", "text") == "text":
+            text = item.get("text", "")
+            if text.strip():
+                pages.setdefault(item.get("page_idx", 0), []).append(text)
+    return [(page_idx, "\n\n".join(parts)) for page_idx, parts in sorted(pages.items())]
+
+
+class IncrementalMixin:
+    """IncrementalMixin class containing incremental re-ingestion functionality for RAGAnything"""
+
+    # Type hints for mixin attributes (will be available when mixed into RAGAnything)
+    config: "RAGAnythingConfig"
+    logger: logging.Logger
+
+    async def _process_document_incremental(
+        self,
+        file_path: str,
+        content_list: List[Dict[str, Any]],
+        doc_id: str,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        source_id: str | None = None,
+    ) -> Dict[str, int]:
+        """
+        Insert a parsed document, reusing the chunks of an earlier version
+
+        Text is chunked per page and keyed by a hash of the page text; each
+        multimodal block is keyed by its content fingerprint. Compared with the
+        fingerprints recorded for the previous version of the same file:
+
+        - unchanged pages and blocks keep their chunks, entities and relations
+        - new or modified pages and blocks are chunked, captioned and extracted
+        - chunks that only belonged to removed pages and blocks are deleted,
+          together with the entities and relations that only they supported
+
+        Versions are matched by source identity, the resolved file path unless
+        the caller supplies one, so different files that share a name are never
+        treated as versions of each other.
+
+        The new version is fully chunked, captioned and extracted before the old
+        one is touched. Until the swap is finished, the fingerprint record names
+        the new version as pending: a rerun with the same content resumes it, and
+        a rerun with other content discards it, leaving the old version intact.
+
+        Args:
+            file_path: Path of the processed file
+            content_list: Parsed content list
+            doc_id: Content-based ID of the new version
+            split_by_character: Optional character to split page text by
+            split_by_character_only: If True, split only by the specified character
+            source_id: Stable identity of the document across versions
+                (defaults to the resolved file path)
+
+        Returns:
+            Dict[str, int]: Counts of kept, added and retired chunks
+        """
+        file_name = os.path.basename(file_path)
+        source = source_id or os.path.realpath(file_path)
+        record_key = compute_mdhash_id(source, prefix="file-")
+        previous = await self.doc_fingerprints.get_by_id(record_key)
+        if previous and previous.get("source") != source:
+            # Only a record written for this exact source may retire a document
+            previous = None
+
+        # A version whose ingestion was interrupted before the swap finished
+        pending_doc_id = previous.get("pending_doc_id") if previous else None
+        resuming = pending_doc_id == doc_id
+
+        old_doc_id = previous.get("doc_id") if previous else None
+        if old_doc_id and not await self.lightrag.doc_status.get_by_id(old_doc_id):
+            # The previous version was deleted since it was fingerprinted
+            previous, old_doc_id = None, None
+
+        if old_doc_id == doc_id:
+            self.logger.info(f"Document {file_name} is unchanged ({doc_id})")
+            return {"kept": 0, "added": 0, "retired": 0}
+
+        pending_status = await self.lightrag.doc_status.get_by_id(doc_id)
+        if pending_status and not resuming:
+            # The same content was ingested from another source; leave both alone
+            self.logger.info(
+                f"Document {doc_id} is already stored, skipping {file_name}"
+            )
+            return {"kept": 0, "added": 0, "retired": 0}
+
+        old_units: Dict[str, List[str]] = (
+            previous.get("text_units", {}) if previous else {}
+        )
+        old_blocks: Dict[str, List[str]] = (
+            previous.get("blocks", {}) if previous else {}
+        )
+
+        if pending_doc_id and not resuming:
+            await self._discard_pending_version(
+                pending_doc_id,
+                {
+                    chunk_id
+                    for chunk_ids in list(old_units.values())
+                    + list(old_blocks.values())
+                    for chunk_id in chunk_ids
+                },
+            )
+
+        # Fingerprint the new version
+        pages = [
+            (page_idx, text, compute_mdhash_id(text, prefix="page-"))
+            for page_idx, text in page_texts(content_list)
+        ]
+        _, multimodal_items = separate_content(content_list)
+        blocks = [
+            (index, item, block_fingerprint(item))
+            for index, item in enumerate(multimodal_items)
+        ]
+
+        new_units: Dict[str, List[str]] = {
+            unit: old_units[unit] for _, _, unit in pages if unit in old_units
+        }
+        new_blocks: Dict[str, List[str]] = {
+            fp: old_blocks[fp] for _, _, fp in blocks if fp in old_blocks
+        }
+        kept_chunks: Set[str] = {
+            chunk_id
+            for chunk_ids in list(new_units.values()) + list(new_blocks.values())
+            for chunk_id in chunk_ids
+        }
+        retired_chunks: Set[str] = {
+            chunk_id
+            for chunk_ids in list(old_units.values()) + list(old_blocks.values())
+            for chunk_id in chunk_ids
+        } - kept_chunks
+
+        added_pages = [page for page in pages if page[2] not in new_units]
+        added_blocks = [block for block in blocks if block[2] not in new_blocks]
+
+        self.logger.info(
+            f"Incremental ingest of {file_name}: {len(pages) - len(added_pages)}/{len(pages)} "
+            f"pages and {len(blocks) - len(added_blocks)}/{len(blocks)} multimodal blocks unchanged, "
+            f"{len(retired_chunks)} chunks to retire"
+        )
+
+        # Register the new version as pending; the old version stays untouched
+        # until the new one is complete. Only chunks created for the new
+        # version are listed until the swap, so discarding it spares the old one
+        text_content = "\n\n".join(text for _, text, _ in pages)
+        now = datetime.now(timezone.utc).isoformat()
+        created_chunks = list(pending_status.get("chunks_list", [])) if resuming else []
+        await self.lightrag.full_docs.upsert(
+            {doc_id: {"content": text_content, "file_path": file_name}}
+        )
+        await self.lightrag.doc_status.upsert(
+            {
+                doc_id: {
+                    "status": DocStatus.PROCESSING,
+                    "content_summary": get_content_summary(text_content),
+                    "content_length": len(text_content),
+                    "chunks_list": created_chunks,
+                    # Counts kept chunks so new chunks are ordered after them
+                    "chunks_count": len(kept_chunks) + len(created_chunks),
+                    "created_at": pending_status.get("created_at", now)
+                    if resuming
+                    else now,
+                    "updated_at": now,
+                    "file_path": file_name,
+                }
+            }
+        )
+        await self.doc_fingerprints.upsert(
+            {
+                record_key: {
+                    **(previous or {}),
+                    "source": source,
+                    "file_path": file_name,
+                    "pending_doc_id": doc_id,
+                }
+            }
+        )
+        await self.doc_fingerprints.index_done_callback()
+
+        # New and modified pages: chunk per page so unchanged pages keep their chunks
+        if added_pages:
+            page_chunks = self._chunk_pages(
+                added_pages,
+                doc_id,
+                file_name,
+                split_by_character,
+                split_by_character_only,
+                order_offset=len(kept_chunks),
+            )
+            all_chunks = {
+                chunk_id: chunk
+                for chunks in page_chunks.values()
+                for chunk_id, chunk in chunks.items()
+            }
+            if all_chunks:
+                await self._store_chunks_to_lightrag_storage_type_aware(all_chunks)
+                # Listed before extraction so discarding the version removes them
+                await self._update_doc_status_with_chunks_type_aware(
+                    doc_id, list(all_chunks.keys())
+                )
+                chunk_results = (
+                    await self._batch_extract_entities_lightrag_style_type_aware(
+                        all_chunks
+                    )
+                )
+                await self._merge_preserving_doc_index(doc_id, chunk_results, file_path)
+            for unit, chunks in page_chunks.items():
+                new_units[unit] = list(chunks.keys())
+
+        # New and modified multimodal blocks
+        if added_blocks:
+            self.set_content_source_for_context(
+                content_list, self.config.content_format
+            )
+            snapshot = await self._get_doc_graph_index(doc_id)
+            item_chunks = await self._process_multimodal_content_batch_type_aware(
+                [item for _, item, _ in added_blocks],
+                file_path,
+                doc_id,
+                indices=[index for index, _, _ in added_blocks],
+            )
+            await self._restore_doc_graph_index(doc_id, *snapshot)
+            for index, _, fp in added_blocks:
+                # Blocks that failed are left out so they are retried next time
+                if index in item_chunks:
+                    new_blocks[fp] = [item_chunks[index]]
+
+        added_count = sum(
+            len(chunk_ids)
+            for unit, chunk_ids in new_units.items()
+            if unit not in old_units
+        ) + sum(
+            len(chunk_ids)
+            for fp, chunk_ids in new_blocks.items()
+            if fp not in old_blocks
+        )
+
+        # Swap: drop what only the old version had, then hand over the rest.
+        # A new chunk can share its content hash with a retired one
+        current = await self.lightrag.doc_status.get_by_id(doc_id) or {}
+        retired_chunks -= set(current.get("chunks_list", []))
+        if old_doc_id:
+            await self._retire_chunks(old_doc_id, retired_chunks, file_name)
+            await self._move_kept_chunks(old_doc_id, doc_id, kept_chunks)
+
+        # Finalize the new version and drop the old one
+        chunks_list = list(
+            dict.fromkeys(sorted(kept_chunks) + list(current.get("chunks_list", [])))
+        )
+        metadata = dict(current.get("metadata") or {})
+        metadata["multimodal_processed"] = True
+        metadata["incremental"] = {
+            "previous_doc_id": old_doc_id,
+            "kept_chunks": len(kept_chunks),
+            "added_chunks": added_count,
+            "retired_chunks": len(retired_chunks),
+        }
+        await self.lightrag.doc_status.upsert(
+            {
+                doc_id: {
+                    **self._cache_entry(current),
+                    "status": DocStatus.PROCESSED,
+                    "chunks_list": chunks_list,
+                    "chunks_count": len(chunks_list),
+                    "metadata": metadata,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            }
+        )
+
+        if old_doc_id:
+            await self.lightrag.full_docs.delete([old_doc_id])
+            await self.lightrag.doc_status.delete([old_doc_id])
+            await self.lightrag.full_entities.delete([old_doc_id])
+            await self.lightrag.full_relations.delete([old_doc_id])
+
+        await self.doc_fingerprints.upsert(
+            {
+                record_key: {
+                    "doc_id": doc_id,
+                    "source": source,
+                    "file_path": file_name,
+                    "text_units": new_units,
+                    "blocks": new_blocks,
+                    "updated_at": int(time.time()),
+                }
+            }
+        )
+        await self.doc_fingerprints.index_done_callback()
+        await self.lightrag._insert_done()
+
+        self.logger.info(
+            f"Incremental ingest of {file_name} complete: kept {len(kept_chunks)}, "
+            f"added {added_count}, retired {len(retired_chunks)} chunks"
+        )
+        return {
+            "kept": len(kept_chunks),
+            "added": added_count,
+            "retired": len(retired_chunks),
+        }
+
+    async def _discard_pending_version(
+        self, pending_doc_id: str, protected_chunks: Set[str]
+    ) -> None:
+        """
+        Delete a version whose ingestion was interrupted before the swap
+
+        Args:
+            pending_doc_id: ID of the interrupted version
+            protected_chunks: Chunks of the previous version that must survive
+        """
+        status = await self.lightrag.doc_status.get_by_id(pending_doc_id)
+        if not status:
+            return
+        self.logger.info(f"Discarding interrupted version {pending_doc_id}")
+        chunk_ids = [
+            chunk_id
+            for chunk_id in status.get("chunks_list", [])
+            if chunk_id not in protected_chunks
+        ]
+        await self.lightrag.doc_status.upsert(
+            {
+                pending_doc_id: {
+                    **status,
+                    "chunks_list": chunk_ids,
+                    "chunks_count": len(chunk_ids),
+                }
+            }
+        )
+        result = await self.lightrag.adelete_by_doc_id(pending_doc_id)
+        if result.status != "success":
+            raise RuntimeError(
+                f"Failed to discard interrupted version {pending_doc_id}: {result.message}"
+            )
+
+    def _chunk_pages(
+        self,
+        pages: List[Tuple[int, str, str]],
+        doc_id: str,
+        file_name: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        order_offset: int = 0,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Chunk page texts with LightRAG's chunking function, one page at a time
+
+        Args:
+            pages: (page_idx, text, unit fingerprint) for each page to chunk
+            doc_id: Document the chunks belong to
+            file_name: File name recorded on the chunks
+            split_by_character: Optional character to split page text by
+            split_by_character_only: If True, split only by the specified character
+            order_offset: chunk_order_index of the first new chunk
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Chunks in LightRAG format for each unit fingerprint
+        """
+        order = order_offset
+        units: Dict[str, Dict[str, Any]] = {}
+        for page_idx, text, unit in pages:
+            chunks = {}
+            for dp in self.lightrag.chunking_func(
+                self.lightrag.tokenizer,
+                text,
+                split_by_character,
+                split_by_character_only,
+                self.lightrag.chunk_overlap_token_size,
+                self.lightrag.chunk_token_size,
+            ):
+                if not dp["content"]:
+                    continue
+                chunks[compute_mdhash_id(dp["content"], prefix="chunk-")] = {
+                    "tokens": dp["tokens"],
+                    "content": dp["content"],
+                    "chunk_order_index": order,
+                    "full_doc_id": doc_id,
+                    "file_path": file_name,
+                    "llm_cache_list": [],
+                    "page_idx": page_idx,
+                }
+                order += 1
+            units[unit] = chunks
+        return units
+
+    async def _retire_chunks(
+        self, owner_doc_id: str, chunk_ids: Set[str], file_name: str
+    ) -> None:
+        """
+        Delete chunks that no longer belong to a document
+
+        The chunks are handed to LightRAG's document deletion under a temporary
+        document ID, so entities and relations supported only by these chunks are
+        removed and those with other sources are rebuilt, exactly as when a whole
+        document is deleted.
+
+        Args:
+            owner_doc_id: Document the chunks were inserted for
+            chunk_ids: Chunks to delete
+            file_name: File name of the document
+        """
+        if not chunk_ids:
+            return
+
+        retired_id = f"{owner_doc_id}-retired"
+        entity_names, relation_pairs = await self._get_doc_graph_index(owner_doc_id)
+        now = datetime.now(timezone.utc).isoformat()
+
+        await self.lightrag.doc_status.upsert(
+            {
+                retired_id: {
+                    "status": DocStatus.PROCESSED,
+                    "content_summary": "",
+                    "content_length": 0,
+                    "chunks_list": sorted(chunk_ids),
+                    "chunks_count": len(chunk_ids),
+                    "created_at": now,
+                    "updated_at": now,
+                    "file_path": file_name,
+                }
+            }
+        )
+        await self.lightrag.full_entities.upsert(
+            {retired_id: {"entity_names": entity_names, "count": len(entity_names)}}
+        )
+        await self.lightrag.full_relations.upsert(
+            {
+                retired_id: {
+                    "relation_pairs": relation_pairs,
+                    "count": len(relation_pairs),
+                }
+            }
+        )
+
+        result = await self.lightrag.adelete_by_doc_id(retired_id)
+        if result.status != "success":
+            raise RuntimeError(
+                f"Failed to retire {len(chunk_ids)} chunks of {owner_doc_id}: {result.message}"
+            )
+
+    async def _move_kept_chunks(
+        self, old_doc_id: str, new_doc_id: str, chunk_ids: Set[str]
+    ) -> None:
+        """
+        Reassign unchanged chunks and the document's graph index to the new version
+
+        Args:
+            old_doc_id: ID of the previous version
+            new_doc_id: ID of the new version
+            chunk_ids: Chunks carried over unchanged
+        """
+        if chunk_ids:
+            records = await self.lightrag.text_chunks.get_by_ids(sorted(chunk_ids))
+            await self.lightrag.text_chunks.upsert(
+                {
+                    chunk_id: self._cache_entry(record, full_doc_id=new_doc_id)
+                    for chunk_id, record in zip(sorted(chunk_ids), records)
+                    if record
+                }
+            )
+
+        # Keep only graph elements that survived retiring the removed chunks
+        entity_names, relation_pairs = await self._get_doc_graph_index(old_doc_id)
+        graph = self.lightrag.chunk_entity_relation_graph
+        if entity_names:
+            nodes = await graph.get_nodes_batch(entity_names)
+            entity_names = [name for name in entity_names if nodes.get(name)]
+        if relation_pairs:
+            edges = await graph.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in relation_pairs]
+            )
+            relation_pairs = [
+                [src, tgt] for src, tgt in relation_pairs if edges.get((src, tgt))
+            ]
+        await self._restore_doc_graph_index(new_doc_id, entity_names, relation_pairs)
+
+    async def _get_doc_graph_index(
+        self, doc_id: str
+    ) -> Tuple[List[str], List[List[str]]]:
+        """Return the entity names and relation pairs recorded for a document"""
+        entities = await self.lightrag.full_entities.get_by_id(doc_id) or {}
+        relations = await self.lightrag.full_relations.get_by_id(doc_id) or {}
+        return (
+            list(entities.get("entity_names", [])),
+            [list(pair) for pair in relations.get("relation_pairs", [])],
+        )
+
+    async def _restore_doc_graph_index(
+        self,
+        doc_id: str,
+        entity_names: List[str],
+        relation_pairs: List[List[str]],
+    ) -> None:
+        """
+        Union entity names and relation pairs into a document's graph index
+
+        merge_nodes_and_edges overwrites the index with the entities of the
+        current batch, so entries from earlier batches are merged back in.
+        """
+        current_entities, current_relations = await self._get_doc_graph_index(doc_id)
+        names = list(dict.fromkeys(current_entities + entity_names))
+        pairs = list(
+            {
+                tuple(pair): list(pair) for pair in current_relations + relation_pairs
+            }.values()
+        )
+        await self.lightrag.full_entities.upsert(
+            {doc_id: {"entity_names": names, "count": len(names)}}
+        )
+        await self.lightrag.full_relations.upsert(
+            {doc_id: {"relation_pairs": pairs, "count": len(pairs)}}
+        )
+
+    async def _merge_preserving_doc_index(
+        self, doc_id: str, chunk_results: List[Tuple], file_path: str
+    ) -> None:
+        """Merge extracted entities and relations without dropping the document's earlier graph index"""
+        snapshot = await self._get_doc_graph_index(doc_id)
+        await self._batch_merge_lightrag_style_type_aware(
+            chunk_results, file_path, doc_id
+        )
+        await self._restore_doc_graph_index(doc_id, *snapshot)
@@ -0,0 +1,516 @@
+"""
+Batched client for the MinerU cloud API (mineru.net)
+
+Parse requests made within a short window are coalesced into a single
+``/file-urls/batch`` submission, their files are uploaded concurrently, and a
+single poller task tracks every outstanding ``batch_id`` with adaptive backoff,
+resolving each caller's future as soon as its file is done.
+
+Uploads and result downloads are streamed in chunks over one pooled HTTP
+session per client, so memory use does not grow with document size. Clients
+are bound to the event loop they were created on, so ``get_mineru_cloud_client``
+hands out a new one when called from a different loop (e.g. separate
+``asyncio.run`` calls).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+def _base_url(api_url: str) -> str:
+    """Strip a full task endpoint down to the API base URL"""
+    if "/extract/task" in api_url:
+        return api_url.rsplit("/extract/task", 1)[0]
+    return api_url.rstrip("/")
+
+
+@dataclass
+class _Submission:
+    """A file waiting to be submitted, uploaded or extracted"""
+
+    path: Path
+    is_ocr: bool
+    data_id: str
+    future: asyncio.Future
+    deadline: float
+    state: str = "queued"
+    batch_id: Optional[str] = None
+    upload_url: Optional[str] = field(default=None, repr=False)
+
+
+class MineruCloudClient:
+    """
+    Shared MinerU cloud API client with batch submission and a single poller
+
+    Args:
+        api_url: MinerU API base URL (a full /extract/task URL is also accepted)
+        api_key: API key for authentication
+        batch_size: Maximum files per batch submission
+        batch_window: Seconds to wait for more files before submitting a batch
+        upload_concurrency: Maximum concurrent file uploads
+        poll_min_interval: Initial delay between result polls, in seconds
+        poll_max_interval: Upper bound for the poll delay while nothing changes
+        timeout: Seconds a file may take from submission to extraction result
+        upload_timeout: Seconds allowed for a single file upload
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        batch_size: int = 50,
+        batch_window: float = 1.0,
+        upload_concurrency: int = 4,
+        poll_min_interval: float = 2.0,
+        poll_max_interval: float = 30.0,
+        timeout: float = 600.0,
+        upload_timeout: float = 300.0,
+    ):
+        self.base_url = _base_url(api_url)
+        self.api_key = api_key
+        self.batch_size = max(1, batch_size)
+        self.batch_window = max(0.0, batch_window)
+        self.upload_concurrency = max(1, upload_concurrency)
+        self.poll_min_interval = poll_min_interval
+        self.poll_max_interval = max(poll_min_interval, poll_max_interval)
+        self.timeout = timeout
+        self.upload_timeout = upload_timeout
+
+        self.loop = asyncio.get_running_loop()
+        self._session = None
+        self._upload_semaphore = asyncio.Semaphore(self.upload_concurrency)
+
+        # Files not yet submitted, grouped by batch-level options
+        self._queued: Dict[Tuple, List[_Submission]] = {}
+        self._flush_handles: Dict[Tuple, asyncio.TimerHandle] = {}
+        # Submitted batches awaiting results: batch_id -> {data_id: submission}
+        self._batches: Dict[str, Dict[str, _Submission]] = {}
+        self._tasks: set = set()
+        self._poller: Optional[asyncio.Task] = None
+        self._poll_interval = poll_min_interval
+        self._closed = False
+
+        self.stats = {"files": 0, "batches": 0, "uploads": 0, "polls": 0, "failures": 0}
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+
+    def _get_session(self):
+        """Create the pooled HTTP session on first use"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            # Allow legacy renegotiation, which some API gateways still require
+            ssl_context = ssl.create_default_context()
+            ssl_context.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context, limit=self.upload_concurrency + 4
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def extract(
+        self,
+        input_path: Union[str, Path],
+        is_ocr: bool = True,
+        language: str = "ch",
+        enable_formula: bool = True,
+        enable_table: bool = True,
+    ) -> str:
+        """
+        Submit a file for extraction and wait for its result
+
+        Args:
+            input_path: File to parse
+            is_ocr: Whether to enable OCR for this file
+            language: Document language
+            enable_formula: Whether to enable formula recognition
+            enable_table: Whether to enable table recognition
+
+        Returns:
+            str: URL of the result ZIP archive
+
+        Raises:
+            RuntimeError: If submission, upload or extraction failed
+            TimeoutError: If no result arrived within the client timeout
+        """
+        if self._closed:
+            raise RuntimeError("MinerU cloud client is closed")
+
+        submission = _Submission(
+            path=Path(input_path),
+            is_ocr=is_ocr,
+            data_id=uuid.uuid4().hex,
+            future=self.loop.create_future(),
+            deadline=time.monotonic() + self.timeout,
+        )
+        key = (language, enable_formula, enable_table)
+        self._queued.setdefault(key, []).append(submission)
+        self.stats["files"] += 1
+
+        if len(self._queued[key]) >= self.batch_size:
+            self._flush(key)
+        elif key not in self._flush_handles:
+            self._flush_handles[key] = self.loop.call_later(
+                self.batch_window, self._flush, key
+            )
+
+        try:
+            return await submission.future
+        except asyncio.CancelledError:
+            # Stop tracking a file nobody is waiting for any more
+            if submission in self._queued.get(key, []):
+                self._queued[key].remove(submission)
+            raise
+
+    async def download(
+        self, url: str, dest_path: Union[str, Path], chunk_size: int = 1 << 20
+    ) -> int:
+        """
+        Stream a result archive to disk over the shared session
+
+        Args:
+            url: Archive URL
+            dest_path: File to write
+            chunk_size: Bytes read per chunk
+
+        Returns:
+            int: Number of bytes written
+        """
+        import aiohttp
+
+        size = 0
+        async with self._get_session().get(
+            url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Failed to download ZIP: {response.status}")
+            with open(dest_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await asyncio.to_thread(f.write, chunk)
+                    size += len(chunk)
+        return size
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a background task and keep a reference until it finishes"""
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _flush(self, key: Tuple) -> None:
+        """Submit queued files for one option set, batch_size at a time"""
+        handle = self._flush_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        queued = self._queued.pop(key, [])
+        for start in range(0, len(queued), self.batch_size):
+            self._spawn(
+                self._submit_batch(key, queued[start : start + self.batch_size])
+            )
+
+    @staticmethod
+    def _fail(submission: _Submission, error: BaseException) -> None:
+        if not submission.future.done():
+            submission.future.set_exception(error)
+
+    async def _submit_batch(self, key: Tuple, submissions: List[_Submission]) -> None:
+        """Request upload URLs for a batch, upload the files and start polling"""
+        import aiohttp
+
+        language, enable_formula, enable_table = key
+        batch_request = {
+            "enable_formula": enable_formula,
+            "enable_table": enable_table,
+            "language": language,
+            "files": [
+                {
+                    "name": s.path.name,
+                    "is_ocr": s.is_ocr,
+                    "data_id": s.data_id,
+                    "language": language,
+                }
+                for s in submissions
+            ],
+        }
+
+        try:
+            async with self._get_session().post(
+                f"{self.base_url}/file-urls/batch",
+                headers=self.headers,
+                json=batch_request,
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(
+                        f"Batch request failed with status {response.status}: {error_text}"
+                    )
+                batch_result = await response.json()
+
+            if batch_result.get("code") != 0:
+                raise RuntimeError(f"API returned error: {batch_result.get('msg')}")
+
+            batch_data = batch_result.get("data", {})
+            batch_id = batch_data.get("batch_id")
+            file_urls = batch_data.get("file_urls", [])
+            if not batch_id or len(file_urls) != len(submissions):
+                raise RuntimeError("No batch_id or file_urls in response")
+        except Exception as e:
+            logging.error(f"MinerU API batch submission failed: {e}")
+            self.stats["failures"] += len(submissions)
+            for submission in submissions:
+                self._fail(submission, RuntimeError(f"MinerU API error: {e}"))
+            return
+
+        self.stats["batches"] += 1
+        logging.info(
+            f"MinerU API batch {batch_id}: uploading {len(submissions)} file(s)"
+        )
+
+        for submission, upload_url in zip(submissions, file_urls):
+            submission.batch_id = batch_id
+            submission.upload_url = upload_url
+            submission.state = "uploading"
+        # Results are tracked from now on; the API waits for the uploads
+        self._batches[batch_id] = {s.data_id: s for s in submissions}
+        self._poll_interval = self.poll_min_interval
+
+        await asyncio.gather(*(self._upload(s) for s in submissions))
+
+        if self._poller is None or self._poller.done():
+            self._poller = self._spawn(self._poll_loop())
+
+    async def _upload(self, submission: _Submission) -> None:
+        """Stream one file to its pre-signed URL"""
+        import aiohttp
+
+        if submission.future.done():
+            return
+
+        async with self._upload_semaphore:
+            try:
+                with open(submission.path, "rb") as f:
+                    # aiohttp streams file objects in chunks with a Content-Length;
+                    # Content-Type must stay unset, it is not part of the signature
+                    async with self._get_session().put(
+                        submission.upload_url,
+                        data=f,
+                        skip_auto_headers=("Content-Type",),
+                        timeout=aiohttp.ClientTimeout(total=self.upload_timeout),
+                    ) as response:
+                        status_code = response.status
+                        response_text = await response.text()
+            except Exception as e:
+                status_code, response_text = None, str(e)
+
+        if status_code not in [200, 201, 204]:
+            logging.error(
+                f"Upload of {submission.path.name} failed with status {status_code}: "
+                f"{response_text[:500]}"
+            )
+            if "SignatureDoesNotMatch" in response_text:
+                logging.error(
+                    "OSS Signature Mismatch - the pre-signed URL generated by MinerU "
+                    "may have an incorrect signature"
+                )
+            self.stats["failures"] += 1
+            self._fail(
+                submission,
+                RuntimeError(
+                    f"Upload failed with status {status_code}: {response_text[:500]}"
+                ),
+            )
+            return
+
+        self.stats["uploads"] += 1
+        submission.state = "uploaded"
+        logging.info(f"Uploaded {submission.path.name}")
+
+    async def _poll_loop(self) -> None:
+        """Poll all outstanding batches until none are left"""
+        while self._batches and not self._closed:
+            await asyncio.sleep(self._poll_interval)
+
+            batch_ids = list(self._batches)
+            progressed = await asyncio.gather(
+                *(self._poll_batch(batch_id) for batch_id in batch_ids)
+            )
+            now = time.monotonic()
+            for batch_id in batch_ids:
+                pending = self._batches.get(batch_id, {})
+                for data_id, submission in list(pending.items()):
+                    if not submission.future.done() and now > submission.deadline:
+                        self.stats["failures"] += 1
+                        self._fail(
+                            submission,
+                            TimeoutError(
+                                f"MinerU API polling timeout after {self.timeout:.0f} "
+                                f"seconds for {submission.path.name}"
+                            ),
+                        )
+                    if submission.future.done():
+                        del pending[data_id]
+                if not pending:
+                    self._batches.pop(batch_id, None)
+
+            # Back off while nothing changes, poll quickly again after progress
+            if any(progressed):
+                self._poll_interval = self.poll_min_interval
+            else:
+                self._poll_interval = min(
+                    self._poll_interval * 1.5, self.poll_max_interval
+                )
+
+    async def _poll_batch(self, batch_id: str) -> bool:
+        """
+        Fetch one batch's results and resolve finished files
+
+        Returns:
+            bool: True if any file in the batch changed state
+        """
+        import aiohttp
+
+        pending = self._batches.get(batch_id)
+        if not pending:
+            return False
+
+        self.stats["polls"] += 1
+        try:
+            async with self._get_session().get(
+                f"{self.base_url}/extract-results/batch/{batch_id}",
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                if response.status != 200:
+                    logging.warning(f"Results check failed: {response.status}")
+                    return False
+                results_data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"Results check for batch {batch_id} failed: {e}")
+            return False
+
+        code = results_data.get("code")
+        if code == 1:
+            return False  # Still processing
+        if code != 0:
+            error = RuntimeError(
+                f"API error: {results_data.get('msg', 'Unknown error')}"
+            )
+            for submission in pending.values():
+                self._fail(submission, error)
+            return True
+
+        progressed = False
+        extract_results = results_data.get("data", {}).get("extract_result", [])
+        for result in extract_results:
+            submission = pending.get(result.get("data_id"))
+            if submission is None or submission.future.done():
+                continue
+
+            state = result.get("state")
+            if state == "done" and result.get("full_zip_url"):
+                submission.future.set_result(result["full_zip_url"])
+                progressed = True
+            elif state == "failed":
+                self.stats["failures"] += 1
+                self._fail(
+                    submission,
+                    RuntimeError(
+                        f"MinerU API failed to parse {submission.path.name}: "
+                        f"{result.get('err_msg', 'Unknown error')}"
+                    ),
+                )
+                progressed = True
+            elif state and state != submission.state:
+                submission.state = state
+                progressed = True
+        return progressed
+
+    async def close(self) -> None:
+        """Cancel outstanding work and close the HTTP sessions"""
+        self._closed = True
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+
+        error = RuntimeError("MinerU cloud client closed")
+        for submissions in self._queued.values():
+            for submission in submissions:
+                self._fail(submission, error)
+        self._queued.clear()
+        for pending in self._batches.values():
+            for submission in pending.values():
+                self._fail(submission, error)
+        self._batches.clear()
+
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+# Process-wide client settings and the clients created from them
+_client_options: Dict[str, Any] = {}
+_clients: Dict[Tuple[str, str], MineruCloudClient] = {}
+_clients_lock = threading.Lock()
+
+
+def configure_mineru_cloud_client(**options) -> None:
+    """
+    Set the options used for MinerU cloud clients created from now on
+
+    Args:
+        **options: Keyword arguments for MineruCloudClient (batch_size,
+            batch_window, upload_concurrency, poll_min_interval,
+            poll_max_interval, timeout)
+    """
+    with _clients_lock:
+        _client_options.clear()
+        _client_options.update(options)
+
+
+def get_mineru_cloud_client(api_url: str, api_key: str) -> MineruCloudClient:
+    """
+    Return the shared client for an API endpoint and key on the running loop
+
+    Must be called from within a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = (_base_url(api_url), api_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.closed or client.loop is not loop:
+            client = MineruCloudClient(api_url, api_key, **_client_options)
+            _clients[key] = client
+        return client
+
+
+async def close_mineru_cloud_clients() -> None:
+    """Close the shared clients that belong to the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = [c for c in _clients.values() if c.loop is loop]
+        for key in [k for k, c in _clients.items() if c.loop is loop]:
+            del _clients[key]
+    await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
@@ -0,0 +1,420 @@
+"""
+Persistent MinerU worker pool
+
+Each worker is a long-lived process that imports the MinerU pipeline once and
+then serves parse jobs over a pipe. Repeated parses therefore skip the model
+loading that every ``mineru`` CLI invocation pays up front.
+
+The pool is optional: when MinerU cannot be imported in-process, or a worker
+fails for infrastructure reasons, callers fall back to the CLI path.
+Workers use the "spawn" start method, so scripts that enable the pool must
+guard their entry point with ``if __name__ == "__main__":``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from raganything.worker_pool import SharedPool, WorkerPool, WorkerPoolUnavailable
+
+
+class MineruWorkerUnavailable(WorkerPoolUnavailable):
+    """Raised when the pool cannot run a job and the caller should use the CLI"""
+
+
+class MineruWorkerJobError(RuntimeError):
+    """Raised when MinerU itself failed while parsing a job inside a worker"""
+
+    def __init__(self, error_lines: List[str], exit_code: Optional[int] = None):
+        """
+        Args:
+            error_lines: The exception and traceback, one line per entry
+            exit_code: Exit status of the worker process, None while it runs
+        """
+        self.error_lines = error_lines
+        self.exit_code = exit_code
+        super().__init__("; ".join(error_lines[:1]))
+
+
+def _worker_main(conn, device: Optional[str], source: Optional[str]) -> None:
+    """
+    Entry point of a worker process
+
+    Loads MinerU once, then answers "ping" and "parse" messages until it receives
+    None or the parent end of the pipe is closed.
+    """
+    # Mirror the environment the mineru CLI prepares before parsing
+    if device and os.getenv("MINERU_DEVICE_MODE") is None:
+        os.environ["MINERU_DEVICE_MODE"] = device
+    if source and os.getenv("MINERU_MODEL_SOURCE") is None:
+        os.environ["MINERU_MODEL_SOURCE"] = source
+
+    try:
+        from mineru.cli.common import do_parse, read_fn
+    except Exception as e:
+        conn.send(("unavailable", f"Failed to import MinerU: {e}"))
+        conn.close()
+        return
+
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        kind, payload = message
+        if kind == "ping":
+            conn.send(("pong", os.getpid()))
+            continue
+
+        try:
+            input_path = Path(payload["input_path"])
+            # A directory holds a group of files parsed in one call, as the CLI does
+            files = (
+                sorted(p for p in input_path.iterdir() if p.is_file())
+                if input_path.is_dir()
+                else [input_path]
+            )
+            lang = payload.get("lang") or "ch"
+            do_parse(
+                output_dir=payload["output_dir"],
+                pdf_file_names=[p.stem for p in files],
+                pdf_bytes_list=[read_fn(p) for p in files],
+                p_lang_list=[lang] * len(files),
+                backend=payload.get("backend") or "pipeline",
+                parse_method=payload.get("method") or "auto",
+                formula_enable=payload.get("formula", True),
+                table_enable=payload.get("table", True),
+                server_url=payload.get("vlm_url"),
+                start_page_id=payload.get("start_page") or 0,
+                end_page_id=payload.get("end_page"),
+            )
+            conn.send(("ok", None))
+        except Exception as e:
+            conn.send(
+                (
+                    "error",
+                    [f"{type(e).__name__}: {e}"] + traceback.format_exc().splitlines(),
+                )
+            )
+
+
+class MineruWorker:
+    """A single warm MinerU process and the parent end of its pipe"""
+
+    def __init__(
+        self,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        startup_timeout: float = 600.0,
+    ):
+        self.device = device
+        self.source = source
+        self.startup_timeout = startup_timeout
+        self.jobs_done = 0
+        self.process = None
+        self.conn = None
+
+    def start(self) -> None:
+        """Spawn the worker process and wait until MinerU is imported"""
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.device, self.source),
+            daemon=True,
+            name="raganything-mineru-worker",
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        if not self.conn.poll(self.startup_timeout):
+            self.stop()
+            raise MineruWorkerUnavailable(
+                f"MinerU worker did not start within {self.startup_timeout} seconds"
+            )
+        try:
+            status, detail = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.stop()
+            raise MineruWorkerUnavailable(f"MinerU worker exited during startup: {e}")
+        if status != "ready":
+            self.stop()
+            raise MineruWorkerUnavailable(detail)
+        logging.info(f"[MinerU] Worker {detail} ready")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """Check that the worker is alive and responds to messages"""
+        if not self.is_alive():
+            return False
+        try:
+            self.conn.send(("ping", None))
+            if not self.conn.poll(timeout):
+                return False
+            status, _ = self.conn.recv()
+            return status == "pong"
+        except (EOFError, OSError):
+            return False
+
+    def run(self, job: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        """
+        Run one parse job in the worker
+
+        Args:
+            job: Parse options, using the same names as `_run_mineru_command`
+            timeout: Maximum number of seconds to wait for the result
+
+        Raises:
+            MineruWorkerJobError: If MinerU raised while parsing
+            MineruWorkerUnavailable: If the worker died
+            TimeoutError: If the job did not finish in time (the worker is stopped)
+        """
+        self.jobs_done += 1
+        try:
+            self.conn.send(("parse", job))
+            finished = self.conn.poll(timeout)
+            if finished:
+                status, detail = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.stop()
+            raise MineruWorkerUnavailable(f"MinerU worker died: {e}")
+
+        if not finished:
+            self.stop()
+            raise TimeoutError(f"MinerU command timed out after {timeout} seconds")
+
+        if status == "error":
+            raise MineruWorkerJobError(detail, self.process.exitcode)
+
+    def kill(self) -> None:
+        """Kill the worker process immediately, abandoning its current job"""
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except (EOFError, OSError):
+                pass
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(timeout)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+
+class MineruWorkerPool(WorkerPool[MineruWorker]):
+    """
+    Pool of warm MinerU worker processes
+
+    Jobs are handed to idle workers through a thread-safe queue, so the pool can
+    be shared by several event loops (e.g. BatchParser threads). Workers are
+    pinged when they are acquired, replaced when they die, and recycled after
+    `max_jobs_per_worker` jobs to bound memory growth.
+    """
+
+    log_prefix = "[MinerU]"
+    unavailable_error = MineruWorkerUnavailable
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_jobs_per_worker: int = 50,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        startup_timeout: float = 600.0,
+    ):
+        """
+        Args:
+            size: Number of worker processes
+            max_jobs_per_worker: Restart a worker after this many jobs (0 disables recycling)
+            device: Inference device, applied as MINERU_DEVICE_MODE in each worker
+            source: Model source, applied as MINERU_MODEL_SOURCE in each worker
+            startup_timeout: Seconds to wait for a worker to load MinerU
+        """
+        super().__init__(size, max_jobs_per_worker)
+        self.device = device
+        self.source = source
+        self.startup_timeout = startup_timeout
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return dict(super().settings, device=self.device, source=self.source)
+
+    def accepts(
+        self, device: Optional[str] = None, source: Optional[str] = None
+    ) -> bool:
+        """Whether a job with these process-wide options can run in this pool"""
+        return (device is None or device == self.device) and (
+            source is None or source == self.source
+        )
+
+    def _create_worker(self) -> MineruWorker:
+        return MineruWorker(self.device, self.source, self.startup_timeout)
+
+    def run_job_blocking(
+        self,
+        job: Dict[str, Any],
+        timeout: Optional[float] = None,
+        handle: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Run a job on the next idle worker, blocking the calling thread
+
+        Args:
+            job: Parse options, using the same names as `_run_mineru_command`
+            timeout: Maximum number of seconds to wait for the result
+            handle: Dict shared with the caller; the busy worker is published
+                under "worker" so a cancelled caller can kill it
+        """
+        self._run_on_worker(self._acquire(), job, timeout, handle)
+
+    def _run_on_worker(
+        self,
+        worker: MineruWorker,
+        job: Dict[str, Any],
+        timeout: Optional[float] = None,
+        handle: Optional[Dict[str, Any]] = None,
+        check: bool = False,
+    ) -> None:
+        """
+        Run a job on an acquired worker and return the worker to the pool
+
+        Args:
+            worker: Worker taken from the pool
+            job: Parse options, using the same names as `_run_mineru_command`
+            timeout: Maximum number of seconds to wait for the result
+            handle: See `run_job_blocking`
+            check: Health-check the worker first (for `_wait_for_idle` workers)
+        """
+        handle = handle if handle is not None else {}
+        if check:
+            worker = self._check_acquired(worker)
+        try:
+            if handle.get("cancelled"):
+                raise MineruWorkerUnavailable("Job cancelled before it started")
+
+            self.stats["jobs"] += 1
+            handle["worker"] = worker
+            try:
+                worker.run(job, timeout=timeout)
+            except (MineruWorkerUnavailable, TimeoutError):
+                self.stats["failures"] += 1
+                worker = self._replace(worker)
+                raise
+            finally:
+                handle.pop("worker", None)
+        finally:
+            self._release(worker)
+
+    async def run_job(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        timeout: Optional[float] = None,
+        **options,
+    ) -> None:
+        """
+        Parse one file in the pool without blocking the event loop
+
+        Args:
+            input_path: Path to the PDF or image file, or a directory of them
+            output_dir: Output directory path (same layout as the mineru CLI)
+            timeout: Maximum number of seconds to wait for the result
+            **options: method, lang, backend, start_page, end_page, formula, table, vlm_url
+        """
+        job = {"input_path": str(input_path), "output_dir": str(output_dir)}
+        job.update(options)
+        started = time.time()
+        handle: Dict[str, Any] = {}
+        # Wait for a free worker on the event loop; only the job itself
+        # occupies a thread
+        worker = await self._wait_for_idle()
+        try:
+            await asyncio.to_thread(
+                self._run_on_worker, worker, job, timeout, handle, True
+            )
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted; killing the worker ends its job
+            # and the pool replaces it
+            handle["cancelled"] = True
+            worker = handle.get("worker")
+            if worker is not None:
+                logging.warning("[MinerU] Parsing cancelled, killing worker")
+                worker.kill()
+            raise
+        logging.info(
+            f"[MinerU] Worker pool parsed {Path(input_path).name} in {time.time() - started:.2f}s"
+        )
+
+
+_shared_pool: SharedPool[MineruWorkerPool] = SharedPool()
+
+
+def configure_mineru_worker_pool(
+    size: int,
+    max_jobs_per_worker: int = 50,
+    device: Optional[str] = None,
+    source: Optional[str] = None,
+) -> Optional[MineruWorkerPool]:
+    """
+    Create the process-wide MinerU worker pool
+
+    Workers are started lazily on the first job. Calling this again with the
+    same settings returns the existing pool; a size of 0 shuts the pool down.
+    Hand the returned pool to `release_mineru_worker_pool` when done with it.
+
+    Args:
+        size: Number of worker processes (0 disables the pool)
+        max_jobs_per_worker: Restart a worker after this many jobs
+        device: Inference device for the workers
+        source: Model source for the workers
+
+    Returns:
+        Optional[MineruWorkerPool]: The active pool, or None if disabled
+    """
+    return _shared_pool.configure(
+        {
+            "size": size,
+            "max_jobs_per_worker": max_jobs_per_worker,
+            "device": device,
+            "source": source,
+        },
+        lambda: MineruWorkerPool(size, max_jobs_per_worker, device, source),
+    )
+
+
+def get_mineru_worker_pool() -> Optional[MineruWorkerPool]:
+    """Return the process-wide pool if one is configured and usable"""
+    return _shared_pool.get()
+
+
+def release_mineru_worker_pool(pool: Optional[MineruWorkerPool]) -> None:
+    """Release a pool returned by `configure_mineru_worker_pool`, stopping it after its last user"""
+    _shared_pool.release(pool)
+
+
+def shutdown_mineru_worker_pool() -> None:
+    """Stop the process-wide pool if one exists, whatever its number of users"""
+    _shared_pool.shutdown()
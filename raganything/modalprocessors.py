@@ -9,11 +9,16 @@ Includes:
 - GenericModalProcessor: Processor for other modal content
 """
 
+import os
 import re
 import json
 import time
-import base64
-from typing import Dict, Any, Tuple, List
+import asyncio
+import logging
+from collections import deque
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Any, Tuple, List, Optional
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -28,6 +33,8 @@ from lightrag.operate import extract_entities, merge_nodes_and_edges
 
 # Import prompt templates
 from raganything.prompt import PROMPTS
+from raganything.image_preprocessor import get_image_preprocessor, image_mime_type
+from raganything.caption_cache import content_digest
 
 
 @dataclass
@@ -40,6 +47,7 @@ class ContextConfig:
     include_headers: bool = True  # Whether to include headers/titles
     include_captions: bool = True  # Whether to include image/table captions
     filter_content_types: List[str] = None  # Content types to include
+    prompt_layout: str = "default"  # "default" or "context_first"
 
     def __post_init__(self):
         if self.filter_content_types is None:
@@ -59,6 +67,148 @@ class ContextExtractor:
         self.config = config or ContextConfig()
         self.tokenizer = tokenizer
 
+        # Page index of the current content list, built once per source
+        self._indexed_source = None
+        self._block_texts: List[str] = []
+        self._block_tokens: List[int] = []
+        self._page_index: Dict[int, List[int]] = {}
+        self._context_cache: Dict[Tuple[int, int], str] = {}
+        self._marker_tokens: Dict[int, int] = {}
+        self._separator_tokens = None
+
+    def set_content_source(self, content_source: Any, content_format: str = "auto"):
+        """Index a content source so that window lookups avoid full scans
+
+        Text for every content-list item is rendered once through
+        ``_extract_text_from_item`` and grouped by ``page_idx``. Assembled
+        page contexts are memoized per ``(page, window)`` until the source
+        changes. Each block's token count is computed here as well, so
+        context assembly never re-encodes whole blocks.
+
+        Args:
+            content_source: Source content for context extraction
+            content_format: Format of content source ("minerU", "text_chunks", "auto")
+        """
+        if content_source is self._indexed_source:
+            return
+
+        self._indexed_source = content_source
+        self._block_texts = []
+        self._block_tokens = []
+        self._page_index = {}
+        self._context_cache = {}
+
+        if not isinstance(content_source, list) or content_format not in (
+            "minerU",
+            "auto",
+        ):
+            return
+
+        self._index_blocks(content_source)
+
+    def _index_blocks(self, content_list: List[Dict]):
+        """Render, tokenize and page-index the items not indexed yet
+
+        Returns:
+            Pages of the newly indexed items that contribute text
+        """
+        new_pages = set()
+        for position in range(len(self._block_texts), len(content_list)):
+            item = content_list[position]
+            text_content = ""
+            if (
+                isinstance(item, dict)
+                and item.get("type", "") in self.config.filter_content_types
+            ):
+                text_content = self._extract_text_from_item(item)
+                if not (text_content and text_content.strip()):
+                    text_content = ""
+            self._block_texts.append(text_content)
+            self._block_tokens.append(
+                self._count_tokens(text_content) if text_content else 0
+            )
+            if text_content:
+                page = item.get("page_idx", 0)
+                self._page_index.setdefault(page, []).append(position)
+                new_pages.add(page)
+        return new_pages
+
+    def _ensure_indexed(self, content_list: List[Dict]):
+        """Index ``content_list``, extending the index when the source grew
+
+        A content list that only had items appended since it was indexed, as
+        in streaming processing, has just the new tail indexed; memoized
+        contexts whose window reaches a page with new text are dropped.
+        """
+        if content_list is self._indexed_source and len(self._block_texts) <= len(
+            content_list
+        ):
+            if len(self._block_texts) == len(content_list):
+                return
+            new_pages = self._index_blocks(content_list)
+            if new_pages:
+                self._context_cache = {
+                    (page, window): context
+                    for (page, window), context in self._context_cache.items()
+                    if all(abs(page - new_page) > window for new_page in new_pages)
+                }
+            return
+        self._indexed_source = None
+        self.set_content_source(content_list, "minerU")
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with the tokenizer, or characters without one"""
+        if self.tokenizer:
+            return len(self.tokenizer.encode(text))
+        return len(text)
+
+    def _page_marker_tokens(self, page: int) -> int:
+        """Token count of the ``[Page N] `` marker prepended to other pages"""
+        if page not in self._marker_tokens:
+            self._marker_tokens[page] = self._count_tokens(f"[Page {page}] ")
+        return self._marker_tokens[page]
+
+    def _assemble_context(self, blocks: List[Tuple[str, int]]) -> str:
+        """Join blocks into a context that fits ``max_context_tokens``
+
+        Uses prefix sums over the cached block token counts to keep the
+        largest run of whole blocks within budget; only the block crossing
+        the limit is tokenized and truncated.
+
+        Args:
+            blocks: ``(text, token_count)`` pairs in context order
+
+        Returns:
+            Context text within the token budget
+        """
+        if not blocks:
+            return ""
+
+        if self._separator_tokens is None:
+            self._separator_tokens = self._count_tokens("\n")
+        separator = self._separator_tokens
+        max_tokens = self.config.max_context_tokens
+
+        # ends[k] is the token count of the first k + 1 blocks joined by "\n"
+        ends = list(accumulate(count + separator for _, count in blocks))
+        ends = [end - separator for end in ends]
+        if ends[-1] <= max_tokens:
+            return "\n".join(text for text, _ in blocks)
+
+        whole = bisect_right(ends, max_tokens)
+        kept = [text for text, _ in blocks[:whole]]
+        remaining = max_tokens - (ends[whole - 1] + separator if whole else 0)
+
+        if remaining > 0:
+            boundary_text = blocks[whole][0]
+            if self.tokenizer:
+                tokens = self.tokenizer.encode(boundary_text)
+                kept.append(self.tokenizer.decode(tokens[:remaining]))
+            else:
+                kept.append(boundary_text[:remaining])
+
+        return self._trim_to_boundary("\n".join(kept))
+
     def extract_context(
         self,
         content_source: Any,
@@ -145,30 +295,34 @@ class ContextExtractor:
         current_page = current_item_info.get("page_idx", 0)
         window_size = self.config.context_window
 
+        cache_key = (current_page, window_size)
+        self._ensure_indexed(content_list)
+        if cache_key in self._context_cache:
+            return self._context_cache[cache_key]
+
         start_page = max(0, current_page - window_size)
         end_page = current_page + window_size + 1
 
-        context_texts = []
-
-        for item in content_list:
-            item_page = item.get("page_idx", 0)
-            item_type = item.get("type", "")
+        context_blocks = []
+
+        for item_page in range(start_page, end_page):
+            for position in self._page_index.get(item_page, ()):
+                text_content = self._block_texts[position]
+                token_count = self._block_tokens[position]
+                # Add page marker for better context understanding
+                if item_page != current_page:
+                    context_blocks.append(
+                        (
+                            f"[Page {item_page}] {text_content}",
+                            token_count + self._page_marker_tokens(item_page),
+                        )
+                    )
+                else:
+                    context_blocks.append((text_content, token_count))
 
-            # Check if item is within context window and matches filter criteria
-            if (
-                start_page <= item_page < end_page
-                and item_type in self.config.filter_content_types
-            ):
-                text_content = self._extract_text_from_item(item)
-                if text_content and text_content.strip():
-                    # Add page marker for better context understanding
-                    if item_page != current_page:
-                        context_texts.append(f"[Page {item_page}] {text_content}")
-                    else:
-                        context_texts.append(text_content)
-
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        context = self._assemble_context(context_blocks)
+        self._context_cache[cache_key] = context
+        return context
 
     def _extract_chunk_context(
         self, content_list: List[Dict], current_item_info: Dict
@@ -188,20 +342,14 @@ class ContextExtractor:
         start_idx = max(0, current_index - window_size)
         end_idx = min(len(content_list), current_index + window_size + 1)
 
-        context_texts = []
-
-        for i in range(start_idx, end_idx):
-            if i != current_index:
-                item = content_list[i]
-                item_type = item.get("type", "")
-
-                if item_type in self.config.filter_content_types:
-                    text_content = self._extract_text_from_item(item)
-                    if text_content and text_content.strip():
-                        context_texts.append(text_content)
+        self._ensure_indexed(content_list)
+        context_blocks = [
+            (self._block_texts[i], self._block_tokens[i])
+            for i in range(start_idx, end_idx)
+            if i != current_index and self._block_texts[i]
+        ]
 
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        return self._assemble_context(context_blocks)
 
     def _extract_text_from_item(self, item: Dict) -> str:
         """Extract text content from a content item
@@ -325,36 +473,33 @@ class ContextExtractor:
 
             # Truncate to max tokens and decode back to text
             truncated_tokens = tokens[: self.config.max_context_tokens]
-            truncated_text = self.tokenizer.decode(truncated_tokens)
-
-            # Try to end at a sentence boundary
-            last_period = truncated_text.rfind(".")
-            last_newline = truncated_text.rfind("\n")
-
-            if last_period > len(truncated_text) * 0.8:
-                return truncated_text[: last_period + 1]
-            elif last_newline > len(truncated_text) * 0.8:
-                return truncated_text[:last_newline]
-            else:
-                return truncated_text + "..."
+            return self._trim_to_boundary(self.tokenizer.decode(truncated_tokens))
         else:
             # Fallback to character-based truncation if no tokenizer
             if len(context) <= self.config.max_context_tokens:
                 return context
 
             # Simple truncation - fallback when no tokenizer available
-            truncated = context[: self.config.max_context_tokens]
+            return self._trim_to_boundary(context[: self.config.max_context_tokens])
 
-            # Try to end at a sentence boundary
-            last_period = truncated.rfind(".")
-            last_newline = truncated.rfind("\n")
+    def _trim_to_boundary(self, truncated_text: str) -> str:
+        """End truncated text at a sentence boundary when one is close
 
-            if last_period > len(truncated) * 0.8:
-                return truncated[: last_period + 1]
-            elif last_newline > len(truncated) * 0.8:
-                return truncated[:last_newline]
-            else:
-                return truncated + "..."
+        Args:
+            truncated_text: Text already cut to the token limit
+
+        Returns:
+            Text ending at a period or newline, or marked with "..."
+        """
+        last_period = truncated_text.rfind(".")
+        last_newline = truncated_text.rfind("\n")
+
+        if last_period > len(truncated_text) * 0.8:
+            return truncated_text[: last_period + 1]
+        elif last_newline > len(truncated_text) * 0.8:
+            return truncated_text[:last_newline]
+        else:
+            return truncated_text + "..."
 
 
 class BaseModalProcessor:
@@ -403,6 +548,17 @@ class BaseModalProcessor:
         self.content_source = None
         self.content_format = "auto"
 
+        # Prompt token accounting; "cached_tokens" counts the longest prefix
+        # shared with a recent call, i.e. what a provider prompt cache can reuse.
+        # Token counts tokenize every prompt, so they are only estimated when
+        # track_prompt_tokens is set (by RAGAnything) or debug logging is on
+        self.prompt_stats = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0}
+        self.track_prompt_tokens = False
+        self._recent_prompts = deque(maxlen=16)
+
+        # Optional CaptionCache shared by all processors (set by RAGAnything)
+        self.caption_cache = None
+
     def set_content_source(self, content_source: Any, content_format: str = "auto"):
         """Set content source for context extraction
 
@@ -412,8 +568,260 @@ class BaseModalProcessor:
         """
         self.content_source = content_source
         self.content_format = content_format
+        self.context_extractor.set_content_source(content_source, content_format)
         logger.info(f"Content source set with format: {content_format}")
 
+    def _get_context_prompt_template(self, prompt_name: str) -> str:
+        """Select the template used when surrounding context is available
+
+        Args:
+            prompt_name: Base prompt name (e.g. "vision_prompt")
+
+        Returns:
+            The context-first template under the "context_first" layout,
+            otherwise the interleaved "_with_context" template
+        """
+        if self.context_extractor.config.prompt_layout == "context_first":
+            template = PROMPTS.get(f"{prompt_name}_context_first")
+            if template:
+                return template
+        return PROMPTS.get(f"{prompt_name}_with_context", PROMPTS[prompt_name])
+
+    def _count_prompt_tokens(self, text: str) -> int:
+        """Count prompt tokens with the LightRAG tokenizer"""
+        if not text:
+            return 0
+        if self.tokenizer:
+            return len(self.tokenizer.encode(text))
+        return len(text)
+
+    async def _call_caption_func(self, prompt: str, system_prompt: str, **kwargs):
+        """Call the caption model and record prompt and cached-prefix token counts
+
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            **kwargs: Extra arguments for the caption function (e.g. image_data)
+
+        Returns:
+            The caption function's response
+        """
+        self._record_prompt_usage(system_prompt, prompt)
+        return await self.modal_caption_func(
+            prompt, system_prompt=system_prompt, **kwargs
+        )
+
+    def _record_prompt_usage(self, system_prompt: str, prompt: str) -> None:
+        """Count a call in ``prompt_stats``, with token estimates when tracked
+
+        Args:
+            system_prompt: System prompt of the call
+            prompt: Text of the user prompt (images are not counted)
+        """
+        self.prompt_stats["calls"] += 1
+        if not (self.track_prompt_tokens or logger.isEnabledFor(logging.DEBUG)):
+            return
+
+        full_prompt = f"{system_prompt}\n{prompt}"
+        shared_prefix = max(
+            (
+                os.path.commonprefix([recent, full_prompt])
+                for recent in self._recent_prompts
+            ),
+            key=len,
+            default="",
+        )
+        self._recent_prompts.append(full_prompt)
+
+        prompt_tokens = self._count_prompt_tokens(full_prompt)
+        cached_tokens = self._count_prompt_tokens(shared_prefix)
+        self.prompt_stats["prompt_tokens"] += prompt_tokens
+        self.prompt_stats["cached_tokens"] += cached_tokens
+        logger.debug(
+            f"Caption call: {prompt_tokens} prompt tokens, "
+            f"{cached_tokens} shared with a recent prompt"
+        )
+
+    def get_prompt_stats(self) -> Dict[str, Any]:
+        """Caption call count, with token estimates when they are tracked"""
+        stats = {"calls": self.prompt_stats["calls"]}
+        if self.track_prompt_tokens:
+            stats["estimated_prompt_tokens"] = self.prompt_stats["prompt_tokens"]
+            stats["estimated_cached_tokens"] = self.prompt_stats["cached_tokens"]
+        return stats
+
+    def _parse_keyed_response(self, response: str, keys: List[str]) -> Dict[str, str]:
+        """Extract the per-item results of a batched analysis response
+
+        Args:
+            response: Model response holding a JSON object keyed by item ID
+            keys: Item IDs sent in the request
+
+        Returns:
+            Dict mapping each ID with a complete result to a JSON string of that
+            result; IDs that are missing or incomplete are left out
+        """
+        try:
+            response_data = self._robust_json_parse(response)
+        except Exception as e:
+            logger.warning(f"Could not parse batched analysis response: {e}")
+            return {}
+        if not isinstance(response_data, dict):
+            return {}
+
+        results = {}
+        for key in keys:
+            entry = response_data.get(key)
+            if not isinstance(entry, dict):
+                continue
+            entity_data = entry.get("entity_info")
+            if not entry.get("detailed_description") or not isinstance(
+                entity_data, dict
+            ):
+                continue
+            if not all(
+                field in entity_data
+                for field in ["entity_name", "entity_type", "summary"]
+            ):
+                continue
+            results[key] = json.dumps(
+                {
+                    "detailed_description": entry["detailed_description"],
+                    "entity_info": entity_data,
+                },
+                ensure_ascii=False,
+            )
+        return results
+
+    def _caption_cache_key(
+        self,
+        item_digest: str,
+        prompt_template: str,
+        system_prompt: str,
+        context: str = "",
+        entity_name: str = None,
+    ):
+        """Build the caption cache key for a request, or None without a cache"""
+        if self.caption_cache is None:
+            return None
+        return self.caption_cache.make_key(
+            item_digest,
+            prompt_template,
+            system_prompt,
+            context=context,
+            entity_name=entity_name,
+        )
+
+    async def _cached_caption(self, cache_key, call) -> str:
+        """Return a cached caption response, or run ``call`` and cache its result
+
+        Args:
+            cache_key: Key from ``_caption_cache_key`` (None disables caching)
+            call: Coroutine function performing the model call
+
+        Returns:
+            The model response
+        """
+        if self.caption_cache is None or cache_key is None:
+            return await call()
+        return await self.caption_cache.get_or_call(cache_key, call)
+
+    async def _generate_text_descriptions_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        prompt_name: str,
+        id_prefix: str,
+        system_prompt: str,
+        render_item,
+        parse_response,
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Describe several text items with one LLM request
+
+        The request holds ``PROMPTS[f"{prompt_name}_batch_prompt"]`` followed by
+        one ``PROMPTS[f"{prompt_name}_batch_item"]`` section per item, and the
+        model answers with a JSON object keyed by item ID. Items missing from
+        the response, or returned incomplete, are sent once more in a smaller
+        request; whatever is still missing is left for single-item calls.
+
+        Args:
+            items: (modal_content, item_info) pairs
+            prompt_name: Prompt family, e.g. "table" or "equation"
+            id_prefix: Prefix of the item IDs used in the request
+            system_prompt: System prompt of the request
+            render_item: Function returning the item's template fields
+            parse_response: Function parsing a single-item response
+
+        Returns:
+            List with (description, entity_info) for each item, or None where
+            the item needs a single-item call
+        """
+        batch_prompt = PROMPTS[f"{prompt_name}_batch_prompt"]
+        item_prompt = PROMPTS[f"{prompt_name}_batch_item"]
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(items)
+
+        # (position, item_id, item text, cache key)
+        pending = []
+        for position, (content_data, item_info) in enumerate(items):
+            fields = render_item(content_data)
+            context = self._get_context_for_item(item_info) if item_info else ""
+            cache_key = self._caption_cache_key(
+                content_digest(*fields.values()),
+                batch_prompt + item_prompt,
+                system_prompt,
+                context,
+            )
+            if cache_key is not None:
+                cached = await self.caption_cache.get(cache_key)
+                if cached is not None:
+                    results[position] = parse_response(cached)
+                    continue
+
+            item_id = f"{id_prefix}_{len(pending) + 1}"
+            item_text = item_prompt.format(
+                item_id=item_id, context=context if context else "None", **fields
+            )
+            pending.append((position, item_id, item_text, cache_key))
+
+        # One request, then one retry limited to the items it did not return
+        for attempt in range(2):
+            if len(pending) < 2:
+                break
+            item_ids = [item_id for _, item_id, _, _ in pending]
+            prompt = batch_prompt.format(
+                count=len(pending),
+                item_ids=", ".join(item_ids),
+                items="\n\n".join(item_text for _, _, item_text, _ in pending),
+            )
+            try:
+                response = await self._call_caption_func(
+                    prompt, system_prompt=system_prompt
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Batched {prompt_name} analysis of {len(pending)} items failed: {e}"
+                )
+                break
+
+            entries = self._parse_keyed_response(response, item_ids)
+            for position, item_id, _, cache_key in pending:
+                entry = entries.get(item_id)
+                if entry is None:
+                    continue
+                results[position] = parse_response(entry)
+                if cache_key is not None:
+                    await self.caption_cache.put(cache_key, entry)
+
+            pending = [pair for pair in pending if pair[1] not in entries]
+            if pending:
+                logger.warning(
+                    f"Batched {prompt_name} response lacked {len(pending)}/"
+                    f"{len(item_ids)} items"
+                    + (", retrying them" if attempt == 0 and len(pending) > 1 else "")
+                )
+
+        return results
+
     def _get_context_for_item(self, item_info: Dict[str, Any]) -> str:
         """Get context for current processing item
 
@@ -798,11 +1206,9 @@ class ImageModalProcessor(BaseModalProcessor):
         super().__init__(lightrag, modal_caption_func, context_extractor)
 
     def _encode_image_to_base64(self, image_path: str) -> str:
-        """Encode image to base64"""
+        """Encode image to base64 through the shared, content-hash cached preprocessor"""
         try:
-            with open(image_path, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return encoded_string
+            return get_image_preprocessor().encode_for_vlm(image_path)
         except Exception as e:
             logger.error(f"Failed to encode image {image_path}: {e}")
             return ""
@@ -863,38 +1269,51 @@ class ImageModalProcessor(BaseModalProcessor):
 
             # Build detailed visual analysis prompt with context
             if context:
-                vision_prompt = PROMPTS.get(
-                    "vision_prompt_with_context", PROMPTS["vision_prompt"]
-                ).format(
-                    context=context,
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
-                )
+                template = self._get_context_prompt_template("vision_prompt")
             else:
-                vision_prompt = PROMPTS["vision_prompt"].format(
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
+                template = PROMPTS["vision_prompt"]
+            vision_prompt = template.format(
+                context=context,
+                entity_name=entity_name
+                if entity_name
+                else "unique descriptive name for this image",
+                image_path=image_path,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+            )
+            system_prompt = PROMPTS["IMAGE_ANALYSIS_SYSTEM"]
+
+            cache_key = None
+            if self.caption_cache is not None:
+                image_digest = await asyncio.to_thread(
+                    get_image_preprocessor().content_digest, image_path
+                )
+                cache_key = self._caption_cache_key(
+                    content_digest(image_digest, captions, footnotes),
+                    template,
+                    system_prompt,
+                    context,
+                    entity_name,
                 )
 
-            # Encode image to base64
-            image_base64 = self._encode_image_to_base64(image_path)
-            if not image_base64:
-                raise RuntimeError(f"Failed to encode image to base64: {image_path}")
+            async def call_vision_model():
+                # Encode image to base64
+                image_base64 = await asyncio.to_thread(
+                    self._encode_image_to_base64, image_path
+                )
+                if not image_base64:
+                    raise RuntimeError(
+                        f"Failed to encode image to base64: {image_path}"
+                    )
 
-            # Call vision model with encoded image
-            response = await self.modal_caption_func(
-                vision_prompt,
-                image_data=image_base64,
-                system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
-            )
+                # Call vision model with encoded image
+                return await self._call_caption_func(
+                    vision_prompt,
+                    image_data=image_base64,
+                    system_prompt=system_prompt,
+                )
+
+            response = await self._cached_caption(cache_key, call_vision_model)
 
             # Parse response (reuse existing logic)
             enhanced_caption, entity_info = self._parse_response(response, entity_name)
@@ -913,6 +1332,131 @@ class ImageModalProcessor(BaseModalProcessor):
             }
             return str(modal_content), fallback_entity
 
+    async def generate_descriptions_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        max_image_kb: int = 512,
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Describe several images with one multi-image vision request
+
+        Each image is sent with its own captions, footnotes and context, and
+        the model answers with a JSON object keyed by image ID. Images that
+        are missing, larger than ``max_image_kb`` once encoded, or absent from
+        a malformed response get no result, so that the caller can fall back
+        to ``generate_description_only`` for them.
+
+        Args:
+            items: (modal_content, item_info) pairs of image items
+            max_image_kb: Largest encoded image in KB that may share a request
+
+        Returns:
+            List with (description, entity_info) for each item, or None where
+            the item needs a single-image call
+        """
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(items)
+        template = PROMPTS["vision_batch_prompt"] + PROMPTS["vision_batch_item"]
+        system_prompt = PROMPTS["IMAGE_ANALYSIS_SYSTEM"]
+
+        # (position, image_id, item text, image base64, cache key)
+        pending = []
+        for position, (content_data, item_info) in enumerate(items):
+            image_path = content_data.get("img_path")
+            if not image_path or not Path(image_path).exists():
+                continue
+            captions = content_data.get(
+                "image_caption", content_data.get("img_caption", [])
+            )
+            footnotes = content_data.get(
+                "image_footnote", content_data.get("img_footnote", [])
+            )
+            context = self._get_context_for_item(item_info) if item_info else ""
+
+            cache_key = None
+            if self.caption_cache is not None:
+                image_digest = await asyncio.to_thread(
+                    get_image_preprocessor().content_digest, image_path
+                )
+                cache_key = self._caption_cache_key(
+                    content_digest(image_digest, captions, footnotes),
+                    template,
+                    system_prompt,
+                    context,
+                )
+                cached = await self.caption_cache.get(cache_key)
+                if cached is not None:
+                    results[position] = self._parse_response(cached)
+                    continue
+
+            image_base64 = await asyncio.to_thread(
+                self._encode_image_to_base64, image_path
+            )
+            if not image_base64 or len(image_base64) * 3 // 4 > max_image_kb * 1024:
+                continue
+
+            image_id = f"img_{len(pending) + 1}"
+            item_text = PROMPTS["vision_batch_item"].format(
+                image_id=image_id,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+                context=context if context else "None",
+            )
+            pending.append((position, image_id, item_text, image_base64, cache_key))
+
+        # A single pending image is cheaper through the regular prompt
+        if len(pending) < 2:
+            return results
+
+        image_ids = [image_id for _, image_id, _, _, _ in pending]
+        instructions = PROMPTS["vision_batch_prompt"].format(
+            count=len(pending), image_ids=", ".join(image_ids)
+        )
+        content_parts = [{"type": "text", "text": instructions}]
+        for _, _, item_text, image_base64, _ in pending:
+            content_parts.append({"type": "text", "text": item_text})
+            content_parts.append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{image_mime_type(image_base64)};base64,{image_base64}"
+                    },
+                }
+            )
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content_parts},
+        ]
+
+        self._record_prompt_usage(
+            system_prompt,
+            "\n".join(part["text"] for part in content_parts if "text" in part),
+        )
+        try:
+            response = await self.modal_caption_func("", messages=messages)
+        except Exception as e:
+            logger.warning(
+                f"Multi-image request for {len(pending)} images failed, "
+                f"falling back to single-image calls: {e}"
+            )
+            return results
+
+        entries = self._parse_keyed_response(response, image_ids)
+        for position, image_id, _, _, cache_key in pending:
+            entry = entries.get(image_id)
+            if entry is None:
+                continue
+            results[position] = self._parse_response(entry)
+            if cache_key is not None:
+                await self.caption_cache.put(cache_key, entry)
+
+        missing = len(pending) - sum(image_id in entries for image_id in image_ids)
+        if missing:
+            logger.warning(
+                f"Multi-image response lacked {missing}/{len(pending)} images, "
+                "falling back to single-image calls for them"
+            )
+        return results
+
     async def process_multimodal_content(
         self,
         modal_content,
@@ -1060,33 +1604,49 @@ class TableModalProcessor(BaseModalProcessor):
 
             # Build table analysis prompt with context
             if context:
-                table_prompt = PROMPTS.get(
-                    "table_prompt_with_context", PROMPTS["table_prompt"]
-                ).format(
-                    context=context,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this table",
-                    table_img_path=table_img_path,
-                    table_caption=table_caption if table_caption else "None",
-                    table_body=table_body,
-                    table_footnote=table_footnote if table_footnote else "None",
-                )
+                template = self._get_context_prompt_template("table_prompt")
             else:
-                table_prompt = PROMPTS["table_prompt"].format(
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this table",
-                    table_img_path=table_img_path,
-                    table_caption=table_caption if table_caption else "None",
-                    table_body=table_body,
-                    table_footnote=table_footnote if table_footnote else "None",
+                template = PROMPTS["table_prompt"]
+            table_prompt = template.format(
+                context=context,
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this table",
+                table_img_path=table_img_path,
+                table_caption=table_caption if table_caption else "None",
+                table_body=table_body,
+                table_footnote=table_footnote if table_footnote else "None",
+            )
+            system_prompt = PROMPTS["TABLE_ANALYSIS_SYSTEM"]
+
+            cache_key = None
+            if self.caption_cache is not None:
+                # Tables without a body are told apart by their image
+                image_digest = ""
+                if (
+                    not str(table_body).strip()
+                    and table_img_path
+                    and Path(table_img_path).exists()
+                ):
+                    image_digest = await asyncio.to_thread(
+                        get_image_preprocessor().content_digest, table_img_path
+                    )
+                cache_key = self._caption_cache_key(
+                    content_digest(
+                        table_body, table_caption, table_footnote, image_digest
+                    ),
+                    template,
+                    system_prompt,
+                    context,
+                    entity_name,
                 )
 
             # Call LLM for table analysis
-            response = await self.modal_caption_func(
-                table_prompt,
-                system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
+            response = await self._cached_caption(
+                cache_key,
+                lambda: self._call_caption_func(
+                    table_prompt, system_prompt=system_prompt
+                ),
             )
 
             # Parse response (reuse existing logic)
@@ -1108,6 +1668,45 @@ class TableModalProcessor(BaseModalProcessor):
             }
             return str(modal_content), fallback_entity
 
+    async def generate_descriptions_batch(
+        self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Analyze several tables with one LLM request
+
+        Tables without a body are left for single-table calls: a text request
+        cannot tell them apart, and only the single-table path keys the caption
+        cache on their image.
+
+        Args:
+            items: (modal_content, item_info) pairs of table items
+
+        Returns:
+            List with (description, entity_info) for each item, or None where
+            the item needs a single-table call
+        """
+        positions = [
+            position
+            for position, (content_data, _) in enumerate(items)
+            if str(content_data.get("table_body", "")).strip()
+        ]
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(items)
+        batched = await self._generate_text_descriptions_batch(
+            [items[position] for position in positions],
+            prompt_name="table",
+            id_prefix="tbl",
+            system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
+            render_item=lambda content_data: {
+                "table_caption": content_data.get("table_caption", []) or "None",
+                "table_body": content_data.get("table_body", ""),
+                "table_footnote": content_data.get("table_footnote", []) or "None",
+            },
+            parse_response=self._parse_table_response,
+        )
+        for position, result in zip(positions, batched):
+            results[position] = result
+        return results
+
     async def process_multimodal_content(
         self,
         modal_content,
@@ -1252,29 +1851,32 @@ class EquationModalProcessor(BaseModalProcessor):
 
             # Build equation analysis prompt with context
             if context:
-                equation_prompt = PROMPTS.get(
-                    "equation_prompt_with_context", PROMPTS["equation_prompt"]
-                ).format(
-                    context=context,
-                    equation_text=equation_text,
-                    equation_format=equation_format,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this equation",
-                )
+                template = self._get_context_prompt_template("equation_prompt")
             else:
-                equation_prompt = PROMPTS["equation_prompt"].format(
-                    equation_text=equation_text,
-                    equation_format=equation_format,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this equation",
-                )
+                template = PROMPTS["equation_prompt"]
+            equation_prompt = template.format(
+                context=context,
+                equation_text=equation_text,
+                equation_format=equation_format,
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this equation",
+            )
+            system_prompt = PROMPTS["EQUATION_ANALYSIS_SYSTEM"]
+            cache_key = self._caption_cache_key(
+                content_digest(equation_text, equation_format),
+                template,
+                system_prompt,
+                context,
+                entity_name,
+            )
 
             # Call LLM for equation analysis
-            response = await self.modal_caption_func(
-                equation_prompt,
-                system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
+            response = await self._cached_caption(
+                cache_key,
+                lambda: self._call_caption_func(
+                    equation_prompt, system_prompt=system_prompt
+                ),
             )
 
             # Parse response (reuse existing logic)
@@ -1296,6 +1898,31 @@ class EquationModalProcessor(BaseModalProcessor):
             }
             return str(modal_content), fallback_entity
 
+    async def generate_descriptions_batch(
+        self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Analyze several equations with one LLM request
+
+        Args:
+            items: (modal_content, item_info) pairs of equation items
+
+        Returns:
+            List with (description, entity_info) for each item, or None where
+            the item needs a single-equation call
+        """
+        return await self._generate_text_descriptions_batch(
+            items,
+            prompt_name="equation",
+            id_prefix="eq",
+            system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
+            render_item=lambda content_data: {
+                "equation_text": content_data.get("text"),
+                "equation_format": content_data.get("text_format", ""),
+            },
+            parse_response=self._parse_equation_response,
+        )
+
     async def process_multimodal_content(
         self,
         modal_content,
@@ -1424,30 +2051,33 @@ class GenericModalProcessor(BaseModalProcessor):
 
             # Build generic analysis prompt with context
             if context:
-                generic_prompt = PROMPTS.get(
-                    "generic_prompt_with_context", PROMPTS["generic_prompt"]
-                ).format(
-                    context=context,
-                    content_type=content_type,
-                    entity_name=entity_name
-                    if entity_name
-                    else f"descriptive name for this {content_type}",
-                    content=str(modal_content),
-                )
+                template = self._get_context_prompt_template("generic_prompt")
             else:
-                generic_prompt = PROMPTS["generic_prompt"].format(
-                    content_type=content_type,
-                    entity_name=entity_name
-                    if entity_name
-                    else f"descriptive name for this {content_type}",
-                    content=str(modal_content),
-                )
+                template = PROMPTS["generic_prompt"]
+            generic_prompt = template.format(
+                context=context,
+                content_type=content_type,
+                entity_name=entity_name
+                if entity_name
+                else f"descriptive name for this {content_type}",
+                content=str(modal_content),
+            )
+            system_prompt = PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
+                content_type=content_type
+            )
+            cache_key = self._caption_cache_key(
+                content_digest(content_type, str(modal_content)),
+                template,
+                system_prompt,
+                context,
+                entity_name,
+            )
 
             # Call LLM for generic analysis
-            response = await self.modal_caption_func(
-                generic_prompt,
-                system_prompt=PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
-                    content_type=content_type
+            response = await self._cached_caption(
+                cache_key,
+                lambda: self._call_caption_func(
+                    generic_prompt, system_prompt=system_prompt
                 ),
             )
 
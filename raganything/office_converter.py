@@ -0,0 +1,405 @@
+"""
+Persistent headless LibreOffice conversion pool
+
+Each worker is a long-running ``soffice --headless`` process that listens on a
+local named pipe. Documents are converted to PDF through a UNO connection to
+that process, so a folder of Office files pays LibreOffice's startup cost once
+per worker instead of once per document.
+
+The pool needs the ``uno`` Python module, which ships with LibreOffice (or the
+``python3-uno`` system package) and is not installable from PyPI. When it is
+missing, or a worker crashes, callers fall back to the one-shot
+``soffice --convert-to pdf`` command.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from raganything.worker_pool import SharedPool, WorkerPool, WorkerPoolUnavailable
+
+
+class OfficeConverterUnavailable(WorkerPoolUnavailable):
+    """Raised when the pool cannot convert and the caller should use the CLI"""
+
+
+class OfficeConversionError(RuntimeError):
+    """Raised when a healthy LibreOffice worker failed to convert a document"""
+
+
+@lru_cache(maxsize=1)
+def find_office_executable() -> Optional[str]:
+    """
+    Locate the LibreOffice executable once per process
+
+    Returns:
+        Optional[str]: Path to libreoffice/soffice, or None if not installed
+    """
+    for cmd in ["libreoffice", "soffice"]:
+        path = shutil.which(cmd)
+        if path:
+            return path
+    # Default install locations that are usually not on PATH
+    for candidate in [
+        "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+        r"C:\Program Files\LibreOffice\program\soffice.exe",
+    ]:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+# PDF export filter for each document service LibreOffice may load
+_PDF_EXPORT_FILTERS = [
+    ("com.sun.star.text.GenericTextDocument", "writer_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+]
+
+
+def _property(name: str, value):
+    import uno
+
+    prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class OfficeConverterWorker:
+    """A single headless LibreOffice process and its UNO connection"""
+
+    def __init__(self, executable: str, startup_timeout: float = 60.0):
+        self.executable = executable
+        self.startup_timeout = startup_timeout
+        self.pipe_name = f"raganything_office_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.jobs_done = 0
+        self.process = None
+        self.desktop = None
+        self.profile_dir: Optional[str] = None
+        self._killed = False
+
+    def start(self) -> None:
+        """Start LibreOffice and connect to it over the pipe"""
+        try:
+            import uno
+        except ImportError as e:
+            raise OfficeConverterUnavailable(
+                f"The 'uno' module is not importable ({e}); install LibreOffice's "
+                "Python bindings (e.g. python3-uno) to use the converter pool"
+            )
+
+        # A private profile lets several instances run side by side
+        self.profile_dir = tempfile.mkdtemp(prefix="raganything_office_profile_")
+        cmd = [
+            self.executable,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={Path(self.profile_dir).as_uri()}",
+            f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+        ]
+        popen_kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if platform.system() == "Windows":
+            popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        self.process = subprocess.Popen(cmd, **popen_kwargs)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception as e:
+                # NoConnectException until LibreOffice starts listening
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise OfficeConverterUnavailable(
+                        f"LibreOffice did not start listening: {e}"
+                    )
+                time.sleep(0.25)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        logging.info(f"[Office] Converter worker {self.process.pid} ready")
+
+    def is_alive(self) -> bool:
+        return (
+            self.process is not None
+            and self.process.poll() is None
+            and not self._killed
+        )
+
+    def ping(self) -> bool:
+        """Check the worker is alive; UNO calls cannot time out, so only the process is checked"""
+        return self.is_alive()
+
+    def convert(
+        self, doc_path: Path, pdf_path: Path, timeout: Optional[float] = None
+    ) -> None:
+        """
+        Convert one document to PDF
+
+        Args:
+            doc_path: Office document to convert
+            pdf_path: Destination PDF file
+            timeout: Seconds before the LibreOffice process is killed
+
+        Raises:
+            OfficeConversionError: If LibreOffice could not convert the document
+            OfficeConverterUnavailable: If the worker died or timed out
+        """
+        import uno
+
+        self.jobs_done += 1
+        # UNO calls cannot be interrupted; killing the process makes them raise
+        watchdog = None
+        if timeout:
+            watchdog = threading.Timer(timeout, self.kill)
+            watchdog.daemon = True
+            watchdog.start()
+
+        document = None
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(doc_path.resolve())),
+                "_blank",
+                0,
+                (_property("Hidden", True), _property("ReadOnly", True)),
+            )
+            if document is None:
+                raise OfficeConversionError(
+                    f"LibreOffice could not open {doc_path.name}"
+                )
+
+            export_filter = "writer_pdf_Export"
+            for service, filter_name in _PDF_EXPORT_FILTERS:
+                if document.supportsService(service):
+                    export_filter = filter_name
+                    break
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(pdf_path.resolve())),
+                (_property("FilterName", export_filter),),
+            )
+        except OfficeConversionError:
+            raise
+        except Exception as e:
+            if self._killed:
+                raise OfficeConverterUnavailable(
+                    f"LibreOffice conversion timed out after {timeout} seconds"
+                )
+            if not self.is_alive():
+                raise OfficeConverterUnavailable(f"LibreOffice worker died: {e}")
+            raise OfficeConversionError(
+                f"LibreOffice failed to convert {doc_path.name}: {e}"
+            )
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            if document is not None and self.is_alive():
+                try:
+                    document.close(True)
+                except Exception:
+                    pass
+
+    def kill(self) -> None:
+        """Kill the LibreOffice process immediately"""
+        self._killed = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask LibreOffice to exit, killing it if it does not"""
+        if self.desktop is not None and self.is_alive():
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+        if self.process is not None:
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait(timeout)
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.process = None
+        self.desktop = None
+        self.profile_dir = None
+
+
+class OfficeConverterPool(WorkerPool[OfficeConverterWorker]):
+    """
+    Pool of long-running headless LibreOffice processes
+
+    Conversions are handed to idle workers through a thread-safe queue. At most
+    `size + max_pending` conversions may be in flight; further requests wait up
+    to `queue_timeout` seconds and then fall back to the CLI. Workers are
+    restarted when they crash or time out, and recycled after
+    `max_jobs_per_worker` conversions to bound memory growth.
+    """
+
+    log_prefix = "[Office]"
+    unavailable_error = OfficeConverterUnavailable
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_jobs_per_worker: int = 200,
+        max_pending: int = 16,
+        queue_timeout: float = 300.0,
+        startup_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            size: Number of LibreOffice processes
+            max_jobs_per_worker: Restart a worker after this many conversions (0 disables recycling)
+            max_pending: Conversions allowed to wait for a free worker
+            queue_timeout: Seconds a conversion may wait before falling back to the CLI
+            startup_timeout: Seconds to wait for LibreOffice to accept connections
+        """
+        super().__init__(size, max_jobs_per_worker)
+        self.max_pending = max(0, max_pending)
+        self.queue_timeout = queue_timeout
+        self.startup_timeout = startup_timeout
+
+        self._slots = threading.BoundedSemaphore(self.size + self.max_pending)
+        self.stats["rejected"] = 0
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return dict(super().settings, max_pending=self.max_pending)
+
+    def _create_worker(self) -> OfficeConverterWorker:
+        return OfficeConverterWorker(
+            find_office_executable() or "soffice", self.startup_timeout
+        )
+
+    def _new_worker(self) -> OfficeConverterWorker:
+        if find_office_executable() is None:
+            raise OfficeConverterUnavailable("LibreOffice is not installed")
+        return super()._new_worker()
+
+    def convert(
+        self,
+        doc_path: Union[str, Path],
+        pdf_path: Union[str, Path],
+        timeout: Optional[float] = 60.0,
+    ) -> Path:
+        """
+        Convert a document to PDF on the next idle worker
+
+        Args:
+            doc_path: Office document to convert
+            pdf_path: Destination PDF file
+            timeout: Seconds allowed for the conversion
+
+        Returns:
+            Path: The written PDF file
+
+        Raises:
+            OfficeConversionError: If LibreOffice could not convert the document
+            OfficeConverterUnavailable: If the pool cannot take the job
+        """
+        doc_path, pdf_path = Path(doc_path), Path(pdf_path)
+        self.start()
+        if not self.available:
+            raise OfficeConverterUnavailable(
+                self._unavailable_reason or "Converter pool closed"
+            )
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.stats["rejected"] += 1
+            raise OfficeConverterUnavailable("Office converter queue is full")
+        try:
+            worker = self._acquire()
+            try:
+                self.stats["jobs"] += 1
+                started = time.time()
+                try:
+                    worker.convert(doc_path, pdf_path, timeout=timeout)
+                except OfficeConverterUnavailable:
+                    self.stats["failures"] += 1
+                    worker = self._replace(worker)
+                    raise
+                except OfficeConversionError:
+                    self.stats["failures"] += 1
+                    raise
+                logging.info(
+                    f"[Office] Converted {doc_path.name} in {time.time() - started:.2f}s"
+                )
+            finally:
+                self._release(worker)
+        finally:
+            self._slots.release()
+        return pdf_path
+
+
+# Process-wide pool shared by all parsers
+_shared_pool: SharedPool[OfficeConverterPool] = SharedPool()
+
+
+def configure_office_converter_pool(
+    size: int,
+    max_jobs_per_worker: int = 200,
+    max_pending: int = 16,
+) -> Optional[OfficeConverterPool]:
+    """
+    Create the process-wide LibreOffice converter pool
+
+    Workers are started lazily on the first conversion. Calling this again with
+    the same settings returns the existing pool; a size of 0 shuts the pool down.
+    Hand the returned pool to `release_office_converter_pool` when done with it.
+
+    Args:
+        size: Number of LibreOffice processes (0 disables the pool)
+        max_jobs_per_worker: Restart a worker after this many conversions
+        max_pending: Conversions allowed to wait for a free worker
+
+    Returns:
+        Optional[OfficeConverterPool]: The active pool, or None if disabled
+    """
+    return _shared_pool.configure(
+        {
+            "size": size,
+            "max_jobs_per_worker": max_jobs_per_worker,
+            "max_pending": max_pending,
+        },
+        lambda: OfficeConverterPool(size, max_jobs_per_worker, max_pending),
+    )
+
+
+def get_office_converter_pool() -> Optional[OfficeConverterPool]:
+    """Return the process-wide pool if one is configured and usable"""
+    return _shared_pool.get()
+
+
+def release_office_converter_pool(pool: Optional[OfficeConverterPool]) -> None:
+    """Release a pool returned by `configure_office_converter_pool`, stopping it after its last user"""
+    _shared_pool.release(pool)
+
+
+def shutdown_office_converter_pool() -> None:
+    """Stop the process-wide pool if one exists, whatever its number of users"""
+    _shared_pool.shutdown()
@@ -12,11 +12,16 @@ For Office documents (.doc, .docx, .ppt, .pptx), please convert them to PDF form
 from __future__ import annotations
 
 
+import re
 import json
+import itertools
+import asyncio
 import argparse
 import base64
 import subprocess
 import tempfile
+import threading
+import time
 import logging
 from pathlib import Path
 from typing import (
@@ -26,6 +31,8 @@ from typing import (
     Union,
     Tuple,
     Any,
+    AsyncIterator,
+    Iterator,
     TypeVar,
 )
 
@@ -92,6 +99,29 @@ class Parser:
                 base_output_dir = doc_path.parent / "libreoffice_output"
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
+            final_pdf_path = base_output_dir / f"{name_without_suff}.pdf"
+
+            # Prefer the persistent LibreOffice pool when one is configured
+            from raganything.office_converter import (
+                OfficeConverterUnavailable,
+                find_office_executable,
+                get_office_converter_pool,
+            )
+
+            pool = get_office_converter_pool()
+            if pool is not None:
+                try:
+                    pool.convert(doc_path, final_pdf_path, timeout=60)
+                    if final_pdf_path.stat().st_size < 100:
+                        raise RuntimeError(
+                            "Generated PDF appears to be empty or corrupted. "
+                            "Original file may have issues or LibreOffice conversion failed."
+                        )
+                    return final_pdf_path
+                except OfficeConverterUnavailable as e:
+                    logging.warning(
+                        f"Office converter pool unavailable ({e}), using LibreOffice CLI"
+                    )
 
             # Create temporary directory for PDF conversion
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -103,8 +133,11 @@ class Parser:
                 # Prepare subprocess parameters to hide console window on Windows
                 import platform
 
-                # Try LibreOffice commands in order of preference
-                commands_to_try = ["libreoffice", "soffice"]
+                # Use the executable found on a previous call, else try each name
+                executable = find_office_executable()
+                commands_to_try = (
+                    [executable] if executable else ["libreoffice", "soffice"]
+                )
 
                 conversion_successful = False
                 for cmd in commands_to_try:
@@ -189,7 +222,6 @@ class Parser:
                     )
 
                 # Copy PDF to final output directory
-                final_pdf_path = base_output_dir / f"{name_without_suff}.pdf"
                 import shutil
 
                 shutil.copy2(pdf_path, final_pdf_path)
@@ -580,6 +612,9 @@ class MineruParser(Parser):
     # Class-level logger
     logger = logging.getLogger(__name__)
 
+    # Output without a line break longer than this is logged in pieces
+    MAX_OUTPUT_LINE_BYTES = 1024 * 1024
+
     def __init__(self) -> None:
         """Initialize MineruParser"""
         super().__init__()
@@ -597,11 +632,13 @@ class MineruParser(Parser):
         """
         Call MinerU cloud API service for document parsing (mineru.net)
 
-        Uses the batch processing API:
-        1. Request upload URL
-        2. Upload file via PUT
-        3. Poll for extraction results
-        4. Download and extract ZIP file
+        Files are handed to the shared MineruCloudClient, which coalesces
+        concurrent calls into batch submissions and polls all outstanding
+        batches from one task:
+        1. Request upload URLs (one batch request for many files)
+        2. Stream files to their upload URLs via PUT
+        3. Wait for the extraction result
+        4. Stream the result ZIP to disk and extract the members needed
 
         Args:
             input_path: Path to input file
@@ -613,242 +650,41 @@ class MineruParser(Parser):
             **kwargs: Additional parameters (formula, table, etc.)
         """
         import aiohttp
-        import asyncio
-        from pathlib import Path as PathlibPath
-        import zipfile
-        import io
+        from raganything.mineru_cloud import get_mineru_cloud_client
 
-        input_path = PathlibPath(input_path)
-        output_dir = PathlibPath(output_dir)
+        input_path = Path(input_path)
+        output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
         if not api_key:
             raise ValueError("api_key is required for MinerU cloud API")
 
-        # Extract base URL if full endpoint is provided
-        if "/extract/task" in api_url:
-            base_url = api_url.rsplit("/extract/task", 1)[0]
-        else:
-            base_url = api_url
-
         try:
-            # Create SSL context that allows legacy renegotiation
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
-
-            # Create connector with SSL context
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-
-            async with aiohttp.ClientSession(connector=connector) as session:
-                logging.info(f"Calling MinerU Cloud API for {input_path.name}")
-
-                # Step 1: Request upload URL
-                batch_url = f"{base_url}/file-urls/batch"
-
-                files_data = [{
-                    "name": input_path.name,
-                    "is_ocr": method == "ocr" or method == "auto",
-                    "data_id": input_path.stem,
-                    "language": lang or "ch",
-                }]
-
-                batch_request = {
-                    "enable_formula": kwargs.get("formula", True),
-                    "language": lang or "ch",
-                    "files": files_data
-                }
-
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}"
-                }
-
-                logging.info(f"Step 1: Requesting upload URL...")
-                async with session.post(
-                    batch_url,
-                    headers=headers,
-                    json=batch_request,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as batch_response:
-                    if batch_response.status != 200:
-                        error_text = await batch_response.text()
-                        raise RuntimeError(
-                            f"Batch request failed with status {batch_response.status}: {error_text}"
-                        )
+            client = get_mineru_cloud_client(api_url, api_key)
+            logging.info(f"Calling MinerU Cloud API for {input_path.name}")
+
+            result_url = await client.extract(
+                input_path,
+                is_ocr=method == "ocr" or method == "auto",
+                language=lang or "ch",
+                enable_formula=kwargs.get("formula", True),
+                enable_table=kwargs.get("table", True),
+            )
 
-                    batch_result = await batch_response.json()
-
-                    if batch_result.get("code") != 0:
-                        raise RuntimeError(f"API returned error: {batch_result.get('msg')}")
-
-                    batch_data = batch_result.get("data", {})
-                    batch_id = batch_data.get("batch_id")
-                    file_urls = batch_data.get("file_urls", [])
-
-                    if not batch_id or not file_urls:
-                        raise RuntimeError("No batch_id or file_urls in response")
-
-                    upload_url = file_urls[0]
-                    logging.info(f"Got batch ID: {batch_id}")
-
-                # Step 2: Upload file using PUT to OSS pre-signed URL
-                logging.info(f"Step 2: Uploading file ({input_path.stat().st_size:,} bytes)...")
-                
-                # Log upload URL details (mask sensitive params)
-                from urllib.parse import urlparse, parse_qs
-                parsed = urlparse(upload_url)
-                logging.info(f"Upload host: {parsed.netloc}")
-                logging.info(f"Upload path: {parsed.path}")
-                if parsed.query:
-                    query_params = parse_qs(parsed.query)
-                    # Log query params but mask sensitive values
-                    safe_params = {k: ('***' if k.lower() in ['signature', 'expires', 'accesskeyid'] else v) 
-                                   for k, v in query_params.items()}
-                    logging.info(f"Query params: {list(safe_params.keys())}")
-
-                file_content = input_path.read_bytes()
-                logging.info(f"File size: {len(file_content)} bytes")
-
-                # CRITICAL FIX: OSS pre-signed URLs with signature issues
-                # Try multiple upload strategies
-                import requests
-                from requests.adapters import HTTPAdapter
-                
-                def do_upload_strategy_1():
-                    """Strategy 1: Upload with Content-Type header"""
-                    headers = {'Content-Type': 'application/octet-stream'}
-                    response = requests.put(upload_url, data=file_content, headers=headers, timeout=300)
-                    return response.status_code, response.text, dict(response.headers)
-                
-                def do_upload_strategy_2():
-                    """Strategy 2: Upload without any custom headers"""
-                    # Create session with custom adapter to minimize default headers
-                    session = requests.Session()
-                    session.headers.clear()  # Clear all default headers
-                    response = session.put(upload_url, data=file_content, timeout=300)
-                    return response.status_code, response.text, dict(response.headers)
-                
-                def do_upload_strategy_3():
-                    """Strategy 3: Upload with explicit empty headers"""
-                    response = requests.put(upload_url, data=file_content, headers={}, timeout=300)
-                    return response.status_code, response.text, dict(response.headers)
-                
-                # Run upload in executor to avoid blocking
-                loop = asyncio.get_event_loop()
-                
-                # Try strategy 2 first (no custom headers)
-                logging.info(f"Attempting upload without custom headers...")
-                status_code, response_text, response_headers = await loop.run_in_executor(
-                    None, do_upload_strategy_2
+            logging.info(f"Downloading results for {input_path.name}...")
+            with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+                zip_path = Path(temp_dir) / "result.zip"
+                size = await client.download(result_url, zip_path)
+                logging.info(f"Downloaded ZIP file ({size:,} bytes)")
+
+                await asyncio.to_thread(
+                    MineruParser._extract_api_archive,
+                    zip_path,
+                    output_dir,
+                    input_path.stem,
                 )
-                
-                logging.info(f"Upload response status: {status_code}")
-                logging.info(f"Upload response headers: {response_headers}")
-                
-                if status_code not in [200, 201, 204]:
-                    logging.error(f"Upload failed with status {status_code}")
-                    logging.error(f"Response body: {response_text[:1000]}")
-                    
-                    if 'SignatureDoesNotMatch' in response_text:
-                        logging.error("OSS Signature Mismatch - This appears to be a MinerU API issue")
-                        logging.error("The pre-signed URL generated by MinerU may have incorrect signature")
-                        logging.error("Recommendation: Contact MinerU support or check API documentation")
-                    
-                    raise RuntimeError(
-                        f"Upload failed with status {status_code}: {response_text[:500]}"
-                    )
-
-                logging.info(f"File uploaded successfully")
-
-                # Step 3: Poll for batch results
-                logging.info(f"Step 3: Waiting for extraction completion...")
-                results_url = f"{base_url}/extract-results/batch/{batch_id}"
-                max_attempts = 120  # 10 minutes
-                attempt = 0
-
-                while attempt < max_attempts:
-                    await asyncio.sleep(5)
-                    attempt += 1
-
-                    async with session.get(
-                        results_url,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=30)
-                    ) as results_response:
-                        if results_response.status != 200:
-                            logging.warning(f"Results check failed: {results_response.status}")
-                            continue
 
-                        results_data = await results_response.json()
-
-                        if results_data.get("code") == 0:
-                            # Results available
-                            data = results_data.get("data", {})
-                            extract_results = data.get("extract_result", [])
-
-                            # Get the first result's full_zip_url
-                            result_url = None
-                            if extract_results and len(extract_results) > 0:
-                                first_result = extract_results[0]
-                                if first_result.get("state") == "done":
-                                    result_url = first_result.get("full_zip_url")
-
-                            if result_url:
-                                logging.info(f"Step 4: Downloading results...")
-
-                                # Download ZIP file
-                                async with session.get(result_url) as zip_response:
-                                    if zip_response.status == 200:
-                                        zip_content = await zip_response.read()
-                                        logging.info(f"Downloaded ZIP file ({len(zip_content):,} bytes)")
-
-                                        # Extract ZIP file
-                                        with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
-                                            zf.extractall(output_dir)
-                                            logging.info(f"Extracted {len(zf.namelist())} files")
-
-                                        # Find and read the markdown file
-                                        md_files = list(output_dir.glob("**/full.md"))
-                                        if not md_files:
-                                            md_files = list(output_dir.glob("**/*.md"))
-
-                                        if md_files:
-                                            md_file = md_files[0]
-                                            content = md_file.read_text(encoding="utf-8")
-
-                                            # Copy to standard location
-                                            output_md = output_dir / f"{input_path.stem}.md"
-                                            output_md.write_text(content, encoding="utf-8")
-
-                                            # Create content_list.json for compatibility
-                                            content_list = [{
-                                                "type": "text",
-                                                "text": content,
-                                                "page_idx": 0
-                                            }]
-                                            json_file = output_dir / f"{input_path.stem}_content_list.json"
-                                            with open(json_file, "w", encoding="utf-8") as f:
-                                                json.dump(content_list, f, ensure_ascii=False, indent=2)
-
-                                            logging.info(f"Successfully processed {input_path.name}")
-                                            return  # Success
-                                        else:
-                                            raise RuntimeError("No markdown file found in ZIP")
-                                    else:
-                                        raise RuntimeError(f"Failed to download ZIP: {zip_response.status}")
-
-                        elif results_data.get("code") == 1:
-                            # Still processing
-                            if attempt % 6 == 0:  # Log every 30 seconds
-                                logging.info(f"Processing... ({attempt * 5}s elapsed)")
-                            continue
-                        else:
-                            error_msg = results_data.get("msg", "Unknown error")
-                            raise RuntimeError(f"API error: {error_msg}")
-
-                # Timeout
-                raise RuntimeError(f"Polling timeout after {max_attempts * 5} seconds")
+            logging.info(f"Successfully processed {input_path.name}")
 
         except aiohttp.ClientError as e:
             logging.error(f"MinerU API network error: {e}")
@@ -858,38 +694,83 @@ class MineruParser(Parser):
             raise
 
     @staticmethod
-    def _run_mineru_command(
-        input_path: Union[str, Path],
-        output_dir: Union[str, Path],
-        method: str = "auto",
-        lang: Optional[str] = None,
-        backend: Optional[str] = None,
-        start_page: Optional[int] = None,
-        end_page: Optional[int] = None,
-        formula: bool = True,
-        table: bool = True,
-        device: Optional[str] = None,
-        source: Optional[str] = None,
-        vlm_url: Optional[str] = None,
+    def _extract_api_archive(
+        zip_path: Path, output_dir: Path, file_stem: str
     ) -> None:
         """
-        Run mineru command line tool
+        Extract the members of a MinerU API result archive that parsing needs
+
+        Only the markdown, the content list and the images are written (the
+        archive also carries the original file and layout/model JSON). Members
+        are streamed from the archive on disk, so memory use stays flat.
 
         Args:
-            input_path: Path to input file or directory
-            output_dir: Output directory path
-            method: Parsing method (auto, txt, ocr)
-            lang: Document language for OCR optimization
-            backend: Parsing backend
-            start_page: Starting page number (0-based)
-            end_page: Ending page number (0-based)
-            formula: Enable formula parsing
-            table: Enable table parsing
-            device: Inference device
-            source: Model source
-            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+            zip_path: Downloaded result archive
+            output_dir: Output directory
+            file_stem: Input file name without extension
+        """
+        import shutil
+        import zipfile
+
+        output_root = output_dir.resolve()
+        md_member = content_list_member = None
+        extracted = 0
+
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                parts = Path(info.filename).parts
+                name = parts[-1]
+                if name == "full.md" or (md_member is None and name.endswith(".md")):
+                    md_member = info
+                elif name.endswith("content_list.json"):
+                    content_list_member = info
+                elif "images" in parts[:-1]:
+                    # Keep paths relative to the images folder, as the content list does
+                    image_path = output_dir.joinpath(*parts[parts.index("images") :])
+                    if not image_path.resolve().is_relative_to(output_root):
+                        logging.warning(f"Skipping unsafe archive member {info.filename}")
+                        continue
+                    image_path.parent.mkdir(parents=True, exist_ok=True)
+                    with zf.open(info) as src, open(image_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    extracted += 1
+
+            if md_member is None:
+                raise RuntimeError("No markdown file found in ZIP")
+
+            # Copy to standard location
+            with zf.open(md_member) as src, open(
+                output_dir / f"{file_stem}.md", "wb"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+
+            json_file = output_dir / f"{file_stem}_content_list.json"
+            if content_list_member is not None:
+                with zf.open(content_list_member) as src, open(json_file, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                # No structured output: wrap the markdown as a single text block
+                content = (output_dir / f"{file_stem}.md").read_text(encoding="utf-8")
+                with open(json_file, "w", encoding="utf-8") as f:
+                    json.dump(
+                        [{"type": "text", "text": content, "page_idx": 0}],
+                        f,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
+
+        logging.info(f"Extracted markdown, content list and {extracted} images")
+
+    @staticmethod
+    def _find_mineru_executable() -> str:
+        """
+        Locate the mineru executable, preferring the active virtualenv over PATH
+
+        Returns:
+            str: Path to the mineru executable, or "mineru" if it could not be resolved
         """
-        # Find mineru executable - check venv first, then PATH
         import sys
         import shutil
 
@@ -915,8 +796,26 @@ class MineruParser(Parser):
                 mineru_cmd = mineru_path
                 logging.debug(f"Found mineru in PATH: {mineru_cmd}")
 
+        return mineru_cmd
+
+    @staticmethod
+    def _build_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+    ) -> List[str]:
+        """Build the mineru command line for the given parse options"""
         cmd = [
-            mineru_cmd,
+            MineruParser._find_mineru_executable(),
             "-p",
             str(input_path),
             "-o",
@@ -944,146 +843,286 @@ class MineruParser(Parser):
         if vlm_url:
             cmd.extend(["-u", vlm_url])
 
-        output_lines = []
-        error_lines = []
+        return cmd
+
+    @staticmethod
+    def _log_mineru_stderr_line(line: str, error_lines: List[str]) -> None:
+        """Log a mineru stderr line and record it if it reports an error"""
+        if "warning" in line.lower():
+            logging.warning(f"[MinerU] {line}")
+        elif "error" in line.lower():
+            logging.error(f"[MinerU] {line}")
+            error_message = line.split("\n")[0]
+            error_lines.append(error_message)
+        else:
+            logging.info(f"[MinerU] {line}")
 
+    @staticmethod
+    async def _kill_process(process) -> None:
+        """Kill an asyncio subprocess if it is still running and reap it"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
         try:
-            # Prepare subprocess parameters to hide console window on Windows
-            import platform
-            import threading
-            from queue import Queue, Empty
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            logging.warning(f"[MinerU] Process {process.pid} did not exit after kill")
 
-            # Log the command being executed
-            logging.info(f"Executing mineru command: {' '.join(cmd)}")
+    @staticmethod
+    async def _run_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Run mineru command line tool without blocking the event loop
 
-            subprocess_kwargs = {
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.PIPE,
-                "text": True,
-                "encoding": "utf-8",
-                "errors": "ignore",
-                "bufsize": 1,  # Line buffered
-            }
+        Output lines are streamed to the log as they arrive. If the timeout expires
+        or the calling task is cancelled, the mineru process is killed.
 
-            # Hide console window on Windows
-            if platform.system() == "Windows":
-                subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        Args:
+            input_path: Path to input file or directory
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            backend: Parsing backend
+            start_page: Starting page number (0-based)
+            end_page: Ending page number (0-based)
+            formula: Enable formula parsing
+            table: Enable table parsing
+            device: Inference device
+            source: Model source
+            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+            timeout: Maximum number of seconds to wait for the command (None for no limit)
+        """
+        import platform
+
+        cmd = MineruParser._build_mineru_command(
+            input_path,
+            output_dir,
+            method=method,
+            lang=lang,
+            backend=backend,
+            start_page=start_page,
+            end_page=end_page,
+            formula=formula,
+            table=table,
+            device=device,
+            source=source,
+            vlm_url=vlm_url,
+        )
 
-            # Function to read output from subprocess and add to queue
-            def enqueue_output(pipe, queue, prefix):
-                try:
-                    for line in iter(pipe.readline, ""):
-                        if line.strip():  # Only add non-empty lines
-                            queue.put((prefix, line.strip()))
-                    pipe.close()
-                except Exception as e:
-                    queue.put((prefix, f"Error reading {prefix}: {e}"))
+        error_lines = []
 
-            # Start subprocess
-            process = subprocess.Popen(cmd, **subprocess_kwargs)
+        # Log the command being executed
+        logging.info(f"Executing mineru command: {' '.join(cmd)}")
 
-            # Create queues for stdout and stderr
-            stdout_queue = Queue()
-            stderr_queue = Queue()
+        subprocess_kwargs = {
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+        }
 
-            # Start threads to read output
-            stdout_thread = threading.Thread(
-                target=enqueue_output, args=(process.stdout, stdout_queue, "STDOUT")
+        # Hide console window on Windows
+        if platform.system() == "Windows":
+            subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        try:
+            process = await asyncio.create_subprocess_exec(*cmd, **subprocess_kwargs)
+        except NotImplementedError:
+            # Event loops without subprocess support (e.g. SelectorEventLoop on Windows)
+            logging.debug("Event loop lacks subprocess support, running mineru in a thread")
+            await asyncio.to_thread(
+                MineruParser._run_mineru_command_blocking, cmd, timeout
             )
-            stderr_thread = threading.Thread(
-                target=enqueue_output, args=(process.stderr, stderr_queue, "STDERR")
+            return
+        except FileNotFoundError:
+            raise RuntimeError(
+                "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
+                "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
             )
+        except Exception as e:
+            error_message = f"Unexpected error running mineru command: {e}"
+            logging.error(error_message)
+            raise RuntimeError(error_message) from e
 
-            stdout_thread.daemon = True
-            stderr_thread.daemon = True
-            stdout_thread.start()
-            stderr_thread.start()
+        def handle_line(raw_line: bytes, is_stderr: bool):
+            line = raw_line.decode("utf-8", errors="ignore").strip()
+            if not line:
+                return
+            if is_stderr:
+                MineruParser._log_mineru_stderr_line(line, error_lines)
+            else:
+                # Log mineru output with INFO level, prefixed with [MinerU]
+                logging.info(f"[MinerU] {line}")
+
+        async def read_stream(stream, is_stderr: bool):
+            # Split on \r as well as \n so tqdm progress updates are logged as
+            # they arrive; reading raw chunks means no line length can overrun
+            buffer = b""
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    break
+                *lines, buffer = re.split(rb"[\r\n]", buffer + chunk)
+                for raw_line in lines:
+                    handle_line(raw_line, is_stderr)
+                if len(buffer) > MineruParser.MAX_OUTPUT_LINE_BYTES:
+                    handle_line(buffer, is_stderr)
+                    buffer = b""
+            handle_line(buffer, is_stderr)
 
-            # Process output in real time
-            while process.poll() is None:
-                # Check stdout queue
-                try:
-                    while True:
-                        prefix, line = stdout_queue.get_nowait()
-                        output_lines.append(line)
-                        # Log mineru output with INFO level, prefixed with [MinerU]
-                        logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
-
-                # Check stderr queue
-                try:
-                    while True:
-                        prefix, line = stderr_queue.get_nowait()
-                        # Log mineru errors with WARNING level
-                        if "warning" in line.lower():
-                            logging.warning(f"[MinerU] {line}")
-                        elif "error" in line.lower():
-                            logging.error(f"[MinerU] {line}")
-                            error_message = line.split("\n")[0]
-                            error_lines.append(error_message)
-                        else:
-                            logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    read_stream(process.stdout, False),
+                    read_stream(process.stderr, True),
+                    process.wait(),
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            await MineruParser._kill_process(process)
+            logging.error(f"[MinerU] Command timed out after {timeout} seconds")
+            error_lines.append(f"MinerU command timed out after {timeout} seconds")
+            raise MineruExecutionError(process.returncode, error_lines)
+        except asyncio.CancelledError:
+            logging.warning("[MinerU] Parsing cancelled, terminating mineru process")
+            await MineruParser._kill_process(process)
+            raise
+        except Exception as e:
+            await MineruParser._kill_process(process)
+            error_message = f"Unexpected error running mineru command: {e}"
+            logging.error(error_message)
+            raise RuntimeError(error_message) from e
 
-                # Small delay to prevent busy waiting
-                import time
+        return_code = process.returncode
+        if return_code != 0 or error_lines:
+            logging.info("[MinerU] Command executed failed")
+            raise MineruExecutionError(return_code, error_lines)
+        logging.info("[MinerU] Command executed successfully")
 
-                time.sleep(0.1)
+    @staticmethod
+    async def _execute_mineru(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Run MinerU on a file, using the warm worker pool when one is configured
 
-            # Process any remaining output after process completion
-            try:
-                while True:
-                    prefix, line = stdout_queue.get_nowait()
-                    output_lines.append(line)
-                    logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
+        Falls back to the mineru command line when no pool is active, when the
+        job needs a device/model source the pool was not started with, or when
+        the pool cannot serve the job.
 
+        Args:
+            input_path: Path to input file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            timeout: Maximum number of seconds to wait for the parse
+            **kwargs: Additional parameters for mineru command
+        """
+        from raganything.mineru_worker import (
+            MineruWorkerJobError,
+            MineruWorkerUnavailable,
+            get_mineru_worker_pool,
+        )
+
+        pool = get_mineru_worker_pool()
+        if pool is not None and pool.accepts(kwargs.get("device"), kwargs.get("source")):
+            options = {
+                k: v
+                for k, v in kwargs.items()
+                if k not in ("device", "source")
+            }
             try:
-                while True:
-                    prefix, line = stderr_queue.get_nowait()
-                    if "warning" in line.lower():
-                        logging.warning(f"[MinerU] {line}")
-                    elif "error" in line.lower():
-                        logging.error(f"[MinerU] {line}")
-                        error_message = line.split("\n")[0]
-                        error_lines.append(error_message)
-                    else:
-                        logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
+                await pool.run_job(
+                    input_path, output_dir, timeout=timeout, method=method, **options
+                )
+                return
+            except MineruWorkerJobError as e:
+                raise MineruExecutionError(e.exit_code, e.error_lines)
+            except TimeoutError as e:
+                raise MineruExecutionError(None, [str(e)])
+            except MineruWorkerUnavailable as e:
+                logging.warning(
+                    f"[MinerU] Worker pool unavailable ({e}), falling back to command line"
+                )
+
+        await MineruParser._run_mineru_command(
+            input_path=input_path,
+            output_dir=output_dir,
+            method=method,
+            timeout=timeout,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _run_mineru_command_blocking(
+        cmd: List[str], timeout: Optional[float] = None
+    ) -> None:
+        """
+        Run a prepared mineru command synchronously
 
-            # Wait for process to complete and get return code
-            return_code = process.wait()
+        Fallback for event loops that cannot spawn subprocesses. Raises the same
+        errors as `_run_mineru_command`.
 
-            # Wait for threads to finish
-            stdout_thread.join(timeout=5)
-            stderr_thread.join(timeout=5)
+        Args:
+            cmd: Full mineru command line
+            timeout: Maximum number of seconds to wait for the command
+        """
+        import platform
 
-            if return_code != 0 or error_lines:
-                logging.info("[MinerU] Command executed failed")
-                raise MineruExecutionError(return_code, error_lines)
-            else:
-                logging.info("[MinerU] Command executed successfully")
+        subprocess_kwargs = {
+            "capture_output": True,
+            "text": True,
+            "encoding": "utf-8",
+            "errors": "ignore",
+            "timeout": timeout,
+        }
 
-        except MineruExecutionError:
-            raise
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Error running mineru subprocess command: {e}")
-            logging.error(f"Command: {' '.join(cmd)}")
-            logging.error(f"Return code: {e.returncode}")
-            raise
+        # Hide console window on Windows
+        if platform.system() == "Windows":
+            subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        error_lines = []
+        try:
+            result = subprocess.run(cmd, **subprocess_kwargs)
+        except subprocess.TimeoutExpired:
+            logging.error(f"[MinerU] Command timed out after {timeout} seconds")
+            raise MineruExecutionError(
+                None, [f"MinerU command timed out after {timeout} seconds"]
+            )
         except FileNotFoundError:
             raise RuntimeError(
                 "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
                 "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
             )
-        except Exception as e:
-            error_message = f"Unexpected error running mineru command: {e}"
-            logging.error(error_message)
-            raise RuntimeError(error_message) from e
+
+        for line in result.stdout.splitlines():
+            if line.strip():
+                logging.info(f"[MinerU] {line.strip()}")
+        for line in result.stderr.splitlines():
+            if line.strip():
+                MineruParser._log_mineru_stderr_line(line.strip(), error_lines)
+
+        if result.returncode != 0 or error_lines:
+            logging.info("[MinerU] Command executed failed")
+            raise MineruExecutionError(result.returncode, error_lines)
+        logging.info("[MinerU] Command executed successfully")
 
     @staticmethod
     def _read_output_files(
@@ -1152,71 +1191,526 @@ class MineruParser(Parser):
 
         return content_list, md_content
 
-    async def parse_pdf(
-        self,
-        pdf_path: Union[str, Path],
-        output_dir: Optional[str] = None,
-        method: str = "auto",
-        lang: Optional[str] = None,
-        use_api: bool = False,
-        api_url: Optional[str] = None,
-        api_key: Optional[str] = None,
-        **kwargs,
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _get_pdf_page_count(pdf_path: Union[str, Path]) -> int:
         """
-        Parse PDF document using MinerU 2.0
+        Count the pages of a PDF without parsing it
+
+        Uses pypdfium2 (installed with MinerU) and falls back to pypdf.
 
         Args:
             pdf_path: Path to the PDF file
-            output_dir: Output directory path
-            method: Parsing method (auto, txt, ocr)
-            lang: Document language for OCR optimization
-            use_api: Whether to use MinerU API instead of command line
-            api_url: MinerU API service URL (if use_api=True)
-            api_key: MinerU API key (if use_api=True)
-            **kwargs: Additional parameters for mineru command
 
         Returns:
-            List[Dict[str, Any]]: List of content blocks
+            int: Number of pages, or 0 if it could not be determined
         """
         try:
-            # Convert to Path object for easier handling
-            pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+            import pypdfium2 as pdfium
 
-            name_without_suff = pdf_path.stem
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except ImportError:
+            pass
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path} with pypdfium2: {e}")
+            return 0
 
-            # Prepare output directory
-            if output_dir:
-                base_output_dir = Path(output_dir)
-            else:
-                base_output_dir = pdf_path.parent / "mineru_output"
+        try:
+            from pypdf import PdfReader
 
-            base_output_dir.mkdir(parents=True, exist_ok=True)
+            return len(PdfReader(str(pdf_path)).pages)
+        except ImportError:
+            logging.debug("Neither pypdfium2 nor pypdf is installed, sharding disabled")
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path} with pypdf: {e}")
+        return 0
 
-            # Choose API or command line method
-            if use_api:
-                if not api_url:
-                    raise ValueError("api_url is required when use_api=True")
+    @staticmethod
+    def probe_pdf_pages(
+        pdf_path: Union[str, Path],
+        min_text_chars: int = 50,
+        max_image_coverage: float = 0.5,
+        shard_pages: int = 0,
+        min_range_pages: int = 8,
+        max_ranges: int = 8,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pre-flight check that picks a parsing method for every PDF page
 
-                await self._call_mineru_api(
-                    input_path=pdf_path,
-                    output_dir=base_output_dir,
-                    api_url=api_url,
-                    api_key=api_key,
-                    method=method,
-                    lang=lang,
-                    **kwargs,
-                )
-            else:
-                # Run mineru command line
-                self._run_mineru_command(
-                    input_path=pdf_path,
-                    output_dir=base_output_dir,
-                    method=method,
-                    lang=lang,
-                    **kwargs,
+        A page with at least `min_text_chars` characters in its text layer and
+        images covering less than `max_image_coverage` of its area is routed to
+        the cheap "txt" method; all other pages (scans, image-heavy pages) go to
+        "ocr". Consecutive pages with the same method form one range.
+
+        Every range is a separate MinerU run that loads its models again, so
+        "txt" runs shorter than `min_range_pages` are OCRed with their
+        neighbours. A plan that still has more than `max_ranges` ranges, or
+        that collapses mixed pages into one method, becomes a single "auto" run.
+
+        Args:
+            pdf_path: Path to the PDF file
+            min_text_chars: Characters a page needs to count as having a text layer
+            max_image_coverage: Image area fraction above which a page is OCRed
+            shard_pages: Split ranges longer than this many pages (0 disables)
+            min_range_pages: Shortest "txt" run kept as its own range
+            max_ranges: Most ranges (before sharding) a plan may have
+
+        Returns:
+            Optional[Dict[str, Any]]: Page counts per method and the
+            [start, end, method] ranges, or None if pypdfium2 is unavailable
+            or the PDF could not be read
+        """
+        try:
+            import pypdfium2 as pdfium
+            import pypdfium2.raw as pdfium_c
+        except ImportError:
+            logging.debug("pypdfium2 is not installed, PDF pre-flight disabled")
+            return None
+
+        started = time.time()
+        methods: List[str] = []
+        try:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                for page in pdf:
+                    try:
+                        textpage = page.get_textpage()
+                        chars = textpage.count_chars()
+                        textpage.close()
+
+                        width, height = page.get_size()
+                        page_area = max(width * height, 1.0)
+                        image_area = 0.0
+                        for obj in page.get_objects(
+                            filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,), max_depth=2
+                        ):
+                            # get_pos() was renamed get_bounds() in pypdfium2 5
+                            get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+                            left, bottom, right, top = get_bounds()
+                            image_area += max(0.0, min(right, width) - max(left, 0.0)) * max(
+                                0.0, min(top, height) - max(bottom, 0.0)
+                            )
+                        coverage = min(image_area / page_area, 1.0)
+                    finally:
+                        page.close()
+
+                    methods.append(
+                        "txt"
+                        if chars >= min_text_chars and coverage < max_image_coverage
+                        else "ocr"
+                    )
+            finally:
+                pdf.close()
+        except Exception as e:
+            logging.warning(f"PDF pre-flight failed for {pdf_path}: {e}")
+            return None
+
+        def merge_runs(page_methods: List[str]) -> List[List[Any]]:
+            runs: List[List[Any]] = []
+            for page_idx, method in enumerate(page_methods):
+                if runs and runs[-1][2] == method:
+                    runs[-1][1] = page_idx
+                else:
+                    runs.append([page_idx, page_idx, method])
+            return runs
+
+        # OCR short text-layer runs along with the pages around them
+        planned = list(methods)
+        raw_runs = merge_runs(methods)
+        for start, end, method in raw_runs if len(raw_runs) > 1 else []:
+            if method == "txt" and end - start + 1 < min_range_pages:
+                planned[start : end + 1] = ["ocr"] * (end - start + 1)
+        runs = merge_runs(planned)
+
+        if methods and (
+            len(runs) > max(max_ranges, 1)
+            or (len(runs) == 1 and len(set(methods)) > 1)
+        ):
+            # Fragmented or fully absorbed plan: let MinerU pick the method once
+            runs = [[0, len(methods) - 1, "auto"]]
+
+        ranges: List[List[Any]] = []
+        for start, end, method in runs:
+            step = shard_pages if shard_pages > 0 else end - start + 1
+            for shard_start in range(start, end + 1, step):
+                ranges.append([shard_start, min(shard_start + step - 1, end), method])
+
+        result = {
+            "page_count": len(methods),
+            "txt_pages": methods.count("txt"),
+            "ocr_pages": methods.count("ocr"),
+            "ranges": ranges,
+            "probe_seconds": round(time.time() - started, 3),
+        }
+        logging.info(
+            f"[MinerU] Pre-flight {Path(pdf_path).name}: {result['txt_pages']} text-layer "
+            f"pages, {result['ocr_pages']} OCR pages in {len(ranges)} ranges "
+            f"({', '.join(sorted({method for _, _, method in ranges}))})"
+        )
+        return result
+
+    async def _iter_pdf_shards(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        method: str,
+        lang: Optional[str],
+        page_count: int,
+        shard_pages: int,
+        max_shard_workers: int = 4,
+        page_plan: Optional[List[List[Any]]] = None,
+        **kwargs,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Parse a PDF as concurrent page-range shards, yielding them in page order
+
+        Each shard is parsed into its own output directory with MinerU's
+        start_page/end_page options, and its page indices are shifted back to
+        document page numbers. Shards run concurrently; each one is yielded as
+        soon as it and all earlier shards are done.
+
+        Args:
+            pdf_path: Path to the PDF file
+            base_output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            page_count: Number of pages in the PDF
+            shard_pages: Number of pages per shard
+            max_shard_workers: Maximum number of shards parsed at the same time
+            page_plan: Explicit [start, end, method] ranges (see `probe_pdf_pages`);
+                overrides shard_pages and method
+            **kwargs: Additional parameters for mineru command
+
+        Yields:
+            List[Dict[str, Any]]: Content blocks of one shard
+        """
+        name_without_suff = pdf_path.stem
+        backend = kwargs.get("backend", "") or ""
+
+        if page_plan:
+            ranges = [(start, end, range_method) for start, end, range_method in page_plan]
+        else:
+            ranges = [
+                (start, min(start + shard_pages, page_count) - 1, method)
+                for start in range(0, page_count, shard_pages)
+            ]
+        logging.info(
+            f"[MinerU] Parsing {pdf_path.name} ({page_count} pages) as {len(ranges)} shards "
+            f"with up to {max_shard_workers} workers"
+        )
+
+        shard_root = base_output_dir / f"{name_without_suff}_shards"
+        semaphore = asyncio.Semaphore(max(1, max_shard_workers))
+
+        async def parse_shard(
+            start: int, end: int, shard_method: str
+        ) -> List[Dict[str, Any]]:
+            shard_dir = shard_root / f"pages_{start:05d}_{end:05d}"
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            async with semaphore:
+                await self._execute_mineru(
+                    input_path=pdf_path,
+                    output_dir=shard_dir,
+                    method=shard_method,
+                    lang=lang,
+                    start_page=start,
+                    end_page=end,
+                    **kwargs,
+                )
+            content_list, _ = self._read_output_files(
+                shard_dir,
+                name_without_suff,
+                method="vlm" if backend.startswith("vlm-") else shard_method,
+            )
+            # Shard output is numbered from 0; shift to document page numbers
+            for item in content_list:
+                if isinstance(item, dict) and isinstance(item.get("page_idx"), int):
+                    item["page_idx"] += start
+            return content_list
+
+        # Tasks are created in page order, so awaiting them in order preserves it
+        tasks = [
+            asyncio.create_task(parse_shard(start, end, shard_method))
+            for start, end, shard_method in ranges
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Also retrieves exceptions of shards that were never awaited
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _parse_pdf_sharded(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        method: str,
+        lang: Optional[str],
+        page_count: int,
+        shard_pages: int,
+        max_shard_workers: int = 4,
+        page_plan: Optional[List[List[Any]]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a PDF as concurrent page-range shards and merge the results
+
+        The merged content list is also written to the usual
+        `<stem>/<method>/<stem>_content_list.json` location.
+
+        Args:
+            pdf_path: Path to the PDF file
+            base_output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            page_count: Number of pages in the PDF
+            shard_pages: Number of pages per shard
+            max_shard_workers: Maximum number of shards parsed at the same time
+            page_plan: Explicit [start, end, method] ranges (see `probe_pdf_pages`)
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            List[Dict[str, Any]]: Merged list of content blocks in page order
+        """
+        content_list = []
+        shard_count = 0
+        async for shard in self._iter_pdf_shards(
+            pdf_path,
+            base_output_dir,
+            method,
+            lang,
+            page_count,
+            shard_pages,
+            max_shard_workers,
+            page_plan=page_plan,
+            **kwargs,
+        ):
+            content_list.extend(shard)
+            shard_count += 1
+
+        self._write_merged_content_list(
+            content_list, base_output_dir, pdf_path.stem, method, kwargs.get("backend")
+        )
+        logging.info(
+            f"[MinerU] Merged {shard_count} shards into {len(content_list)} content blocks"
+        )
+        return content_list
+
+    @staticmethod
+    def _write_merged_content_list(
+        content_list: List[Dict[str, Any]],
+        base_output_dir: Path,
+        file_stem: str,
+        method: str,
+        backend: Optional[str] = None,
+    ) -> None:
+        """Write a merged content list where unsharded output would be"""
+        read_method = "vlm" if (backend or "").startswith("vlm-") else method
+        merged_dir = base_output_dir / file_stem / read_method
+        merged_dir.mkdir(parents=True, exist_ok=True)
+        with open(
+            merged_dir / f"{file_stem}_content_list.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(content_list, f, ensure_ascii=False, indent=2)
+
+    async def parse_pdf_stream(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        shard_pages: int = 0,
+        max_shard_workers: int = 4,
+        page_plan: Optional[List[List[Any]]] = None,
+        **kwargs,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Parse a PDF with MinerU, yielding content blocks shard by shard
+
+        When the PDF is longer than `shard_pages` (and no page range was
+        requested), shards are yielded in page order as they finish, so callers
+        can start working on early pages while later ones are still parsing.
+        Otherwise the whole document is yielded once.
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            shard_pages: Number of pages per shard (0 disables sharding)
+            max_shard_workers: Maximum number of shards parsed at the same time
+            page_plan: Per-page-range methods from `probe_pdf_pages`; ranges are
+                parsed as shards with their own method
+            **kwargs: Additional parameters for mineru command
+
+        Yields:
+            List[Dict[str, Any]]: Content blocks of one shard
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+
+        base_output_dir = (
+            Path(output_dir) if output_dir else pdf_path.parent / "mineru_output"
+        )
+        base_output_dir.mkdir(parents=True, exist_ok=True)
+
+        page_count = 0
+        if page_plan and len(page_plan) > 1:
+            page_count = page_plan[-1][1] + 1
+        elif (
+            shard_pages > 0
+            and kwargs.get("start_page") is None
+            and kwargs.get("end_page") is None
+        ):
+            page_count = self._get_pdf_page_count(pdf_path)
+
+        if page_count <= shard_pages or (page_plan and len(page_plan) == 1):
+            yield await self.parse_pdf(
+                pdf_path,
+                str(base_output_dir),
+                method,
+                lang,
+                page_plan=page_plan,
+                **kwargs,
+            )
+            return
+
+        content_list = []
+        async for shard in self._iter_pdf_shards(
+            pdf_path,
+            base_output_dir,
+            method,
+            lang,
+            page_count,
+            shard_pages,
+            max_shard_workers,
+            page_plan=page_plan,
+            **kwargs,
+        ):
+            content_list.extend(shard)
+            yield shard
+
+        self._write_merged_content_list(
+            content_list, base_output_dir, pdf_path.stem, method, kwargs.get("backend")
+        )
+
+    async def parse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        use_api: bool = False,
+        api_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        shard_pages: int = 0,
+        max_shard_workers: int = 4,
+        page_plan: Optional[List[List[Any]]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse PDF document using MinerU 2.0
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            use_api: Whether to use MinerU API instead of command line
+            api_url: MinerU API service URL (if use_api=True)
+            api_key: MinerU API key (if use_api=True)
+            shard_pages: Split PDFs longer than this many pages into page ranges
+                parsed concurrently (0 disables sharding)
+            max_shard_workers: Maximum number of shards parsed at the same time
+            page_plan: Per-page-range methods from `probe_pdf_pages`; ranges are
+                parsed with their own method and merged in page order
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        try:
+            # Convert to Path object for easier handling
+            pdf_path = Path(pdf_path)
+            if not pdf_path.exists():
+                raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+
+            name_without_suff = pdf_path.stem
+
+            # Prepare output directory
+            if output_dir:
+                base_output_dir = Path(output_dir)
+            else:
+                base_output_dir = pdf_path.parent / "mineru_output"
+
+            base_output_dir.mkdir(parents=True, exist_ok=True)
+
+            # Follow the pre-flight page plan: one method for the whole
+            # document, or ranges parsed with different methods
+            if page_plan and not use_api:
+                if len(page_plan) > 1:
+                    return await self._parse_pdf_sharded(
+                        pdf_path,
+                        base_output_dir,
+                        method=method,
+                        lang=lang,
+                        page_count=page_plan[-1][1] + 1,
+                        shard_pages=shard_pages,
+                        max_shard_workers=max_shard_workers,
+                        page_plan=page_plan,
+                        **kwargs,
+                    )
+                method = page_plan[0][2]
+
+            # Split large PDFs into page ranges unless a range was requested
+            if (
+                shard_pages > 0
+                and not use_api
+                and kwargs.get("start_page") is None
+                and kwargs.get("end_page") is None
+            ):
+                page_count = self._get_pdf_page_count(pdf_path)
+                if page_count > shard_pages:
+                    return await self._parse_pdf_sharded(
+                        pdf_path,
+                        base_output_dir,
+                        method=method,
+                        lang=lang,
+                        page_count=page_count,
+                        shard_pages=shard_pages,
+                        max_shard_workers=max_shard_workers,
+                        **kwargs,
+                    )
+
+            # Choose API or command line method
+            if use_api:
+                if not api_url:
+                    raise ValueError("api_url is required when use_api=True")
+
+                await self._call_mineru_api(
+                    input_path=pdf_path,
+                    output_dir=base_output_dir,
+                    api_url=api_url,
+                    api_key=api_key,
+                    method=method,
+                    lang=lang,
+                    **kwargs,
+                )
+            else:
+                # Run mineru (warm worker pool or command line)
+                await self._execute_mineru(
+                    input_path=pdf_path,
+                    output_dir=base_output_dir,
+                    method=method,
+                    lang=lang,
+                    **kwargs,
                 )
 
             # Read the generated output files
@@ -1250,6 +1744,8 @@ class MineruParser(Parser):
 
         Note: MinerU 2.0 natively supports .png, .jpeg, .jpg formats.
         Other formats (.bmp, .tiff, .tif, etc.) will be automatically converted to .png.
+        EXIF-rotated images and scans larger than the configured maximum edge
+        length are straightened and downscaled first.
 
         Args:
             image_path: Path to the image file
@@ -1269,9 +1765,6 @@ class MineruParser(Parser):
             if not image_path.exists():
                 raise FileNotFoundError(f"Image file does not exist: {image_path}")
 
-            # Supported image formats by MinerU 2.0
-            mineru_supported_formats = {".png", ".jpeg", ".jpg"}
-
             # All supported image formats (including those we can convert)
             all_supported_formats = {
                 ".png",
@@ -1290,64 +1783,20 @@ class MineruParser(Parser):
                     f"Unsupported image format: {ext}. Supported formats: {', '.join(all_supported_formats)}"
                 )
 
-            # Determine the actual image file to process
-            actual_image_path = image_path
-            temp_converted_file = None
+            from raganything.image_preprocessor import get_image_preprocessor
 
-            # If format is not natively supported by MinerU, convert it
-            if ext not in mineru_supported_formats:
-                logging.info(
-                    f"Converting {ext} image to PNG for MinerU compatibility..."
+            # Convert formats MinerU cannot read, fix EXIF orientation and
+            # downscale oversized scans (cached by content hash)
+            try:
+                actual_image_path = await asyncio.to_thread(
+                    get_image_preprocessor().prepare_for_ocr, image_path
+                )
+            except RuntimeError:
+                raise
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to convert image {image_path.name}: {str(e)}"
                 )
-
-                try:
-                    from PIL import Image
-                except ImportError:
-                    raise RuntimeError(
-                        "PIL/Pillow is required for image format conversion. "
-                        "Please install it using: pip install Pillow"
-                    )
-
-                # Create temporary directory for conversion
-                temp_dir = Path(tempfile.mkdtemp())
-                temp_converted_file = temp_dir / f"{image_path.stem}_converted.png"
-
-                try:
-                    # Open and convert image
-                    with Image.open(image_path) as img:
-                        # Handle different image modes
-                        if img.mode in ("RGBA", "LA", "P"):
-                            # For images with transparency or palette, convert to RGB first
-                            if img.mode == "P":
-                                img = img.convert("RGBA")
-
-                            # Create white background for transparent images
-                            background = Image.new("RGB", img.size, (255, 255, 255))
-                            if img.mode == "RGBA":
-                                background.paste(
-                                    img, mask=img.split()[-1]
-                                )  # Use alpha channel as mask
-                            else:
-                                background.paste(img)
-                            img = background
-                        elif img.mode not in ("RGB", "L"):
-                            # Convert other modes to RGB
-                            img = img.convert("RGB")
-
-                        # Save as PNG
-                        img.save(temp_converted_file, "PNG", optimize=True)
-                        logging.info(
-                            f"Successfully converted {image_path.name} to PNG ({temp_converted_file.stat().st_size / 1024:.1f} KB)"
-                        )
-
-                        actual_image_path = temp_converted_file
-
-                except Exception as e:
-                    if temp_converted_file and temp_converted_file.exists():
-                        temp_converted_file.unlink()
-                    raise RuntimeError(
-                        f"Failed to convert image {image_path.name}: {str(e)}"
-                    )
 
             name_without_suff = image_path.stem
 
@@ -1359,54 +1808,41 @@ class MineruParser(Parser):
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
-            try:
-                # Choose API or command line method
-                if use_api:
-                    if not api_url:
-                        raise ValueError("api_url is required when use_api=True")
-
-                    await self._call_mineru_api(
-                        input_path=actual_image_path,
-                        output_dir=base_output_dir,
-                        api_url=api_url,
-                        api_key=api_key,
-                        method="ocr",
-                        lang=lang,
-                        **kwargs,
-                    )
-                else:
-                    # Run mineru command (images are processed with OCR method)
-                    self._run_mineru_command(
-                        input_path=actual_image_path,
-                        output_dir=base_output_dir,
-                        method="ocr",  # Images require OCR method
-                        lang=lang,
-                        **kwargs,
-                    )
+            # Choose API or command line method
+            if use_api:
+                if not api_url:
+                    raise ValueError("api_url is required when use_api=True")
 
-                # Read the generated output files
-                content_list, _ = self._read_output_files(
-                    base_output_dir, name_without_suff, method="ocr"
+                await self._call_mineru_api(
+                    input_path=actual_image_path,
+                    output_dir=base_output_dir,
+                    api_url=api_url,
+                    api_key=api_key,
+                    method="ocr",
+                    lang=lang,
+                    **kwargs,
+                )
+            else:
+                # Run mineru (images are processed with OCR method)
+                await self._execute_mineru(
+                    input_path=actual_image_path,
+                    output_dir=base_output_dir,
+                    method="ocr",  # Images require OCR method
+                    lang=lang,
+                    **kwargs,
                 )
-                return content_list
-
-            except MineruExecutionError:
-                raise
 
-            finally:
-                # Clean up temporary converted file if it was created
-                if temp_converted_file and temp_converted_file.exists():
-                    try:
-                        temp_converted_file.unlink()
-                        temp_converted_file.parent.rmdir()  # Remove temp directory if empty
-                    except Exception:
-                        pass  # Ignore cleanup errors
+            # Read the generated output files
+            content_list, _ = self._read_output_files(
+                base_output_dir, name_without_suff, method="ocr"
+            )
+            return content_list
 
         except Exception as e:
             logging.error(f"Error in parse_image: {str(e)}")
             raise
 
-    def parse_office_doc(
+    async def parse_office_doc(
         self,
         doc_path: Union[str, Path],
         output_dir: Optional[str] = None,
@@ -1432,10 +1868,12 @@ class MineruParser(Parser):
         """
         try:
             # Convert Office document to PDF using base class method
-            pdf_path = self.convert_office_to_pdf(doc_path, output_dir)
+            pdf_path = await asyncio.to_thread(
+                self.convert_office_to_pdf, doc_path, output_dir
+            )
 
             # Parse the converted PDF
-            return self.parse_pdf(
+            return await self.parse_pdf(
                 pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
             )
 
@@ -1443,7 +1881,7 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_office_doc: {str(e)}")
             raise
 
-    def parse_text_file(
+    async def parse_text_file(
         self,
         text_path: Union[str, Path],
         output_dir: Optional[str] = None,
@@ -1466,10 +1904,12 @@ class MineruParser(Parser):
         """
         try:
             # Convert text file to PDF using base class method
-            pdf_path = self.convert_text_to_pdf(text_path, output_dir)
+            pdf_path = await asyncio.to_thread(
+                self.convert_text_to_pdf, text_path, output_dir
+            )
 
             # Parse the converted PDF
-            return self.parse_pdf(
+            return await self.parse_pdf(
                 pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
             )
 
@@ -1522,9 +1962,9 @@ class MineruParser(Parser):
                 f"Warning: Office document detected ({ext}). "
                 f"MinerU 2.0 requires conversion to PDF first."
             )
-            return self.parse_office_doc(file_path, output_dir, lang, **kwargs)
+            return await self.parse_office_doc(file_path, output_dir, lang, **kwargs)
         elif ext in self.TEXT_FORMATS:
-            return self.parse_text_file(file_path, output_dir, lang, **kwargs)
+            return await self.parse_text_file(file_path, output_dir, lang, **kwargs)
         else:
             # For unsupported file types, try as PDF
             logging.warning(
@@ -1533,32 +1973,235 @@ class MineruParser(Parser):
             )
             return await self.parse_pdf(file_path, output_dir, method, lang, use_api, api_url, api_key, **kwargs)
 
-    def check_installation(self) -> bool:
+    # File types that can share one mineru invocation; images are staged after
+    # prepare_for_ocr, which converts .webp and .gif to a format MinerU reads
+    GROUPABLE_PDF_FORMATS = {".pdf"}
+    GROUPABLE_IMAGE_FORMATS = {".png", ".jpeg", ".jpg", ".webp", ".gif"}
+
+    @classmethod
+    def make_file_groups(
+        cls, file_paths: List[Union[str, Path]], group_size: int
+    ) -> List[List[Path]]:
         """
-        Check if MinerU 2.0 is properly installed
+        Split files into groups that can share one mineru invocation
+
+        PDFs and natively supported images are grouped separately (images are
+        parsed with the OCR method). Every other file becomes a group of one.
+
+        Args:
+            file_paths: Files to group
+            group_size: Maximum number of files per group
 
         Returns:
-            bool: True if installation is valid, False otherwise
+            List[List[Path]]: Groups in input order
         """
-        try:
-            # Prepare subprocess parameters to hide console window on Windows
-            import platform
+        group_size = max(1, group_size)
+        pdfs, images, singles = [], [], []
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            ext = file_path.suffix.lower()
+            if ext in cls.GROUPABLE_PDF_FORMATS:
+                pdfs.append(file_path)
+            elif ext in cls.GROUPABLE_IMAGE_FORMATS:
+                images.append(file_path)
+            else:
+                singles.append(file_path)
 
-            subprocess_kwargs = {
-                "capture_output": True,
-                "text": True,
-                "check": True,
-                "encoding": "utf-8",
-                "errors": "ignore",
-            }
+        groups = []
+        for files in (pdfs, images):
+            for i in range(0, len(files), group_size):
+                groups.append(files[i : i + group_size])
+        groups.extend([file_path] for file_path in singles)
+        return groups
 
-            # Hide console window on Windows
-            if platform.system() == "Windows":
-                subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    async def parse_file_group(
+        self,
+        file_paths: List[Union[str, Path]],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        retry_failed: bool = True,
+        **kwargs,
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, str]]:
+        """
+        Parse several files with a single mineru command line invocation
 
-            result = subprocess.run(["mineru", "--version"], **subprocess_kwargs)
-            logging.debug(f"MinerU version: {result.stdout.strip()}")
-            return True
+        The files are staged (hard-linked, or copied) into a temporary input
+        directory so MinerU loads its models once for the whole group; the warm
+        worker pool is used when one is configured. Images are prepared for OCR
+        exactly as in `parse_image`, so a grouped parse gives the same result as
+        a single one. Results are mapped back to each source file through
+        `_read_output_files`. A file without fresh output is retried alone when
+        `retry_failed` is set.
+
+        Args:
+            file_paths: Files from one group of `make_file_groups`
+            output_dir: Output directory path (each file gets `<stem>/<method>` below it)
+            method: Parsing method for PDFs (auto, txt, ocr); images always use ocr
+            lang: Document language for OCR optimization
+            retry_failed: Whether to parse files that failed in the group one by one
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            Tuple containing (content lists keyed by source path, errors keyed by source path)
+        """
+        import os
+        import shutil
+        import time
+
+        file_paths = [Path(p) for p in file_paths]
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        if not file_paths:
+            return results, errors
+
+        base_output_dir = (
+            Path(output_dir) if output_dir else file_paths[0].parent / "mineru_output"
+        )
+        base_output_dir.mkdir(parents=True, exist_ok=True)
+
+        is_image_group = all(
+            p.suffix.lower() in self.GROUPABLE_IMAGE_FORMATS for p in file_paths
+        )
+        if is_image_group:
+            method = "ocr"
+
+        if is_image_group:
+            from raganything.image_preprocessor import get_image_preprocessor
+
+            preprocessor = get_image_preprocessor()
+
+        staging_dir = Path(tempfile.mkdtemp(prefix="mineru_group_"))
+        staged: Dict[str, Path] = {}
+        group_error = None
+        try:
+            # Stage files under unique stems so their outputs cannot collide
+            for file_path in file_paths:
+                source = file_path
+                if is_image_group:
+                    # Convert, straighten and downscale as parse_image does
+                    try:
+                        source = await asyncio.to_thread(
+                            preprocessor.prepare_for_ocr, file_path
+                        )
+                    except Exception as e:
+                        errors[str(file_path)] = (
+                            f"Failed to convert image {file_path.name}: {e}"
+                        )
+                        continue
+                stem = file_path.stem
+                suffix = 1
+                while stem in staged:
+                    stem = f"{file_path.stem}_{suffix}"
+                    suffix += 1
+                target = staging_dir / f"{stem}{source.suffix.lower()}"
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+                staged[stem] = file_path
+
+            started = time.time()
+            if staged:
+                logging.info(
+                    f"[MinerU] Parsing group of {len(staged)} files in one invocation"
+                )
+                try:
+                    await self._execute_mineru(
+                        input_path=staging_dir,
+                        output_dir=base_output_dir,
+                        method=method,
+                        lang=lang,
+                        **kwargs,
+                    )
+                except MineruExecutionError as e:
+                    # Some files may still have been parsed; collect what exists
+                    group_error = e
+                    logging.warning(f"[MinerU] Group invocation failed: {e}")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        read_method = (
+            "vlm" if (kwargs.get("backend") or "").startswith("vlm-") else method
+        )
+        failed = []
+        for stem, source_path in staged.items():
+            json_file = (
+                base_output_dir / stem / read_method / f"{stem}_content_list.json"
+            )
+            # Ignore stale output left over from an earlier run
+            if json_file.exists() and json_file.stat().st_mtime >= started - 1:
+                content_list, _ = self._read_output_files(
+                    base_output_dir, stem, method=read_method
+                )
+                results[str(source_path)] = content_list
+            else:
+                failed.append((stem, source_path))
+
+        if not failed:
+            return results, errors
+
+        if not retry_failed:
+            for _, source_path in failed:
+                errors[str(source_path)] = str(
+                    group_error or "No output produced in group invocation"
+                )
+            return results, errors
+
+        # Isolate failures by parsing each remaining file on its own
+        for stem, source_path in failed:
+            logging.info(f"[MinerU] Retrying {source_path.name} alone")
+            # Renamed files keep a separate output directory to avoid collisions
+            retry_output_dir = (
+                base_output_dir
+                if stem == source_path.stem
+                else base_output_dir / stem
+            )
+            try:
+                if is_image_group:
+                    content_list = await self.parse_image(
+                        source_path, output_dir=str(retry_output_dir), lang=lang, **kwargs
+                    )
+                else:
+                    content_list = await self.parse_pdf(
+                        source_path,
+                        output_dir=str(retry_output_dir),
+                        method=method,
+                        lang=lang,
+                        **kwargs,
+                    )
+                results[str(source_path)] = content_list
+            except Exception as e:
+                errors[str(source_path)] = str(e)
+
+        return results, errors
+
+    def check_installation(self) -> bool:
+        """
+        Check if MinerU 2.0 is properly installed
+
+        Returns:
+            bool: True if installation is valid, False otherwise
+        """
+        try:
+            # Prepare subprocess parameters to hide console window on Windows
+            import platform
+
+            subprocess_kwargs = {
+                "capture_output": True,
+                "text": True,
+                "check": True,
+                "encoding": "utf-8",
+                "errors": "ignore",
+            }
+
+            # Hide console window on Windows
+            if platform.system() == "Windows":
+                subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+            result = subprocess.run(["mineru", "--version"], **subprocess_kwargs)
+            logging.debug(f"MinerU version: {result.stdout.strip()}")
+            return True
         except (subprocess.CalledProcessError, FileNotFoundError):
             logging.debug(
                 "MinerU 2.0 is not properly installed. "
@@ -1578,10 +2221,58 @@ class DoclingParser(Parser):
     # Define Docling-specific formats
     HTML_FORMATS = {".html", ".htm", ".xhtml"}
 
+    # In-process converters, one per worker thread, reused across files
+    _converter_local = threading.local()
+    _converter_unavailable = False
+
     def __init__(self) -> None:
         """Initialize DoclingParser"""
         super().__init__()
 
+    @classmethod
+    def _get_converter(cls):
+        """
+        Get the cached in-process Docling converter for the current thread
+
+        The converter is configured like the docling CLI defaults (picture
+        images generated for embedding), so its output matches the CLI path.
+        Models are loaded on first use and kept for later files.
+
+        Returns:
+            DocumentConverter or None if Docling cannot be imported in-process
+        """
+        if cls._converter_unavailable:
+            return None
+
+        converter = getattr(cls._converter_local, "converter", None)
+        if converter is not None:
+            return converter
+
+        try:
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+        except ImportError as e:
+            logging.info(f"Docling is not importable in-process ({e}), using the docling CLI")
+            cls._converter_unavailable = True
+            return None
+
+        pipeline_options = PdfPipelineOptions()
+        pipeline_options.generate_page_images = True
+        pipeline_options.generate_picture_images = True
+        pipeline_options.images_scale = 2
+        pdf_format_option = PdfFormatOption(pipeline_options=pipeline_options)
+
+        converter = DocumentConverter(
+            format_options={
+                InputFormat.PDF: pdf_format_option,
+                InputFormat.IMAGE: pdf_format_option,
+            }
+        )
+        cls._converter_local.converter = converter
+        logging.info("Created in-process Docling converter")
+        return converter
+
     def parse_pdf(
         self,
         pdf_path: Union[str, Path],
@@ -1688,7 +2379,11 @@ class DoclingParser(Parser):
         **kwargs,
     ) -> None:
         """
-        Run docling command line tool
+        Convert a document with Docling, writing JSON and Markdown output
+
+        Uses the cached in-process converter when Docling is importable, so
+        models are loaded once and the document is converted once for both
+        outputs. Otherwise runs the docling CLI once with both output formats.
 
         Args:
             input_path: Path to input file or directory
@@ -1700,18 +2395,30 @@ class DoclingParser(Parser):
         file_output_dir = Path(output_dir) / file_stem / "docling"
         file_output_dir.mkdir(parents=True, exist_ok=True)
 
-        cmd_json = [
+        converter = self._get_converter()
+        if converter is not None:
+            from docling_core.types.doc import ImageRefMode
+
+            result = converter.convert(str(input_path))
+            # Name outputs after the input file, as the docling CLI does
+            doc_filename = Path(input_path).stem
+            result.document.save_as_json(
+                file_output_dir / f"{doc_filename}.json",
+                image_mode=ImageRefMode.EMBEDDED,
+            )
+            result.document.save_as_markdown(
+                file_output_dir / f"{doc_filename}.md",
+                image_mode=ImageRefMode.EMBEDDED,
+            )
+            logging.info("Docling conversion completed in-process")
+            return
+
+        cmd = [
             "docling",
             "--output",
             str(file_output_dir),
             "--to",
             "json",
-            str(input_path),
-        ]
-        cmd_md = [
-            "docling",
-            "--output",
-            str(file_output_dir),
             "--to",
             "md",
             str(input_path),
@@ -1733,13 +2440,10 @@ class DoclingParser(Parser):
             if platform.system() == "Windows":
                 docling_subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-            result_json = subprocess.run(cmd_json, **docling_subprocess_kwargs)
-            result_md = subprocess.run(cmd_md, **docling_subprocess_kwargs)
+            result = subprocess.run(cmd, **docling_subprocess_kwargs)
             logging.info("Docling command executed successfully")
-            if result_json.stdout:
-                logging.debug(f"JSON cmd output: {result_json.stdout}")
-            if result_md.stdout:
-                logging.debug(f"Markdown cmd output: {result_md.stdout}")
+            if result.stdout:
+                logging.debug(f"Docling cmd output: {result.stdout}")
         except subprocess.CalledProcessError as e:
             logging.error(f"Error running docling command: {e}")
             if e.stderr:
@@ -1783,21 +2487,186 @@ class DoclingParser(Parser):
         content_list = []
         if json_file.exists():
             try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    docling_content = json.load(f)
-                    # Convert docling format to minerU format
-                    content_list = self.read_from_block_recursive(
-                        docling_content["body"],
-                        "body",
-                        file_subdir,
-                        0,
-                        "0",
-                        docling_content,
-                    )
+                content_list = list(self.iter_content_blocks(json_file, file_subdir))
             except Exception as e:
                 logging.warning(f"Could not read or convert JSON file {json_file}: {e}")
         return content_list, md_content
 
+    # Top-level sections of a Docling document needed to resolve "$ref"s
+    _DOCLING_SECTIONS = ("body", "groups", "texts", "tables")
+
+    @classmethod
+    def _load_docling_sections(
+        cls, json_file: Path, on_picture
+    ) -> Dict[str, Any]:
+        """
+        Load a Docling JSON document, handing pictures off one at a time
+
+        With ijson installed the file is parsed as a stream: only the sections
+        needed for traversal are built in memory, and each picture is passed to
+        `on_picture(index, picture)` as soon as it is complete, so large base64
+        images are never all held at once. Without ijson the whole file is
+        loaded with `json.load`.
+
+        Args:
+            json_file: Docling JSON output file
+            on_picture: Callback receiving (index, picture dict) for every picture
+
+        Returns:
+            Dict[str, Any]: The body, groups, texts and tables sections
+        """
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+
+        if ijson is None:
+            with open(json_file, "r", encoding="utf-8") as f:
+                docling_content = json.load(f)
+            for index, picture in enumerate(docling_content.pop("pictures", [])):
+                on_picture(index, picture)
+            return {key: docling_content.get(key, []) for key in cls._DOCLING_SECTIONS}
+
+        sections: Dict[str, Any] = {}
+        current_key = None
+        builder = None
+        picture_builder = None
+        picture_count = 0
+
+        with open(json_file, "rb") as f:
+            try:
+                events = ijson.parse(f, use_float=True)
+            except TypeError:
+                # ijson < 3.1 has no use_float option
+                events = ijson.parse(f)
+
+            for prefix, event, value in events:
+                if prefix == "":
+                    # Top-level structure: a key starts a new section
+                    if builder is not None:
+                        sections[current_key] = builder.value
+                        builder = None
+                    if event == "map_key":
+                        current_key = value
+                        if value in cls._DOCLING_SECTIONS:
+                            builder = ijson.ObjectBuilder()
+                    continue
+
+                if current_key == "pictures":
+                    if prefix == "pictures":
+                        continue  # start/end of the pictures array
+                    if prefix == "pictures.item" and event == "start_map":
+                        picture_builder = ijson.ObjectBuilder()
+                    picture_builder.event(event, value)
+                    if prefix == "pictures.item" and event == "end_map":
+                        on_picture(picture_count, picture_builder.value)
+                        picture_count += 1
+                        picture_builder = None
+                elif builder is not None:
+                    builder.event(event, value)
+
+        if builder is not None:
+            sections[current_key] = builder.value
+        return sections
+
+    @staticmethod
+    def _write_picture(base64_uri: str, image_path: Path) -> str:
+        """Decode a base64 data URI and write it to disk, returning the absolute path"""
+        base64_str = base64_uri.split(",")[1]
+        with open(image_path, "wb") as f:
+            f.write(base64.b64decode(base64_str))
+        return str(image_path.resolve())
+
+    def iter_content_blocks(
+        self, json_file: Path, output_dir: Path, image_workers: int = 4
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Convert a Docling JSON document to MinerU-style content blocks lazily
+
+        The document tree is walked iteratively (no recursion limit) in the same
+        order, and with the same page_idx numbering, as `read_from_block_recursive`.
+        Pictures are decoded and written to `output_dir/images` on a background
+        thread pool while the file is still being read; an image block is yielded
+        once its file has been written.
+
+        Args:
+            json_file: Docling JSON output file
+            output_dir: Docling output subdirectory (images go to its "images" folder)
+            image_workers: Number of threads writing images
+
+        Yields:
+            Dict[str, Any]: Content blocks in document order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        image_dir = output_dir / "images"
+        pictures: Dict[int, Dict[str, Any]] = {}
+        # Bound the number of decoded-but-unwritten images held in memory
+        pending_writes = threading.BoundedSemaphore(image_workers * 2)
+
+        with ThreadPoolExecutor(
+            max_workers=image_workers, thread_name_prefix="docling-images"
+        ) as executor:
+
+            def on_picture(index: int, picture: Dict[str, Any]) -> None:
+                image = picture.pop("image", None) or {}
+                uri = image.get("uri", "")
+                if uri.startswith("data:"):
+                    image_dir.mkdir(parents=True, exist_ok=True)
+                    pending_writes.acquire()
+                    future = executor.submit(
+                        self._write_picture, uri, image_dir / f"image_{index}.png"
+                    )
+                    future.add_done_callback(lambda _: pending_writes.release())
+                    picture["_image_future"] = future
+                pictures[index] = picture
+
+            sections = self._load_docling_sections(json_file, on_picture)
+            sections["pictures"] = pictures
+
+            # Stack entries: (block, type, num, cnt passed by the parent)
+            stack = [(sections.get("body") or {}, "body", "0", 0)]
+            while stack:
+                block, block_type, num, cnt = stack.pop()
+                children = block.get("children") or []
+
+                if not children or block_type not in ["groups", "body"]:
+                    cnt += 1
+                    yield self._convert_block(block, block_type, output_dir, cnt, num)
+
+                # Push children in reverse so they are visited in order
+                for offset in range(len(children), 0, -1):
+                    member_tag = children[offset - 1]["$ref"]
+                    _, member_type, member_num = member_tag.split("/")[:3]
+                    member_block = sections[member_type][int(member_num)]
+                    stack.append((member_block, member_type, member_num, cnt + offset))
+
+    def _convert_block(
+        self, block, type: str, output_dir: Path, cnt: int, num: str
+    ) -> Dict[str, Any]:
+        """Convert one Docling block, waiting for its image file if it is a picture"""
+        if type != "pictures":
+            return self.read_from_block(block, type, output_dir, cnt, num)
+
+        try:
+            future = block.get("_image_future")
+            if future is None:
+                raise ValueError("picture has no embedded image")
+            return {
+                "type": "image",
+                "img_path": future.result(),
+                "image_caption": block.get("caption", ""),
+                "image_footnote": block.get("footnote", ""),
+                "page_idx": cnt // 10,
+            }
+        except Exception as e:
+            logging.warning(f"Failed to process image {num}: {e}")
+            return {
+                "type": "text",
+                "text": f"[Image processing failed: {block.get('caption', '')}]",
+                "page_idx": cnt // 10,
+            }
+
     def read_from_block_recursive(
         self,
         block,
@@ -2019,6 +2888,12 @@ class DoclingParser(Parser):
         Returns:
             bool: True if installation is valid, False otherwise
         """
+        import importlib.util
+
+        if importlib.util.find_spec("docling") is not None:
+            logging.debug("Docling is importable in-process")
+            return True
+
         try:
             # Prepare subprocess parameters to hide console window on Windows
             import platform
@@ -2046,6 +2921,1091 @@ class DoclingParser(Parser):
             return False
 
 
+class NativeTextParser(Parser):
+    """
+    Direct Markdown/TXT parser that skips the PDF round-trip.
+
+    Builds the MinerU-style content list straight from the source text:
+    headings become text blocks with `text_level`, pipe tables become table
+    blocks, `$$...$$` blocks become equations and local image links become
+    image blocks. Plain text files are split into paragraphs.
+    """
+
+    # Characters per synthetic page, roughly one rendered PDF page, so that
+    # page-based context extraction still has meaningful windows
+    PAGE_CHARS = 3000
+
+    _HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+    _SETEXT_RE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+    _FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+    _RULE_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+    _LIST_ITEM_RE = re.compile(r"^\s{0,3}([-*+]|\d{1,9}[.)])(\s|$)")
+    _TABLE_SEPARATOR_RE = re.compile(
+        r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$"
+    )
+    _IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+[\"'][^)]*[\"'])?\s*\)")
+
+    def __init__(self) -> None:
+        """Initialize NativeTextParser"""
+        super().__init__()
+
+    @staticmethod
+    def _read_text(text_path: Path) -> str:
+        """Read a text file, trying common encodings like convert_text_to_pdf"""
+        for encoding in ["utf-8", "gbk", "latin-1", "cp1252"]:
+            try:
+                return text_path.read_text(encoding=encoding)
+            except UnicodeDecodeError:
+                continue
+        raise RuntimeError(
+            f"Could not decode text file {text_path.name} with any supported encoding"
+        )
+
+    def parse_text_file(
+        self,
+        text_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a .txt or .md file into content blocks without converting it to PDF
+
+        Args:
+            text_path: Path to the text file (.txt, .md)
+            output_dir: Unused, accepted for interface compatibility
+            **kwargs: Unused, accepted for interface compatibility
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        text_path = Path(text_path)
+        if not text_path.exists():
+            raise FileNotFoundError(f"Text file does not exist: {text_path}")
+        if text_path.suffix.lower() not in self.TEXT_FORMATS:
+            raise ValueError(f"Unsupported text format: {text_path.suffix}")
+
+        text = self._read_text(text_path).replace("\r\n", "\n").replace("\r", "\n")
+        if text_path.suffix.lower() == ".md":
+            blocks = self._parse_markdown(text, text_path.parent)
+        else:
+            blocks = [
+                {"type": "text", "text": paragraph.strip()}
+                for paragraph in re.split(r"\n\s*\n", text)
+                if paragraph.strip()
+            ]
+
+        self.assign_pages(blocks)
+        logging.info(f"Parsed {text_path.name} natively into {len(blocks)} content blocks")
+        return blocks
+
+    @classmethod
+    def assign_pages(cls, blocks: List[Dict[str, Any]]) -> None:
+        """Assign synthetic page numbers in place by accumulated text length"""
+        chars = 0
+        for block in blocks:
+            block["page_idx"] = chars // cls.PAGE_CHARS
+            chars += len(block.get("text") or block.get("table_body") or "")
+
+    def _parse_markdown(self, text: str, base_dir: Path) -> List[Dict[str, Any]]:
+        """Convert Markdown source to content blocks in document order"""
+        lines = text.split("\n")
+        blocks: List[Dict[str, Any]] = []
+        paragraph: List[str] = []
+
+        def flush_paragraph():
+            if paragraph:
+                blocks.extend(self._paragraph_blocks("\n".join(paragraph), base_dir))
+                paragraph.clear()
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                flush_paragraph()
+                i += 1
+                continue
+
+            # Fenced code block: keep verbatim as text
+            fence = self._FENCE_RE.match(line)
+            if fence:
+                flush_paragraph()
+                marker = fence.group(1)
+                end = i + 1
+                while end < len(lines) and not lines[end].strip().startswith(marker):
+                    end += 1
+                code = "\n".join(lines[i : end + 1])
+                blocks.append({"type": "text", "text": code})
+                i = end + 1
+                continue
+
+            # Display equation: $$ ... $$ on one or several lines; an opening
+            # $$ that is never closed is ordinary text
+            if stripped.startswith("$$"):
+                body = stripped[2:]
+                end = i
+                if body.rstrip().endswith("$$") and len(body.strip()) >= 2:
+                    body = body.rstrip()[:-2]
+                else:
+                    parts = [body]
+                    end = i + 1
+                    while end < len(lines) and "$$" not in lines[end]:
+                        parts.append(lines[end])
+                        end += 1
+                    if end == len(lines):
+                        paragraph.append(line)
+                        i += 1
+                        continue
+                    parts.append(lines[end].split("$$", 1)[0])
+                    body = "\n".join(parts)
+                flush_paragraph()
+                latex = body.strip()
+                if latex:
+                    blocks.append(
+                        {
+                            "type": "equation",
+                            "img_path": "",
+                            "text": f"$$\n{latex}\n$$",
+                            "text_format": "latex",
+                        }
+                    )
+                i = end + 1
+                continue
+
+            # ATX heading
+            heading = self._HEADING_RE.match(line)
+            if heading:
+                flush_paragraph()
+                blocks.append(
+                    {
+                        "type": "text",
+                        "text": heading.group(2),
+                        "text_level": len(heading.group(1)),
+                    }
+                )
+                i += 1
+                continue
+
+            # Setext heading: a single paragraph line underlined with === or ---
+            # (a list item is never promoted; --- after it is a thematic break)
+            in_list = bool(paragraph) and bool(self._LIST_ITEM_RE.match(paragraph[0]))
+            if (
+                len(paragraph) == 1
+                and not in_list
+                and self._SETEXT_RE.match(line)
+                and "|" not in paragraph[0]
+            ):
+                blocks.append(
+                    {
+                        "type": "text",
+                        "text": paragraph[0].strip(),
+                        "text_level": 1 if stripped.startswith("=") else 2,
+                    }
+                )
+                paragraph.clear()
+                i += 1
+                continue
+
+            # Thematic break (---, ***, ___) outside a paragraph or after a list
+            if (not paragraph or in_list) and self._RULE_RE.match(line):
+                flush_paragraph()
+                i += 1
+                continue
+
+            # Pipe table: header row followed by a separator row
+            if (
+                "|" in line
+                and i + 1 < len(lines)
+                and self._TABLE_SEPARATOR_RE.match(lines[i + 1])
+            ):
+                flush_paragraph()
+                end = i + 2
+                while end < len(lines) and "|" in lines[end] and lines[end].strip():
+                    end += 1
+                blocks.append(
+                    {
+                        "type": "table",
+                        "img_path": "",
+                        "table_caption": [],
+                        "table_footnote": [],
+                        "table_body": "\n".join(line.strip() for line in lines[i:end]),
+                    }
+                )
+                i = end
+                continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush_paragraph()
+        return blocks
+
+    def _paragraph_blocks(self, paragraph: str, base_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Split image links out of a paragraph
+
+        Local images become image blocks after the paragraph text; remote or
+        missing images are replaced by their alt text.
+        """
+        images = []
+
+        def replace_image(match):
+            alt, src = match.group(1).strip(), match.group(2)
+            if "://" not in src and not src.startswith("data:"):
+                image_path = (base_dir / src).resolve()
+                if image_path.is_file():
+                    images.append(
+                        {
+                            "type": "image",
+                            "img_path": str(image_path),
+                            "image_caption": [alt] if alt else [],
+                            "image_footnote": [],
+                        }
+                    )
+                    return ""
+            return alt
+
+        text = self._IMAGE_RE.sub(replace_image, paragraph).strip()
+        blocks = [{"type": "text", "text": text}] if text else []
+        return blocks + images
+
+    def parse_pdf(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        raise ValueError("NativeTextParser only parses .txt and .md files")
+
+    def parse_image(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        raise ValueError("NativeTextParser only parses .txt and .md files")
+
+    def parse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse a .txt or .md file; see `parse_text_file`"""
+        return self.parse_text_file(file_path, output_dir, **kwargs)
+
+    def check_installation(self) -> bool:
+        """No external tools are needed"""
+        return True
+
+
+class NativeOfficeParser(Parser):
+    """
+    Native OOXML extractor for .docx, .pptx and .xlsx files.
+
+    Reads the document structure directly with python-docx, python-pptx and
+    openpyxl instead of converting to PDF and running layout analysis:
+    worksheet cells and Word/PowerPoint tables become table blocks, paragraphs
+    and headings become text blocks, and embedded pictures become image blocks.
+    """
+
+    # Supported extension -> module that must be importable
+    NATIVE_FORMATS = {".docx": "docx", ".pptx": "pptx", ".xlsx": "openpyxl"}
+
+    # Image formats the multimodal processors can handle
+    IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".tiff", ".tif", ".webp"}
+
+    # Worksheet rows per table block; the header row is repeated in each block
+    SHEET_ROWS_PER_TABLE = 100
+
+    def __init__(self) -> None:
+        """Initialize NativeOfficeParser"""
+        super().__init__()
+
+    @classmethod
+    def is_available(cls, ext: str) -> bool:
+        """Whether the library needed for this extension is installed"""
+        import importlib.util
+
+        module = cls.NATIVE_FORMATS.get(ext.lower())
+        return module is not None and importlib.util.find_spec(module) is not None
+
+    def parse_office_doc(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract content blocks from an OOXML document without a PDF stage
+
+        Args:
+            doc_path: Path to the .docx, .pptx or .xlsx file
+            output_dir: Output directory path (images are written below it)
+            **kwargs: Unused, accepted for interface compatibility
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        doc_path = Path(doc_path)
+        if not doc_path.exists():
+            raise FileNotFoundError(f"Office document does not exist: {doc_path}")
+
+        ext = doc_path.suffix.lower()
+        if ext not in self.NATIVE_FORMATS:
+            raise ValueError(
+                f"Unsupported format for native extraction: {ext}. "
+                f"Supported formats: {', '.join(self.NATIVE_FORMATS)}"
+            )
+
+        base_output_dir = (
+            Path(output_dir) if output_dir else doc_path.parent / "native_output"
+        )
+        image_dir = base_output_dir / doc_path.stem / "native" / "images"
+
+        if ext == ".docx":
+            blocks = self._parse_docx(doc_path, image_dir)
+            NativeTextParser.assign_pages(blocks)
+        elif ext == ".pptx":
+            blocks = self._parse_pptx(doc_path, image_dir)
+        else:
+            blocks = self._parse_xlsx(doc_path, image_dir)
+
+        logging.info(f"Extracted {len(blocks)} content blocks natively from {doc_path.name}")
+        return blocks
+
+    def _write_image(
+        self, blob: bytes, ext: str, image_dir: Path, index: int
+    ) -> Optional[Dict[str, Any]]:
+        """Write an embedded image and return its image block"""
+        ext = ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+        if ext not in self.IMAGE_EXTENSIONS:
+            logging.debug(f"Skipping embedded image with unsupported format {ext}")
+            return None
+        image_dir.mkdir(parents=True, exist_ok=True)
+        image_path = image_dir / f"image_{index}{ext}"
+        image_path.write_bytes(blob)
+        return {
+            "type": "image",
+            "img_path": str(image_path.resolve()),
+            "image_caption": [],
+            "image_footnote": [],
+        }
+
+    @staticmethod
+    def _table_block(rows: List[List[str]], caption: str = "") -> Dict[str, Any]:
+        """Build a table block with an HTML body, as MinerU produces"""
+        import html
+
+        body = "".join(
+            "<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>"
+            for row in rows
+        )
+        return {
+            "type": "table",
+            "img_path": "",
+            "table_caption": [caption] if caption else [],
+            "table_footnote": [],
+            "table_body": f"<table>{body}</table>",
+        }
+
+    @staticmethod
+    def _heading_level(style_name: str) -> int:
+        """Map a Word paragraph style to a heading level (0 for body text)"""
+        if style_name == "Title":
+            return 1
+        match = re.match(r"Heading\s+(\d)", style_name)
+        return int(match.group(1)) if match else 0
+
+    def _parse_docx(self, doc_path: Path, image_dir: Path) -> List[Dict[str, Any]]:
+        """Walk a Word document body in order"""
+        import docx
+        from docx.oxml.ns import qn
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        document = docx.Document(str(doc_path))
+        related_parts = document.part.related_parts
+        blocks: List[Dict[str, Any]] = []
+        image_count = itertools.count()
+
+        for element in document.element.body.iterchildren():
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "p":
+                paragraph = Paragraph(element, document)
+                text = paragraph.text.strip()
+                if text:
+                    block = {"type": "text", "text": text}
+                    level = self._heading_level(
+                        paragraph.style.name if paragraph.style is not None else ""
+                    )
+                    if level:
+                        block["text_level"] = level
+                    blocks.append(block)
+                # Inline pictures reference image parts through a:blip r:embed
+                for blip in element.findall(".//" + qn("a:blip")):
+                    part = related_parts.get(blip.get(qn("r:embed")))
+                    if part is None or not hasattr(part, "blob"):
+                        continue
+                    image = self._write_image(
+                        part.blob,
+                        Path(str(part.partname)).suffix,
+                        image_dir,
+                        next(image_count),
+                    )
+                    if image:
+                        blocks.append(image)
+            elif tag == "tbl":
+                table = Table(element, document)
+                rows = []
+                for row in table.rows:
+                    cells, previous = [], None
+                    for cell in row.cells:
+                        # Merged cells are repeated; keep each one once
+                        if cell._tc is previous:
+                            continue
+                        previous = cell._tc
+                        cells.append(cell.text.strip())
+                    rows.append(cells)
+                if rows:
+                    blocks.append(self._table_block(rows))
+        return blocks
+
+    def _parse_pptx(self, doc_path: Path, image_dir: Path) -> List[Dict[str, Any]]:
+        """Extract each slide's shapes in reading order, one page per slide"""
+        from pptx import Presentation
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+        presentation = Presentation(str(doc_path))
+        blocks: List[Dict[str, Any]] = []
+        image_count = itertools.count()
+
+        def shape_blocks(shapes, title_id=None):
+            ordered = sorted(shapes, key=lambda s: (s.top or 0, s.left or 0))
+            for shape in ordered:
+                if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+                    yield from shape_blocks(shape.shapes)
+                elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                    image = self._write_image(
+                        shape.image.blob, shape.image.ext, image_dir, next(image_count)
+                    )
+                    if image:
+                        yield image
+                elif getattr(shape, "has_table", False) and shape.has_table:
+                    rows = [
+                        [cell.text.strip() for cell in row.cells]
+                        for row in shape.table.rows
+                    ]
+                    if rows:
+                        yield self._table_block(rows)
+                elif getattr(shape, "has_text_frame", False) and shape.has_text_frame:
+                    text = shape.text_frame.text.strip()
+                    if text:
+                        block = {"type": "text", "text": text}
+                        if shape.shape_id == title_id:
+                            block["text_level"] = 1
+                        yield block
+
+        for page_idx, slide in enumerate(presentation.slides):
+            title = slide.shapes.title
+            title_id = title.shape_id if title is not None else None
+            for block in shape_blocks(slide.shapes, title_id):
+                block["page_idx"] = page_idx
+                blocks.append(block)
+        return blocks
+
+    @staticmethod
+    def _cell_text(value) -> str:
+        if value is None:
+            return ""
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _xlsx_sheet_media(package) -> Dict[str, List[str]]:
+        """
+        Map sheet names to the media files anchored in their drawings
+
+        Follows workbook.xml -> sheet part -> drawing part -> image relationships.
+        Read-only workbooks do not load drawings, so the package is read directly.
+        """
+        import posixpath
+        import xml.etree.ElementTree as ET
+
+        rel_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+        pkg_ns = "http://schemas.openxmlformats.org/package/2006/relationships"
+        names = set(package.namelist())
+
+        def relationships(part: str) -> List[tuple]:
+            """(type, id, target part) of each internal relationship of a part"""
+            folder, filename = posixpath.split(part)
+            rels_name = posixpath.join(folder, "_rels", filename + ".rels")
+            if rels_name not in names:
+                return []
+            pairs = []
+            for rel in ET.fromstring(package.read(rels_name)).iter(f"{{{pkg_ns}}}Relationship"):
+                target = rel.get("Target", "")
+                if rel.get("TargetMode") == "External" or not target:
+                    continue
+                if target.startswith("/"):
+                    target = target.lstrip("/")
+                else:
+                    target = posixpath.normpath(posixpath.join(folder, target))
+                pairs.append((rel.get("Type", ""), rel.get("Id"), target))
+            return pairs
+
+        workbook_part = "xl/workbook.xml"
+        if workbook_part not in names:
+            return {}
+        sheet_parts = {rel_id: target for _, rel_id, target in relationships(workbook_part)}
+
+        sheet_media: Dict[str, List[str]] = {}
+        workbook_xml = ET.fromstring(package.read(workbook_part))
+        for sheet in workbook_xml.iter():
+            if sheet.tag.rsplit("}", 1)[-1] != "sheet":
+                continue
+            sheet_part = sheet_parts.get(sheet.get(f"{{{rel_ns}}}id"))
+            if sheet_part is None:
+                continue
+            media = []
+            for rel_type, _, drawing in relationships(sheet_part):
+                if not rel_type.endswith("/drawing"):
+                    continue
+                for image_type, _, target in relationships(drawing):
+                    if image_type.endswith("/image") and target not in media:
+                        media.append(target)
+            sheet_media[sheet.get("name", "")] = media
+        return sheet_media
+
+    def _parse_xlsx(self, doc_path: Path, image_dir: Path) -> List[Dict[str, Any]]:
+        """Emit each worksheet as table blocks and its images, one page per sheet"""
+        import zipfile
+        import openpyxl
+
+        with zipfile.ZipFile(doc_path) as package:
+            media = [n for n in sorted(package.namelist()) if n.startswith("xl/media/")]
+            try:
+                sheet_media = self._xlsx_sheet_media(package)
+            except Exception as e:
+                logging.warning(f"Could not map workbook images to sheets: {e}")
+                sheet_media = {}
+            media_data = {name: package.read(name) for name in media}
+        image_index = {name: index for index, name in enumerate(media)}
+        emitted = set()
+
+        def image_blocks(names: List[str], page_idx: int) -> List[Dict[str, Any]]:
+            images = []
+            for name in names:
+                if name in emitted or name not in media_data:
+                    continue
+                emitted.add(name)
+                image = self._write_image(
+                    media_data[name], Path(name).suffix, image_dir, image_index[name]
+                )
+                if image:
+                    image["page_idx"] = page_idx
+                    images.append(image)
+            return images
+
+        workbook = openpyxl.load_workbook(str(doc_path), read_only=True, data_only=True)
+        blocks: List[Dict[str, Any]] = []
+        last_page = max(len(workbook.worksheets) - 1, 0)
+        try:
+            for page_idx, sheet in enumerate(workbook.worksheets):
+                rows = [
+                    [self._cell_text(value) for value in row]
+                    for row in sheet.iter_rows(values_only=True)
+                ]
+                # Drop empty rows and trailing empty columns
+                rows = [row for row in rows if any(cell for cell in row)]
+                if rows:
+                    width = max(
+                        max((i + 1 for i, cell in enumerate(row) if cell), default=0)
+                        for row in rows
+                    )
+                    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+
+                    blocks.append(
+                        {
+                            "type": "text",
+                            "text": sheet.title,
+                            "text_level": 1,
+                            "page_idx": page_idx,
+                        }
+                    )
+                    header, body = rows[0], rows[1:] or [[]]
+                    step = self.SHEET_ROWS_PER_TABLE
+                    for start in range(0, len(body), step):
+                        chunk = [header] + [row for row in body[start : start + step] if row]
+                        table = self._table_block(chunk, caption=sheet.title)
+                        table["page_idx"] = page_idx
+                        blocks.append(table)
+                blocks.extend(image_blocks(sheet_media.get(sheet.title, []), page_idx))
+        finally:
+            workbook.close()
+
+        # Images not anchored to a worksheet (e.g. on chart sheets) follow the
+        # last sheet
+        blocks.extend(image_blocks(media, last_page))
+        return blocks
+
+    def parse_pdf(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        raise ValueError("NativeOfficeParser only parses .docx, .pptx and .xlsx files")
+
+    def parse_image(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        raise ValueError("NativeOfficeParser only parses .docx, .pptx and .xlsx files")
+
+    def parse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse a .docx, .pptx or .xlsx file; see `parse_office_doc`"""
+        return self.parse_office_doc(file_path, output_dir, **kwargs)
+
+    def check_installation(self) -> bool:
+        """Check that python-docx, python-pptx and openpyxl are installed"""
+        return all(self.is_available(ext) for ext in self.NATIVE_FORMATS)
+
+
+class PyMuPDFParser(Parser):
+    """
+    Lightweight parser for born-digital PDFs using PyMuPDF, with no ML models.
+
+    Reads the PDF structure directly: text blocks (with heading levels inferred
+    from font size), embedded raster images and ruled tables are emitted in the
+    same content_list schema as MinerU. Scanned pages yield no text; use MinerU
+    (or the pre-flight router) for those.
+    """
+
+    # Images smaller than this (in points, either side) are treated as decoration
+    MIN_IMAGE_SIZE = 32
+
+    # Font sizes at least this much larger than body text count as headings
+    HEADING_SIZE_RATIO = 1.15
+
+    # Number of distinct heading sizes mapped to text_level 1..N
+    MAX_HEADING_LEVELS = 4
+
+    _FIGURE_CAPTION_RE = re.compile(r"^(figure|fig\.)\s*\d", re.IGNORECASE)
+    _TABLE_CAPTION_RE = re.compile(r"^table\s*\d", re.IGNORECASE)
+
+    def __init__(self) -> None:
+        """Initialize PyMuPDFParser"""
+        super().__init__()
+
+    @staticmethod
+    def _import_pymupdf():
+        """Import PyMuPDF under its current or legacy module name"""
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        return pymupdf
+
+    def _heading_sizes(self, document, pages: range) -> Dict[float, int]:
+        """
+        Infer heading levels from the font size distribution
+
+        The size carrying the most characters is taken as body text; larger
+        sizes become heading levels, largest first.
+
+        Returns:
+            Dict[float, int]: Rounded font size -> text_level
+        """
+        size_chars: Dict[float, int] = {}
+        for page_idx in pages:
+            text_dict = document[page_idx].get_text("dict", flags=0)
+            for block in text_dict.get("blocks", []):
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        size = round(span.get("size", 0) * 2) / 2
+                        size_chars[size] = size_chars.get(size, 0) + len(
+                            span.get("text", "").strip()
+                        )
+        if not size_chars:
+            return {}
+
+        body_size = max(size_chars, key=size_chars.get)
+        heading_sizes = sorted(
+            (size for size in size_chars if size >= body_size * self.HEADING_SIZE_RATIO),
+            reverse=True,
+        )[: self.MAX_HEADING_LEVELS]
+        return {size: level for level, size in enumerate(heading_sizes, start=1)}
+
+    @staticmethod
+    def _table_body(rows: List[List[Any]]) -> str:
+        """Render extracted table rows as an HTML table, as MinerU produces"""
+        import html
+
+        body = "".join(
+            "<tr>"
+            + "".join(
+                f"<td>{html.escape(str(cell or '').strip())}</td>" for cell in row
+            )
+            + "</tr>"
+            for row in rows
+        )
+        return f"<table>{body}</table>"
+
+    @staticmethod
+    def _inside(bbox, area) -> bool:
+        """Whether the centre of bbox lies within area"""
+        x = (bbox[0] + bbox[2]) / 2
+        y = (bbox[1] + bbox[3]) / 2
+        return area[0] <= x <= area[2] and area[1] <= y <= area[3]
+
+    def _page_blocks(
+        self,
+        pymupdf,
+        page,
+        page_idx: int,
+        heading_levels: Dict[float, int],
+        image_dir: Path,
+        image_count,
+    ) -> List[Dict[str, Any]]:
+        """Extract one page's blocks in reading order"""
+        # Ruled tables first, so text inside them is not emitted twice
+        tables = []
+        if hasattr(page, "find_tables"):
+            try:
+                for table in page.find_tables(strategy="lines").tables:
+                    rows = table.extract()
+                    if rows and len(rows) > 1:
+                        tables.append((tuple(table.bbox), rows))
+            except Exception as e:
+                logging.debug(f"Table detection failed on page {page_idx}: {e}")
+
+        entries = []  # (y, x, block)
+        for bbox, rows in tables:
+            entries.append(
+                (
+                    bbox[1],
+                    bbox[0],
+                    {
+                        "type": "table",
+                        "img_path": "",
+                        "table_caption": [],
+                        "table_footnote": [],
+                        "table_body": self._table_body(rows),
+                        "page_idx": page_idx,
+                    },
+                )
+            )
+
+        text_dict = page.get_text(
+            "dict", flags=pymupdf.TEXT_PRESERVE_IMAGES | pymupdf.TEXT_DEHYPHENATE
+        )
+        for block in text_dict.get("blocks", []):
+            bbox = block.get("bbox", (0, 0, 0, 0))
+
+            if block.get("type") == 1:
+                if any(self._inside(bbox, table_bbox) for table_bbox, _ in tables):
+                    continue
+                width, height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+                if width < self.MIN_IMAGE_SIZE or height < self.MIN_IMAGE_SIZE:
+                    continue
+                image_bytes = block.get("image")
+                if not image_bytes:
+                    continue
+                image_dir.mkdir(parents=True, exist_ok=True)
+                image_path = (
+                    image_dir / f"image_{next(image_count)}.{block.get('ext', 'png')}"
+                )
+                image_path.write_bytes(image_bytes)
+                entries.append(
+                    (
+                        bbox[1],
+                        bbox[0],
+                        {
+                            "type": "image",
+                            "img_path": str(image_path.resolve()),
+                            "image_caption": [],
+                            "image_footnote": [],
+                            "page_idx": page_idx,
+                        },
+                    )
+                )
+                continue
+
+            # Drop lines that belong to a table (blocks may straddle its border)
+            lines = [
+                line
+                for line in block.get("lines", [])
+                if not any(
+                    self._inside(line.get("bbox", bbox), table_bbox)
+                    for table_bbox, _ in tables
+                )
+            ]
+            # Start a new block at each "Figure N" / "Table N" caption line
+            groups: List[List[Dict[str, Any]]] = []
+            for line in lines:
+                line_text = "".join(
+                    span.get("text", "") for span in line.get("spans", [])
+                ).strip()
+                if not groups or self._FIGURE_CAPTION_RE.match(
+                    line_text
+                ) or self._TABLE_CAPTION_RE.match(line_text):
+                    groups.append([])
+                groups[-1].append(line)
+
+            for group in groups:
+                group_bbox = group[0].get("bbox", bbox)
+                spans = [
+                    span
+                    for line in group
+                    for span in line.get("spans", [])
+                    if span.get("text", "").strip()
+                ]
+                text = "\n".join(
+                    "".join(span.get("text", "") for span in line.get("spans", [])).strip()
+                    for line in group
+                ).strip()
+                if not text:
+                    continue
+
+                item = {"type": "text", "text": text, "page_idx": page_idx}
+                # A short block set entirely in one heading size is a heading
+                sizes = {round(span.get("size", 0) * 2) / 2 for span in spans}
+                if len(sizes) == 1 and len(text) < 200:
+                    level = heading_levels.get(sizes.pop())
+                    if level:
+                        item["text_level"] = level
+                entries.append((group_bbox[1], group_bbox[0], item))
+
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        blocks = [entry[2] for entry in entries]
+
+        # Attach "Figure N" / "Table N" captions next to images and tables
+        merged: List[Dict[str, Any]] = []
+        for block in blocks:
+            previous = merged[-1] if merged else None
+            if (
+                block["type"] == "text"
+                and previous is not None
+                and previous["type"] == "image"
+                and not previous["image_caption"]
+                and self._FIGURE_CAPTION_RE.match(block["text"])
+            ):
+                previous["image_caption"].append(block["text"])
+                continue
+            if (
+                block["type"] == "table"
+                and previous is not None
+                and previous["type"] == "text"
+                and self._TABLE_CAPTION_RE.match(previous["text"])
+            ):
+                block["table_caption"].append(merged.pop()["text"])
+            merged.append(block)
+        return merged
+
+    def parse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a born-digital PDF from its text layer and embedded objects
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Ignored; no OCR is performed
+            lang: Ignored
+            **kwargs: start_page / end_page (0-based, inclusive) limit the pages
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+
+        pymupdf = self._import_pymupdf()
+        base_output_dir = (
+            Path(output_dir) if output_dir else pdf_path.parent / "pymupdf_output"
+        )
+        file_subdir = base_output_dir / pdf_path.stem / "pymupdf"
+        file_subdir.mkdir(parents=True, exist_ok=True)
+
+        started = time.time()
+        document = pymupdf.open(str(pdf_path))
+        try:
+            start_page = kwargs.get("start_page") or 0
+            end_page = kwargs.get("end_page")
+            last_page = len(document) - 1 if end_page is None else min(end_page, len(document) - 1)
+            pages = range(start_page, last_page + 1)
+
+            heading_levels = self._heading_sizes(document, pages)
+            image_count = itertools.count()
+            content_list: List[Dict[str, Any]] = []
+            for page_idx in pages:
+                content_list.extend(
+                    self._page_blocks(
+                        pymupdf,
+                        document[page_idx],
+                        page_idx,
+                        heading_levels,
+                        file_subdir / "images",
+                        image_count,
+                    )
+                )
+        finally:
+            document.close()
+
+        with open(
+            file_subdir / f"{pdf_path.stem}_content_list.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(content_list, f, ensure_ascii=False, indent=2)
+
+        logging.info(
+            f"[PyMuPDF] Parsed {len(pages)} pages of {pdf_path.name} into "
+            f"{len(content_list)} content blocks in {time.time() - started:.2f}s"
+        )
+        return content_list
+
+    def parse_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Emit an image file as a single image block (no OCR is performed)
+
+        Args:
+            image_path: Path to the image file
+            output_dir: Unused, accepted for interface compatibility
+            lang: Unused, accepted for interface compatibility
+            **kwargs: Unused, accepted for interface compatibility
+
+        Returns:
+            List[Dict[str, Any]]: A single image content block
+        """
+        image_path = Path(image_path)
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image file does not exist: {image_path}")
+        return [
+            {
+                "type": "image",
+                "img_path": str(image_path.resolve()),
+                "image_caption": [],
+                "image_footnote": [],
+                "page_idx": 0,
+            }
+        ]
+
+    def parse_office_doc(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse an Office document by converting it to PDF with LibreOffice first
+
+        Args:
+            doc_path: Path to the document file
+            output_dir: Output directory path
+            lang: Unused, accepted for interface compatibility
+            **kwargs: Additional parameters for parse_pdf
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        pdf_path = self.convert_office_to_pdf(doc_path, output_dir)
+        return self.parse_pdf(pdf_path, output_dir, **kwargs)
+
+    def parse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a document with PyMuPDF based on its file extension
+
+        Args:
+            file_path: Path to the file to be parsed
+            method: Ignored; no OCR is performed
+            output_dir: Output directory path
+            lang: Ignored
+            **kwargs: Additional parameters for parse_pdf
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+
+        ext = file_path.suffix.lower()
+        if ext == ".pdf":
+            return self.parse_pdf(file_path, output_dir, method, lang, **kwargs)
+        elif ext in self.IMAGE_FORMATS:
+            return self.parse_image(file_path, output_dir, lang, **kwargs)
+        elif ext in self.OFFICE_FORMATS:
+            return self.parse_office_doc(file_path, output_dir, lang, **kwargs)
+        elif ext in self.TEXT_FORMATS:
+            return NativeTextParser().parse_text_file(file_path, output_dir)
+        else:
+            raise ValueError(
+                f"Unsupported file format: {ext}. "
+                f"Supported formats: PDF, images ({', '.join(self.IMAGE_FORMATS)}), "
+                f"Office ({', '.join(self.OFFICE_FORMATS)}) and text ({', '.join(self.TEXT_FORMATS)})"
+            )
+
+    def check_installation(self) -> bool:
+        """
+        Check if PyMuPDF is installed
+
+        Returns:
+            bool: True if PyMuPDF can be imported
+        """
+        try:
+            self._import_pymupdf()
+            return True
+        except ImportError:
+            logging.debug(
+                "PyMuPDF is not installed. Install it with: pip install pymupdf"
+            )
+            return False
+
+
+# Parser name (RAGAnythingConfig.parser) -> parser class
+PARSERS = {
+    "mineru": MineruParser,
+    "docling": DoclingParser,
+    "pymupdf": PyMuPDFParser,
+}
+
+
+def get_parser(parser_name: str) -> Parser:
+    """
+    Create the parser selected by name
+
+    Args:
+        parser_name: One of "mineru", "docling" or "pymupdf"
+
+    Returns:
+        Parser: A new parser instance
+
+    Raises:
+        ValueError: If the parser name is unknown
+    """
+    try:
+        return PARSERS[parser_name]()
+    except KeyError:
+        raise ValueError(
+            f"Unsupported parser type: {parser_name}. "
+            f"Supported parsers: {', '.join(PARSERS)}"
+        )
+
+
 def main():
     """
     Main function to run the document parser from command line
@@ -2110,7 +4070,7 @@ def main():
     )
     parser.add_argument(
         "--parser",
-        choices=["mineru", "docling"],
+        choices=["mineru", "docling", "pymupdf"],
         default="mineru",
         help="Parser selection",
     )
@@ -2123,7 +4083,7 @@ def main():
 
     # Check installation if requested
     if args.check:
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = get_parser(args.parser)
         if doc_parser.check_installation():
             print(f"✅ {args.parser.title()} is properly installed")
             return 0
@@ -2133,7 +4093,7 @@ def main():
 
     try:
         # Parse the document
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = get_parser(args.parser)
         content_list = doc_parser.parse_document(
             file_path=args.file_path,
             method=args.method,
@@ -2146,6 +4106,9 @@ def main():
             table=not args.no_table,
             vlm_url=args.vlm_url,
         )
+        if asyncio.iscoroutine(content_list):
+            # MinerU parsing is asynchronous
+            content_list = asyncio.run(content_list)
 
         print(f"✅ Successfully parsed: {args.file_path}")
         print(f"📊 Extracted {len(content_list)} content blocks")
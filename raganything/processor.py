@@ -8,11 +8,18 @@ import os
 import time
 import hashlib
 import json
-from typing import Dict, List, Any, Tuple, Optional
+import zlib
+from typing import AsyncIterator, Dict, List, Any, Tuple, Optional
 from pathlib import Path
 
 from raganything.base import DocStatus
-from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
+from raganything.parser import (
+    MineruParser,
+    NativeTextParser,
+    NativeOfficeParser,
+    MineruExecutionError,
+    get_parser,
+)
 from raganything.utils import (
     separate_content,
     insert_text_content,
@@ -26,49 +33,222 @@ from lightrag.utils import compute_mdhash_id
 class ProcessorMixin:
     """ProcessorMixin class containing document processing functionality for RAGAnything"""
 
-    def _generate_cache_key(
+    def _get_native_parser(self, ext: str):
+        """
+        Return a parser that reads this format directly, skipping the PDF stage
+
+        Args:
+            ext: Lower-case file extension
+
+        Returns:
+            NativeTextParser or NativeOfficeParser if enabled for the format, else None
+        """
+        if ext in NativeTextParser.TEXT_FORMATS and self.config.native_text_parsing:
+            return NativeTextParser()
+        if (
+            ext in NativeOfficeParser.NATIVE_FORMATS
+            and self.config.native_office_parsing
+        ):
+            if NativeOfficeParser.is_available(ext):
+                return NativeOfficeParser()
+            self.logger.warning(
+                f"Native parsing of {ext} needs the "
+                f"'{NativeOfficeParser.NATIVE_FORMATS[ext]}' package; "
+                "falling back to the PDF conversion route"
+            )
+        return None
+
+    async def _preflight_pdf(
+        self, file_path: Path, parse_method: str, **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Probe a PDF's pages to route text-layer pages to "txt" and the rest to "ocr"
+
+        Only runs for MinerU's pipeline backend with parse method "auto", when
+        config.pdf_preflight is enabled and no explicit page range was requested.
+
+        Args:
+            file_path: Path to the PDF file
+            parse_method: Requested parse method
+            **kwargs: Parser parameters (backend, start_page, end_page)
+
+        Returns:
+            Optional[Dict[str, Any]]: Probe result from MineruParser.probe_pdf_pages, or None
+        """
+        if not self._uses_pdf_preflight(file_path, parse_method, **kwargs):
+            return None
+        return await asyncio.to_thread(
+            MineruParser.probe_pdf_pages,
+            file_path,
+            self.config.pdf_preflight_min_chars,
+            self.config.pdf_preflight_max_image_coverage,
+            self.config.mineru_shard_pages,
+            self.config.pdf_preflight_min_range_pages,
+            self.config.pdf_preflight_max_ranges,
+        )
+
+    def _uses_pdf_preflight(
         self, file_path: Path, parse_method: str = None, **kwargs
-    ) -> str:
+    ) -> bool:
+        """Whether PDF pre-flight routing applies to this parse"""
+        return (
+            self.config.pdf_preflight
+            and self.config.parser == "mineru"
+            and not self.config.mineru_use_api
+            and file_path.suffix.lower() == ".pdf"
+            and (parse_method or self.config.parse_method) == "auto"
+            and not (kwargs.get("backend") or "").startswith("vlm")
+            and kwargs.get("start_page") is None
+            and kwargs.get("end_page") is None
+        )
+
+    async def _parses_in_ranges(
+        self, file_path: Path, parse_method: str = None, **kwargs
+    ) -> bool:
+        """Whether `parse_document` splits this PDF into page ranges (pre-flight or sharding)"""
+        if self._uses_pdf_preflight(file_path, parse_method, **kwargs):
+            return True
+        if (
+            self.config.mineru_shard_pages <= 0
+            or file_path.suffix.lower() != ".pdf"
+            or kwargs.get("start_page") is not None
+            or kwargs.get("end_page") is not None
+        ):
+            return False
+        page_count = await asyncio.to_thread(
+            MineruParser._get_pdf_page_count, file_path
+        )
+        return page_count > self.config.mineru_shard_pages
+
+    async def _get_file_digest(self, file_path: Path) -> str:
         """
-        Generate cache key based on file path and parsing configuration
+        Return the SHA-256 of a file's content, skipping the hash when unchanged
+
+        The parse cache keeps a path index of (size, mtime) -> digest, so a file
+        that has not changed since it was last seen is not read again.
 
         Args:
             file_path: Path to the file
-            parse_method: Parse method used
-            **kwargs: Additional parser parameters
 
         Returns:
-            str: Cache key for the file and configuration
+            str: Hex digest of the file content
         """
+        resolved = file_path.resolve()
+        stat = resolved.stat()
+        index_key = compute_mdhash_id(str(resolved), prefix="path-")
+        parse_cache = getattr(self, "parse_cache", None)
+
+        entry = None
+        if parse_cache is not None:
+            try:
+                entry = await parse_cache.get_by_id(index_key)
+                if (
+                    entry
+                    and entry.get("size") == stat.st_size
+                    and entry.get("mtime_ns") == stat.st_mtime_ns
+                    and entry.get("content_digest")
+                ):
+                    return entry["content_digest"]
+            except Exception as e:
+                self.logger.debug(f"Error reading parse cache path index: {e}")
 
-        # Get file modification time
-        mtime = file_path.stat().st_mtime
+        def hash_file() -> str:
+            hasher = hashlib.sha256()
+            with open(resolved, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            return hasher.hexdigest()
 
-        # Create configuration dict for cache key
-        config_dict = {
-            "file_path": str(file_path.absolute()),
-            "mtime": mtime,
+        digest = await asyncio.to_thread(hash_file)
+
+        if parse_cache is not None:
+            try:
+                await parse_cache.upsert(
+                    {
+                        index_key: {
+                            "file_path": str(resolved),
+                            "size": stat.st_size,
+                            "mtime_ns": stat.st_mtime_ns,
+                            "content_digest": digest,
+                            "indexed_at": time.time(),
+                        }
+                    }
+                )
+                if not entry:
+                    usage = await self._get_parse_cache_usage()
+                    usage["paths"] += 1
+                    if self._parse_cache_over_budget(usage):
+                        await self._evict_parse_cache()
+            except Exception as e:
+                self.logger.debug(f"Error updating parse cache path index: {e}")
+        return digest
+
+    def _get_parse_config(self, parse_method: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Collect the parser settings that affect a parse result
+
+        Args:
+            parse_method: Parse method used
+            **kwargs: Additional parser parameters
+
+        Returns:
+            Dict[str, Any]: Parser name, parse method and relevant parser kwargs
+        """
+        parse_config = {
             "parser": self.config.parser,
             "parse_method": parse_method or self.config.parse_method,
         }
+        parse_config.update(
+            {
+                k: v
+                for k, v in kwargs.items()
+                if k
+                in [
+                    "lang",
+                    "device",
+                    "start_page",
+                    "end_page",
+                    "formula",
+                    "table",
+                    "backend",
+                    "source",
+                ]
+            }
+        )
+        return parse_config
 
-        # Add relevant kwargs to config
-        relevant_kwargs = {
-            k: v
-            for k, v in kwargs.items()
-            if k
-            in [
-                "lang",
-                "device",
-                "start_page",
-                "end_page",
-                "formula",
-                "table",
-                "backend",
-                "source",
-            ]
-        }
-        config_dict.update(relevant_kwargs)
+    async def _generate_cache_key(
+        self, file_path: Path, parse_method: str = None, **kwargs
+    ) -> str:
+        """
+        Generate cache key based on file content and parsing configuration
+
+        The key does not depend on the file's path or modification time, so the
+        same document uploaded under another name, to another knowledge base,
+        or merely touched, maps to the same cache entry.
+
+        Args:
+            file_path: Path to the file
+            parse_method: Parse method used
+            **kwargs: Additional parser parameters
+
+        Returns:
+            str: Cache key for the file and configuration
+        """
+        # Create configuration dict for cache key
+        config_dict = self._get_parse_config(parse_method, **kwargs)
+        config_dict["content_digest"] = await self._get_file_digest(file_path)
+        # The extension selects the parser route for identical bytes
+        config_dict["suffix"] = file_path.suffix.lower()
+
+        # Pre-flight routing parses pages with different methods than "auto"
+        if self._uses_pdf_preflight(file_path, parse_method, **kwargs):
+            config_dict["pdf_preflight"] = True
+
+        # Native parsers produce different blocks than the PDF route
+        native_parser = self._get_native_parser(file_path.suffix.lower())
+        if native_parser is not None:
+            config_dict["native_parser"] = type(native_parser).__name__
 
         # Generate hash from config
         config_str = json.dumps(config_dict, sort_keys=True)
@@ -123,7 +303,7 @@ class ProcessorMixin:
 
         Args:
             cache_key: Cache key to look up
-            file_path: Path to the file for mtime check
+            file_path: Path to the file being parsed
             parse_method: Parse method used
             **kwargs: Additional parser parameters
 
@@ -133,55 +313,57 @@ class ProcessorMixin:
         if not hasattr(self, "parse_cache") or self.parse_cache is None:
             return None
 
+        result = await self._lookup_cached_result(cache_key, parse_method, **kwargs)
+        self.parse_cache_stats["hits" if result is not None else "misses"] += 1
+        return result
+
+    async def _lookup_cached_result(
+        self, cache_key: str, parse_method: str = None, **kwargs
+    ) -> tuple[List[Dict[str, Any]], str] | None:
+        """Load and validate a parse cache entry, refreshing its LRU timestamp on a hit"""
         try:
             cached_data = await self.parse_cache.get_by_id(cache_key)
             if not cached_data:
                 return None
 
-            # Check file modification time
-            current_mtime = file_path.stat().st_mtime
-            cached_mtime = cached_data.get("mtime", 0)
-
-            if current_mtime != cached_mtime:
-                self.logger.debug(f"Cache invalid - file modified: {cache_key}")
-                return None
-
             # Check parsing configuration
             cached_config = cached_data.get("parse_config", {})
-            current_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to current config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
-            }
-            current_config.update(relevant_kwargs)
+            current_config = self._get_parse_config(parse_method, **kwargs)
 
             if cached_config != current_config:
                 self.logger.debug(f"Cache invalid - config changed: {cache_key}")
                 return None
 
-            content_list = cached_data.get("content_list", [])
             doc_id = cached_data.get("doc_id")
+            # Entries written before blob storage keep the content list inline
+            content_list = cached_data.get("content_list")
+            if content_list is None and cached_data.get("blob"):
+                blob_path = self._get_parse_cache_blob_dir() / cached_data["blob"]
+                try:
+                    content_list = await asyncio.to_thread(
+                        self._read_parse_cache_blob, blob_path
+                    )
+                except (OSError, ValueError, zlib.error) as e:
+                    self.logger.debug(f"Cache invalid - unreadable blob ({e}): {cache_key}")
+                    return None
+
+            # Entries may come from another knowledge base whose parser output
+            # (and the extracted images it references) has since been removed
+            missing = self._find_missing_cached_assets(content_list)
+            if missing:
+                self.logger.debug(
+                    f"Cache invalid - referenced file missing ({missing}): {cache_key}"
+                )
+                return None
 
             if content_list and doc_id:
                 self.logger.debug(
                     f"Found valid cached parsing result for key: {cache_key}"
                 )
+                await self.parse_cache.upsert(
+                    {cache_key: self._cache_entry(cached_data, last_access=time.time())}
+                )
+                await self._flush_parse_cache()
                 return content_list, doc_id
             else:
                 self.logger.debug(
@@ -194,6 +376,18 @@ class ProcessorMixin:
 
         return None
 
+    @staticmethod
+    def _find_missing_cached_assets(
+        content_list: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """Return the first image path referenced by a cached parse that no longer exists"""
+        for item in content_list:
+            if isinstance(item, dict):
+                img_path = item.get("img_path")
+                if img_path and not os.path.exists(img_path):
+                    return img_path
+        return None
+
     async def _store_cached_result(
         self,
         cache_key: str,
@@ -201,6 +395,7 @@ class ProcessorMixin:
         doc_id: str,
         file_path: Path,
         parse_method: str = None,
+        preflight: Optional[Dict[str, Any]] = None,
         **kwargs,
     ) -> None:
         """
@@ -210,58 +405,273 @@ class ProcessorMixin:
             cache_key: Cache key to store under
             content_list: Content list to cache
             doc_id: Content-based document ID
-            file_path: Path to the file for mtime storage
+            file_path: Path to the parsed file, recorded with the entry
             parse_method: Parse method used
+            preflight: PDF pre-flight probe result, recorded with the entry
             **kwargs: Additional parser parameters
         """
         if not hasattr(self, "parse_cache") or self.parse_cache is None:
             return
 
         try:
-            # Get file modification time
-            file_mtime = file_path.stat().st_mtime
-
-            # Create parsing configuration
-            parse_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
-            }
-            parse_config.update(relevant_kwargs)
+            parse_config = self._get_parse_config(parse_method, **kwargs)
+
+            # The KV entry holds metadata only; the content list goes to a
+            # compressed blob that is read back only on a cache hit
+            blob_name = f"{cache_key[:2]}/{cache_key}.json.zz"
+            blob_size = await asyncio.to_thread(
+                self._write_parse_cache_blob,
+                self._get_parse_cache_blob_dir() / blob_name,
+                content_list,
+            )
 
+            now = time.time()
             cache_data = {
                 cache_key: {
-                    "content_list": content_list,
+                    "blob": blob_name,
+                    "blob_size": blob_size,
+                    "block_count": len(content_list),
                     "doc_id": doc_id,
-                    "mtime": file_mtime,
+                    "file_path": str(file_path.resolve()),
                     "parse_config": parse_config,
-                    "cached_at": time.time(),
-                    "cache_version": "1.0",
+                    "cached_at": now,
+                    "last_access": now,
+                    "cache_version": "3.0",
                 }
             }
+            if preflight is not None:
+                cache_data[cache_key]["preflight"] = preflight
+
+            usage = await self._get_parse_cache_usage()
+            previous = await self.parse_cache.get_by_id(cache_key)
             await self.parse_cache.upsert(cache_data)
-            # Ensure data is persisted to disk
-            await self.parse_cache.index_done_callback()
-            self.logger.info(f"Stored parsing result in cache: {cache_key}")
+            self.parse_cache_stats["stores"] += 1
+            if previous:
+                usage["entries"] -= 1
+                usage["bytes"] -= previous.get("blob_size", 0)
+            usage["entries"] += 1
+            usage["bytes"] += blob_size
+
+            if self._parse_cache_over_budget(usage):
+                await self._evict_parse_cache(keep=cache_key)
+            await self._flush_parse_cache()
+            self.logger.info(
+                f"Stored parsing result in cache: {cache_key} ({blob_size / 1024:.1f} KB)"
+            )
         except Exception as e:
             self.logger.warning(f"Error storing to parse cache: {e}")
 
+    def _get_parse_cache_blob_dir(self) -> Path:
+        """Directory holding the compressed content lists of the parse cache"""
+        blob_dir = getattr(self, "_parse_cache_blob_dir", None)
+        if blob_dir is None:
+            blob_dir = Path(self.working_dir) / "parse_cache_blobs"
+        return blob_dir
+
+    @staticmethod
+    def _write_parse_cache_blob(
+        blob_path: Path, content_list: List[Dict[str, Any]]
+    ) -> int:
+        """Write a zlib-compressed JSON content list atomically and return its size"""
+        data = zlib.compress(
+            json.dumps(content_list, ensure_ascii=False).encode("utf-8"), 6
+        )
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(f".{blob_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, blob_path)
+        return len(data)
+
+    @staticmethod
+    def _read_parse_cache_blob(blob_path: Path) -> List[Dict[str, Any]]:
+        """Read a content list written by _write_parse_cache_blob"""
+        with open(blob_path, "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+    @staticmethod
+    def _cache_entry(cached_data: Dict[str, Any], **updates) -> Dict[str, Any]:
+        """Strip the fields KV storages add on read so an entry can be written back"""
+        entry = {
+            k: v
+            for k, v in cached_data.items()
+            if k not in ("_id", "create_time", "update_time")
+        }
+        entry.update(updates)
+        return entry
+
+    @staticmethod
+    def _tally_parse_cache(data: Dict[str, Any]) -> Dict[str, int]:
+        """Count parse results, their blob bytes and path index entries"""
+        usage = {"entries": 0, "bytes": 0, "paths": 0}
+        for key, value in data.items():
+            if not isinstance(value, dict):
+                continue
+            if "parse_config" in value:
+                usage["entries"] += 1
+                usage["bytes"] += value.get("blob_size", 0)
+            elif key.startswith("path-"):
+                usage["paths"] += 1
+        return usage
+
+    async def _get_parse_cache_usage(self) -> Dict[str, int]:
+        """
+        Return the in-memory parse cache tallies, scanning the storage once
+
+        Stores and evictions keep the tallies current; every eviction pass
+        rescans, which also corrects drift from other users of a shared cache.
+        """
+        if self._parse_cache_usage is None:
+            self._parse_cache_usage = self._tally_parse_cache(
+                await self.parse_cache.get_all()
+            )
+        return self._parse_cache_usage
+
+    def _parse_cache_path_budget(self, result_entries: int) -> int:
+        """Path index entries kept after an eviction pass"""
+        max_entries = self.config.parse_cache_max_entries
+        return max(max_entries if max_entries > 0 else result_entries, 1)
+
+    def _parse_cache_over_budget(self, usage: Dict[str, int]) -> bool:
+        """Whether the tallies call for an eviction pass"""
+        max_entries = self.config.parse_cache_max_entries
+        max_bytes = self.config.parse_cache_max_mb * 1024 * 1024
+        if max_entries <= 0 and max_bytes <= 0:
+            return False
+        return (
+            (max_entries > 0 and usage["entries"] > max_entries)
+            or (max_bytes > 0 and usage["bytes"] > max_bytes)
+            # Path entries are trimmed with slack so passes stay infrequent
+            or usage["paths"] > 2 * self._parse_cache_path_budget(usage["entries"])
+        )
+
+    async def _evict_parse_cache(self, keep: Optional[str] = None) -> None:
+        """
+        Evict least recently used parse results and stale path index entries
+
+        Results over budget are evicted down to 90% of the entry and byte
+        limits, so the full scan of a pass is amortized over many stores. Path
+        index entries are dropped when their file is gone or changed, and the
+        oldest beyond the path budget are dropped as well.
+
+        Args:
+            keep: Cache key that must not be evicted (the entry just stored)
+        """
+        max_entries = self.config.parse_cache_max_entries
+        max_bytes = self.config.parse_cache_max_mb * 1024 * 1024
+        if max_entries <= 0 and max_bytes <= 0:
+            return
+
+        data = await self.parse_cache.get_all()
+        entries = [
+            (key, value)
+            for key, value in data.items()
+            if isinstance(value, dict) and "parse_config" in value
+        ]
+        paths = [
+            (key, value)
+            for key, value in data.items()
+            if isinstance(value, dict)
+            and "parse_config" not in value
+            and key.startswith("path-")
+        ]
+        total_bytes = sum(value.get("blob_size", 0) for _, value in entries)
+        entries.sort(
+            key=lambda item: item[1].get("last_access", item[1].get("cached_at", 0))
+        )
+
+        target_entries = int(max_entries * 0.9)
+        target_bytes = int(max_bytes * 0.9)
+        over_entries = max_entries > 0 and len(entries) > max_entries
+        over_bytes = max_bytes > 0 and total_bytes > max_bytes
+
+        evicted = []
+        remaining = len(entries)
+        for key, value in entries if over_entries or over_bytes else []:
+            if not (
+                (max_entries > 0 and remaining > target_entries)
+                or (max_bytes > 0 and total_bytes > target_bytes)
+            ):
+                break
+            if key == keep:
+                continue
+            evicted.append((key, value.get("blob")))
+            remaining -= 1
+            total_bytes -= value.get("blob_size", 0)
+
+        def stale_paths() -> List[str]:
+            stale = []
+            for key, value in paths:
+                try:
+                    stat = os.stat(value.get("file_path", ""))
+                except OSError:
+                    stale.append(key)
+                    continue
+                if (
+                    stat.st_size != value.get("size")
+                    or stat.st_mtime_ns != value.get("mtime_ns")
+                ):
+                    stale.append(key)
+            return stale
+
+        evicted_paths = set(await asyncio.to_thread(stale_paths))
+        live_paths = sorted(
+            (item for item in paths if item[0] not in evicted_paths),
+            key=lambda item: item[1].get("indexed_at", 0),
+        )
+        excess = len(live_paths) - self._parse_cache_path_budget(remaining)
+        evicted_paths.update(key for key, _ in live_paths[: max(0, excess)])
+
+        if evicted or evicted_paths:
+            await self.parse_cache.delete(
+                [key for key, _ in evicted] + sorted(evicted_paths)
+            )
+        self._parse_cache_usage = {
+            "entries": remaining,
+            "bytes": total_bytes,
+            "paths": len(paths) - len(evicted_paths),
+        }
+        if not evicted and not evicted_paths:
+            return
+
+        blob_dir = self._get_parse_cache_blob_dir()
+
+        def remove_blobs():
+            for _, blob_name in evicted:
+                if blob_name:
+                    try:
+                        (blob_dir / blob_name).unlink()
+                    except FileNotFoundError:
+                        pass
+
+        await asyncio.to_thread(remove_blobs)
+        self.parse_cache_stats["evictions"] += len(evicted)
+        self.logger.info(
+            f"Evicted {len(evicted)} parse cache entries and {len(evicted_paths)} path "
+            f"index entries ({remaining} entries, {total_bytes / 1024 / 1024:.1f} MB remain)"
+        )
+
+    async def _flush_parse_cache(self, force: bool = False) -> None:
+        """
+        Persist the parse cache KV, at most once per flush interval
+
+        Writing the KV re-serializes the whole namespace, so stores and LRU
+        updates in quick succession are batched. The storage is also flushed
+        when it is finalized.
+
+        Args:
+            force: Flush even if the last flush was recent
+        """
+        now = time.time()
+        if (
+            not force
+            and now - self._parse_cache_last_flush
+            < self.config.parse_cache_flush_interval
+        ):
+            return
+        self._parse_cache_last_flush = now
+        await self.parse_cache.index_done_callback()
+
     async def parse_document(
         self,
         file_path: str,
@@ -298,7 +708,7 @@ class ProcessorMixin:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         # Generate cache key based on file and configuration
-        cache_key = self._generate_cache_key(file_path, parse_method, **kwargs)
+        cache_key = await self._generate_cache_key(file_path, parse_method, **kwargs)
 
         # Check cache first
         cached_result = await self._get_cached_result(
@@ -315,33 +725,58 @@ class ProcessorMixin:
 
         # Choose appropriate parsing method based on file extension
         ext = file_path.suffix.lower()
+        preflight = None
 
         try:
-            doc_parser = (
-                DoclingParser() if self.config.parser == "docling" else MineruParser()
-            )
+            doc_parser = get_parser(self.config.parser)
 
             # Log parser and method information
             self.logger.info(
                 f"Using {self.config.parser} parser with method: {parse_method}"
             )
 
-            if ext in [".pdf"]:
+            native_parser = self._get_native_parser(ext)
+            if native_parser is not None:
+                self.logger.info(
+                    f"Parsing {ext} file natively with {type(native_parser).__name__}, "
+                    "without PDF conversion..."
+                )
+                content_list = await asyncio.to_thread(
+                    native_parser.parse_document,
+                    file_path,
+                    output_dir=output_dir,
+                )
+            elif ext in [".pdf"]:
                 self.logger.info("Detected PDF file, using parser for PDF...")
                 # Get API settings from config if available
                 use_api = getattr(self.config, 'mineru_use_api', False)
                 api_url = getattr(self.config, 'mineru_api_url', None)
                 api_key = getattr(self.config, 'mineru_api_key', None)
 
-                content_list = await doc_parser.parse_pdf(
-                    pdf_path=file_path,
-                    output_dir=output_dir,
-                    method=parse_method,
-                    use_api=use_api,
-                    api_url=api_url,
-                    api_key=api_key,
-                    **kwargs,
-                )
+                if isinstance(doc_parser, MineruParser):
+                    preflight = await self._preflight_pdf(
+                        file_path, parse_method, **kwargs
+                    )
+                    content_list = await doc_parser.parse_pdf(
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        use_api=use_api,
+                        api_url=api_url,
+                        api_key=api_key,
+                        shard_pages=self.config.mineru_shard_pages,
+                        max_shard_workers=self.config.mineru_max_shard_workers,
+                        page_plan=preflight["ranges"] if preflight else None,
+                        **kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_pdf,
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        **kwargs,
+                    )
             elif ext in [
                 ".jpg",
                 ".jpeg",
@@ -359,7 +794,8 @@ class ProcessorMixin:
                 api_key = getattr(self.config, 'mineru_api_key', None)
 
                 # Use the selected parser's image parsing capability
-                if hasattr(doc_parser, "parse_image"):
+                parse_image = getattr(doc_parser, "parse_image", None)
+                if asyncio.iscoroutinefunction(parse_image):
                     content_list = await doc_parser.parse_image(
                         image_path=file_path,
                         output_dir=output_dir,
@@ -368,6 +804,14 @@ class ProcessorMixin:
                         api_key=api_key,
                         **kwargs,
                     )
+                elif parse_image is not None:
+                    # Synchronous parsers take no cloud API settings
+                    content_list = await asyncio.to_thread(
+                        parse_image,
+                        image_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
                 else:
                     # Fallback to MinerU for image parsing if current parser doesn't support it
                     self.logger.warning(
@@ -395,24 +839,39 @@ class ProcessorMixin:
                 self.logger.info(
                     "Detected Office or HTML document, using parser for Office/HTML..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_office_doc,
-                    doc_path=file_path,
-                    output_dir=output_dir,
-                    **kwargs,
-                )
+                if asyncio.iscoroutinefunction(doc_parser.parse_office_doc):
+                    content_list = await doc_parser.parse_office_doc(
+                        doc_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_office_doc,
+                        doc_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
             else:
                 # For other or unknown formats, use generic parser
                 self.logger.info(
                     f"Using generic parser for {ext} file (method={parse_method})..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_document,
-                    file_path=file_path,
-                    method=parse_method,
-                    output_dir=output_dir,
-                    **kwargs,
-                )
+                if asyncio.iscoroutinefunction(doc_parser.parse_document):
+                    content_list = await doc_parser.parse_document(
+                        file_path=file_path,
+                        method=parse_method,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_document,
+                        file_path=file_path,
+                        method=parse_method,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
 
         except MineruExecutionError as e:
             self.logger.error(f"Mineru command failed: {e}")
@@ -434,7 +893,13 @@ class ProcessorMixin:
 
         # Store result in cache
         await self._store_cached_result(
-            cache_key, content_list, doc_id, file_path, parse_method, **kwargs
+            cache_key,
+            content_list,
+            doc_id,
+            file_path,
+            parse_method,
+            preflight=preflight,
+            **kwargs,
         )
 
         # Display content statistics if requested
@@ -450,11 +915,225 @@ class ProcessorMixin:
                     if isinstance(block_type, str):
                         block_types[block_type] = block_types.get(block_type, 0) + 1
 
-            self.logger.info("* Content block types:")
-            for block_type, count in block_types.items():
-                self.logger.info(f"  - {block_type}: {count}")
+            self.logger.info("* Content block types:")
+            for block_type, count in block_types.items():
+                self.logger.info(f"  - {block_type}: {count}")
+
+        return content_list, doc_id
+
+    @staticmethod
+    def _group_blocks_by_page(
+        content_list: List[Dict[str, Any]],
+    ) -> List[List[Dict[str, Any]]]:
+        """Split a content list into runs of consecutive blocks on the same page"""
+        batches: List[List[Dict[str, Any]]] = []
+        current_page = object()
+        for block in content_list:
+            page_idx = block.get("page_idx") if isinstance(block, dict) else None
+            if not batches or page_idx != current_page:
+                batches.append([])
+                current_page = page_idx
+            batches[-1].append(block)
+        return batches
+
+    async def parse_document_stream(
+        self,
+        file_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = None,
+        **kwargs,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Parse document and yield content blocks page by page as they become available
+
+        With MinerU and PDF sharding enabled (config.mineru_shard_pages), pages of
+        early shards are yielded while later shards are still being parsed.
+        Otherwise the document is parsed as a whole (with caching) and then
+        yielded page by page. The complete result is stored in the parse cache.
+
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory (defaults to config.parser_output_dir)
+            parse_method: Parse method (defaults to config.parse_method)
+            display_stats: Whether to display content statistics (defaults to config.display_content_stats)
+            **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
+
+        Yields:
+            List[Dict[str, Any]]: Content blocks of one page, in document order
+        """
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        can_stream = (
+            self.config.parser == "mineru"
+            and file_path.suffix.lower() == ".pdf"
+            and not self.config.mineru_use_api
+            and self.config.mineru_shard_pages > 0
+        )
+        if not can_stream:
+            content_list, _ = await self.parse_document(
+                str(file_path), output_dir, parse_method, display_stats, **kwargs
+            )
+            for batch in self._group_blocks_by_page(content_list):
+                yield batch
+            return
+
+        cache_key = await self._generate_cache_key(file_path, parse_method, **kwargs)
+        cached_result = await self._get_cached_result(
+            cache_key, file_path, parse_method, **kwargs
+        )
+        if cached_result is not None:
+            self.logger.info(f"Using cached parsing result for: {file_path}")
+            for batch in self._group_blocks_by_page(cached_result[0]):
+                yield batch
+            return
+
+        self.logger.info(f"Starting streaming document parsing: {file_path}")
+        preflight = await self._preflight_pdf(file_path, parse_method, **kwargs)
+        content_list = []
+        async for shard in MineruParser().parse_pdf_stream(
+            file_path,
+            output_dir=output_dir,
+            method=parse_method,
+            shard_pages=self.config.mineru_shard_pages,
+            max_shard_workers=self.config.mineru_max_shard_workers,
+            page_plan=preflight["ranges"] if preflight else None,
+            **kwargs,
+        ):
+            content_list.extend(shard)
+            for batch in self._group_blocks_by_page(shard):
+                yield batch
+
+        self.logger.info(
+            f"Parsing {file_path} complete! Extracted {len(content_list)} content blocks"
+        )
+        if not content_list:
+            raise ValueError("Parsing failed: No content was extracted")
+
+        doc_id = self._generate_content_based_doc_id(content_list)
+        await self._store_cached_result(
+            cache_key,
+            content_list,
+            doc_id,
+            file_path,
+            parse_method,
+            preflight=preflight,
+            **kwargs,
+        )
+
+    async def parse_documents_grouped(
+        self,
+        file_paths: List[str],
+        output_dir: str = None,
+        parse_method: str = None,
+        group_size: int = None,
+        max_concurrent_groups: int = 1,
+        **kwargs,
+    ) -> Dict[str, str]:
+        """
+        Pre-parse files in groups that share one MinerU invocation
+
+        Results are stored in the parse cache, so a following `parse_document`
+        call for each file is a cache hit. Files that are already cached are
+        skipped; files that fail inside a group are left for `parse_document`
+        to retry on their own. PDFs that `parse_document` would pre-flight or
+        shard are not grouped, since a group parses every file as a whole with
+        the requested method and its result would not match their cache key.
+
+        Args:
+            file_paths: Files to parse
+            output_dir: Output directory (defaults to config.parser_output_dir)
+            parse_method: Parse method (defaults to config.parse_method)
+            group_size: Files per invocation (defaults to config.mineru_group_size)
+            max_concurrent_groups: Number of groups parsed at the same time
+            **kwargs: Additional parameters for parser (e.g., lang, device, backend)
+
+        Returns:
+            Dict[str, str]: Errors keyed by file path for files not parsed in a group
+        """
+        from raganything.mineru_worker import get_mineru_worker_pool
+
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if group_size is None:
+            group_size = self.config.mineru_group_size
+
+        # Grouping only pays off for the MinerU CLI path
+        if (
+            group_size <= 1
+            or self.config.parser != "mineru"
+            or self.config.mineru_use_api
+            or get_mineru_worker_pool() is not None
+        ):
+            return {}
+
+        pending = []
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            cache_key = await self._generate_cache_key(file_path, parse_method, **kwargs)
+            cached = await self._get_cached_result(
+                cache_key, file_path, parse_method, **kwargs
+            )
+            if cached is None and not await self._parses_in_ranges(
+                file_path, parse_method, **kwargs
+            ):
+                pending.append(file_path)
+
+        groups = [
+            group
+            for group in MineruParser.make_file_groups(pending, group_size)
+            if len(group) > 1
+        ]
+        if not groups:
+            return {}
+
+        self.logger.info(
+            f"Pre-parsing {sum(len(g) for g in groups)} files in {len(groups)} MinerU groups"
+        )
+
+        doc_parser = MineruParser()
+        semaphore = asyncio.Semaphore(max(1, max_concurrent_groups))
+        errors: Dict[str, str] = {}
+
+        async def parse_group(group: List[Path]):
+            async with semaphore:
+                try:
+                    results, group_errors = await doc_parser.parse_file_group(
+                        group,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        retry_failed=False,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"MinerU group invocation failed: {e}")
+                    errors.update({str(p): str(e) for p in group})
+                    return
+
+                errors.update(group_errors)
+                for file_path in group:
+                    content_list = results.get(str(file_path))
+                    if not content_list:
+                        continue
+                    cache_key = await self._generate_cache_key(
+                        file_path, parse_method, **kwargs
+                    )
+                    doc_id = self._generate_content_based_doc_id(content_list)
+                    await self._store_cached_result(
+                        cache_key, content_list, doc_id, file_path, parse_method, **kwargs
+                    )
 
-        return content_list, doc_id
+        await asyncio.gather(*(parse_group(group) for group in groups))
+        return errors
 
     async def _process_multimodal_content(
         self,
@@ -703,8 +1382,12 @@ class ProcessorMixin:
         await self._mark_multimodal_processing_complete(doc_id)
 
     async def _process_multimodal_content_batch_type_aware(
-        self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
-    ):
+        self,
+        multimodal_items: List[Dict[str, Any]],
+        file_path: str,
+        doc_id: str,
+        indices: Optional[List[int]] = None,
+    ) -> Dict[int, str]:
         """
         Type-aware batch processing that selects correct processors based on content type.
         This is the corrected implementation that handles different modality types properly.
@@ -713,10 +1396,17 @@ class ProcessorMixin:
             multimodal_items: List of multimodal items with different types
             file_path: File path for citation
             doc_id: Document ID for proper association
+            indices: Position of each item among all of the document's multimodal
+                items, when only a subset is processed (defaults to 0..n-1)
+
+        Returns:
+            Dict[int, str]: Chunk ID created for each successfully processed item index
         """
         if not multimodal_items:
             self.logger.debug("No multimodal content to process")
-            return
+            return {}
+        if indices is None:
+            indices = list(range(len(multimodal_items)))
 
         # Get existing chunks count for proper order indexing
         try:
@@ -727,124 +1417,513 @@ class ProcessorMixin:
         except Exception:
             existing_chunks_count = 0
 
+        multimodal_data_list = await self._describe_multimodal_items(
+            list(zip(indices, multimodal_items)), file_path, existing_chunks_count
+        )
+
+        if not multimodal_data_list:
+            self.logger.warning("No valid multimodal descriptions generated")
+            return {}
+
+        self.logger.info(
+            f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items using correct processors"
+        )
+
+        return await self._store_multimodal_descriptions_type_aware(
+            multimodal_data_list, file_path, doc_id
+        )
+
+    async def _describe_multimodal_items(
+        self,
+        schedule: List[Tuple[int, Dict[str, Any]]],
+        file_path: str,
+        chunk_order_offset: int = 0,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate descriptions for multimodal items with all configured optimizations
+
+        Near-duplicate images share one caption (``enable_image_dedup``),
+        images, equations and small tables are packed into batched requests,
+        and the context-first prompt layout schedules items page by page.
+
+        Args:
+            schedule: (index, item) pairs of the multimodal items to describe
+            file_path: File path for citation
+            chunk_order_offset: Number of chunks that precede multimodal chunks
+            semaphore: Limits concurrent model requests; defaults to a new one
+                sized by LightRAG's ``max_parallel_insert``
+
+        Returns:
+            List[Dict[str, Any]]: Description data of the described items, by index
+        """
+        if not schedule:
+            return []
+        existing_chunks_count = chunk_order_offset
+
+        # Caption one representative per group of near-duplicate images
+        duplicates: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        if self.config.enable_image_dedup:
+            schedule, duplicates = await self._group_duplicate_images(schedule)
+
         # Use LightRAG's concurrency control
-        semaphore = asyncio.Semaphore(getattr(self.lightrag, "max_parallel_insert", 2))
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(
+                getattr(self.lightrag, "max_parallel_insert", 2)
+            )
 
         # Progress tracking variables
-        total_items = len(multimodal_items)
+        total_items = len(schedule)
         completed_count = 0
         progress_lock = asyncio.Lock()
 
         # Log processing start
         self.logger.info(f"Starting to process {total_items} multimodal content items")
 
+        async def advance_progress():
+            """Count one finished item and log progress every 10%"""
+            nonlocal completed_count
+            async with progress_lock:
+                completed_count += 1
+                if (
+                    completed_count % max(1, total_items // 10) == 0
+                    or completed_count == total_items
+                ):
+                    progress_percent = (completed_count / total_items) * 100
+                    self.logger.info(
+                        f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
+                    )
+
         # Stage 1: Concurrent generation of descriptions using correct processors for each type
         async def process_single_item_with_correct_processor(
-            item: Dict[str, Any], index: int, file_path: str
+            item: Dict[str, Any],
+            index: int,
+            file_path: str,
+            wait_for: Optional[asyncio.Event] = None,
+            warms: Optional[asyncio.Event] = None,
         ):
             """Process single item using the correct processor for its type"""
-            nonlocal completed_count
+            try:
+                if wait_for is not None:
+                    await wait_for.wait()
+                return await process_item(item, index, file_path)
+            finally:
+                if warms is not None:
+                    warms.set()
+
+        async def process_item(item: Dict[str, Any], index: int, file_path: str):
+            """Generate one description within the concurrency limit"""
             async with semaphore:
+                content_type = item.get("type", "unknown")
                 try:
-                    content_type = item.get("type", "unknown")
-
-                    # Select the correct processor based on content type
-                    processor = get_processor_for_type(
-                        self.modal_processors, content_type
+                    result = await self._generate_multimodal_description(
+                        item, index, file_path, existing_chunks_count
                     )
-
-                    if not processor:
-                        self.logger.warning(
-                            f"No processor found for type: {content_type}"
-                        )
-                        return None
-
-                    item_info = {
-                        "page_idx": item.get("page_idx", 0),
-                        "index": index,
-                        "type": content_type,
-                    }
-
-                    # Call the correct processor's description generation method
-                    (
-                        description,
-                        entity_info,
-                    ) = await processor.generate_description_only(
-                        modal_content=item,
-                        content_type=content_type,
-                        item_info=item_info,
-                        entity_name=None,  # Let LLM auto-generate
-                    )
-
-                    # Update progress (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
-                    return {
-                        "index": index,
-                        "content_type": content_type,
-                        "description": description,
-                        "entity_info": entity_info,
-                        "original_item": item,
-                        "item_info": item_info,
-                        "chunk_order_index": existing_chunks_count + index,
-                        "processor": processor,  # Keep reference to the processor used
-                        "file_path": file_path,  # Add file_path to the result
-                    }
+                    await advance_progress()
+                    return result
 
                 except Exception as e:
-                    # Update progress even on error (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
+                    # Update progress even on error
+                    await advance_progress()
                     self.logger.error(
                         f"Error generating description for {content_type} item {index}: {e}"
                     )
                     return None
 
-        # Process all items concurrently with correct processors
-        tasks = [
-            asyncio.create_task(
-                process_single_item_with_correct_processor(item, i, file_path)
+        async def process_group(
+            content_type: str, group: List[Tuple[int, Dict[str, Any]]]
+        ):
+            """Describe a group of items of one type with a single batched request"""
+            processor = get_processor_for_type(self.modal_processors, content_type)
+            async with semaphore:
+                try:
+                    described = await processor.generate_descriptions_batch(
+                        [(item, self._get_item_info(item, index)) for index, item in group],
+                        **batch_options.get(content_type, {}),
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Batched {content_type} analysis failed: {e}")
+                    described = [None] * len(group)
+
+            group_results = []
+            fallbacks = []
+            for (index, item), description in zip(group, described):
+                if description is None:
+                    fallbacks.append((index, item))
+                    continue
+                group_results.append(
+                    self._build_description_data(
+                        item,
+                        index,
+                        file_path,
+                        existing_chunks_count,
+                        processor,
+                        *description,
+                    )
+                )
+                await advance_progress()
+
+            # Oversized items and items missing from the response
+            group_results.extend(
+                await asyncio.gather(
+                    *(process_item(item, index, file_path) for index, item in fallbacks)
+                )
             )
-            for i, item in enumerate(multimodal_items)
-        ]
+            return group_results
+
+        # Pack images, equations and small tables into batched requests
+        groups, schedule = self._plan_description_batches(schedule)
+        batch_options = {
+            "image": {"max_image_kb": self.config.image_caption_batch_max_kb}
+        }
+        calls_before = {
+            name: processor.prompt_stats["calls"]
+            for name, processor in self.modal_processors.items()
+        }
+        stage_start = time.time()
+
+        # With the context-first prompt layout, items on the same page share a
+        # prompt prefix: schedule them page by page and send the first item of
+        # each page alone so its siblings hit the provider's prompt cache
+        page_warmed: Dict[Any, asyncio.Event] = {}
+        context_first = self.config.prompt_layout == "context_first"
+        if context_first:
+            schedule.sort(key=lambda pair: pair[1].get("page_idx", 0))
+
+        tasks = []
+        for i, item in schedule:
+            wait_for = warms = None
+            if context_first:
+                page = item.get("page_idx", 0)
+                if page in page_warmed:
+                    wait_for = page_warmed[page]
+                else:
+                    warms = page_warmed[page] = asyncio.Event()
+            tasks.append(
+                asyncio.create_task(
+                    process_single_item_with_correct_processor(
+                        item, i, file_path, wait_for, warms
+                    )
+                )
+            )
+        tasks.extend(
+            asyncio.create_task(process_group(content_type, group))
+            for content_type, group in groups
+        )
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Filter successful results
         multimodal_data_list = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.error(f"Task failed: {result}")
+        for task_result in results:
+            if isinstance(task_result, Exception):
+                self.logger.error(f"Task failed: {task_result}")
                 continue
-            if result is not None:
+            for result in (
+                task_result if isinstance(task_result, list) else [task_result]
+            ):
+                if result is None:
+                    continue
                 multimodal_data_list.append(result)
+                for member_index, member_item in duplicates.pop(result["index"], []):
+                    multimodal_data_list.append(
+                        self._fan_out_description(result, member_index, member_item)
+                    )
 
-        if not multimodal_data_list:
-            self.logger.warning("No valid multimodal descriptions generated")
-            return
+        # Duplicates of a representative that could not be described are
+        # captioned one by one, as without deduplication
+        orphans = [member for members in duplicates.values() for member in members]
+        if orphans:
+            self.logger.warning(
+                f"{len(duplicates)} duplicate-image representatives were not described; "
+                f"captioning their {len(orphans)} duplicates individually"
+            )
+            total_items += len(orphans)
+            multimodal_data_list.extend(
+                result
+                for result in await asyncio.gather(
+                    *(process_item(item, index, file_path) for index, item in orphans)
+                )
+                if result is not None
+            )
+        multimodal_data_list.sort(key=lambda data: data["index"])
 
+        # Compare model calls with the one-call-per-item baseline
+        elapsed = time.time() - stage_start
+        model_calls = sum(
+            processor.prompt_stats["calls"] - calls_before[name]
+            for name, processor in self.modal_processors.items()
+        )
         self.logger.info(
-            f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items using correct processors"
+            f"Described {total_items} multimodal items with {model_calls} model calls "
+            f"(one-per-item baseline: {total_items}) in {elapsed:.2f}s "
+            f"({total_items / max(elapsed, 1e-6):.2f} items/s)"
+        )
+        return multimodal_data_list
+
+    def _plan_description_batches(
+        self, schedule: List[Tuple[int, Dict[str, Any]]]
+    ) -> Tuple[
+        List[Tuple[str, List[Tuple[int, Dict[str, Any]]]]],
+        List[Tuple[int, Dict[str, Any]]],
+    ]:
+        """
+        Split items into groups described by one batched request each
+
+        Images are grouped by ``image_caption_batch_size``; equations and
+        tables with a body of at most ``batch_table_max_chars`` characters are
+        grouped by ``llm_analysis_batch_size``. Types with a batch size of 1, and
+        processors without ``generate_descriptions_batch``, are left alone.
+
+        Args:
+            schedule: (index, item) pairs of the multimodal items to process
+
+        Returns:
+            Tuple of the (content_type, pairs) groups, and the pairs left for
+            one request per item
+        """
+        batch_sizes = {
+            "image": self.config.image_caption_batch_size,
+            "equation": self.config.llm_analysis_batch_size,
+            "table": self.config.llm_analysis_batch_size,
+        }
+
+        batchable: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        remaining = []
+        for index, item in schedule:
+            content_type = item.get("type", "unknown")
+            processor = self.modal_processors.get(content_type)
+            if (
+                batch_sizes.get(content_type, 1) > 1
+                and hasattr(processor, "generate_descriptions_batch")
+                and (
+                    content_type != "table"
+                    or 0
+                    < len(str(item.get("table_body", "")).strip())
+                    <= self.config.batch_table_max_chars
+                )
+            ):
+                batchable.setdefault(content_type, []).append((index, item))
+            else:
+                remaining.append((index, item))
+
+        groups = []
+        for content_type, pairs in batchable.items():
+            batch_size = batch_sizes[content_type]
+            groups.extend(
+                (content_type, pairs[start : start + batch_size])
+                for start in range(0, len(pairs), batch_size)
+            )
+        return groups, remaining
+
+    async def _group_duplicate_images(
+        self, schedule: List[Tuple[int, Dict[str, Any]]]
+    ) -> Tuple[
+        List[Tuple[int, Dict[str, Any]]], Dict[int, List[Tuple[int, Dict[str, Any]]]]
+    ]:
+        """
+        Group near-duplicate images so that only one per group is captioned
+
+        Images are compared by perceptual hash within ``image_dedup_max_distance``
+        bits. Only images with the same captions, footnotes and a similar
+        aspect ratio are grouped, so that a shared description stays accurate.
+
+        Args:
+            schedule: (index, item) pairs of the multimodal items to process
+
+        Returns:
+            Tuple of the pairs to caption, and for each representative index
+            the (index, item) pairs that reuse its description
+        """
+        from raganything.image_preprocessor import (
+            get_image_preprocessor,
+            hamming_distance,
+        )
+
+        preprocessor = get_image_preprocessor()
+
+        def hash_images():
+            hashes = {}
+            for index, item in schedule:
+                image_path = item.get("img_path")
+                if item.get("type") != "image" or not image_path:
+                    continue
+                try:
+                    hashes[index] = preprocessor.perceptual_hash(image_path)
+                except OSError:
+                    continue
+            return hashes
+
+        hashes = await asyncio.to_thread(hash_images)
+        max_distance = self.config.image_dedup_max_distance
+
+        kept = []
+        duplicates: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        # (captions, footnotes) -> [(representative index, hash, aspect ratio)]
+        representatives: Dict[str, List[Tuple[int, int, float]]] = {}
+        for index, item in schedule:
+            signature = hashes.get(index)
+            if signature is None:
+                kept.append((index, item))
+                continue
+
+            phash, aspect_ratio = signature
+            group_key = json.dumps(
+                [
+                    item.get("image_caption", item.get("img_caption", [])),
+                    item.get("image_footnote", item.get("img_footnote", [])),
+                ],
+                sort_keys=True,
+                default=str,
+            )
+            candidates = representatives.setdefault(group_key, [])
+            for rep_index, rep_hash, rep_aspect in candidates:
+                if (
+                    abs(aspect_ratio - rep_aspect) <= 0.1 * rep_aspect
+                    and hamming_distance(phash, rep_hash) <= max_distance
+                ):
+                    duplicates.setdefault(rep_index, []).append((index, item))
+                    break
+            else:
+                candidates.append((index, phash, aspect_ratio))
+                kept.append((index, item))
+
+        duplicate_count = sum(len(members) for members in duplicates.values())
+        if duplicate_count:
+            self.logger.info(
+                f"Grouped {duplicate_count} near-duplicate images under "
+                f"{len(duplicates)} representatives"
+            )
+        return kept, duplicates
+
+    def _fan_out_description(
+        self,
+        representative: Dict[str, Any],
+        index: int,
+        item: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Reuse a representative's description for a near-duplicate image
+
+        The duplicate keeps its own entity and chunk: the entity name is made
+        unique with the item index, and the chunk is built from its own item.
+
+        Args:
+            representative: Description data of the captioned representative
+            index: Position of the duplicate among the document's multimodal items
+            item: The duplicate multimodal item
+
+        Returns:
+            Description data for the duplicate
+        """
+        entity_info = dict(representative["entity_info"])
+        entity_info["entity_name"] = f"{entity_info['entity_name']} #{index}"
+        chunk_order_offset = representative["chunk_order_index"] - representative["index"]
+        return {
+            **representative,
+            "index": index,
+            "entity_info": entity_info,
+            "original_item": item,
+            "item_info": self._get_item_info(item, index),
+            "chunk_order_index": chunk_order_offset + index,
+        }
+
+    async def _generate_multimodal_description(
+        self,
+        item: Dict[str, Any],
+        index: int,
+        file_path: str,
+        chunk_order_offset: int = 0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate the description of one multimodal item with the processor for its type
+
+        Args:
+            item: Multimodal content item
+            index: Position of the item among the document's multimodal items
+            file_path: File path for citation
+            chunk_order_offset: Number of chunks that precede multimodal chunks
+
+        Returns:
+            Optional[Dict[str, Any]]: Description data for the later stages, or None
+            if no processor handles the item's type
+        """
+        content_type = item.get("type", "unknown")
+
+        # Select the correct processor based on content type
+        processor = get_processor_for_type(self.modal_processors, content_type)
+
+        if not processor:
+            self.logger.warning(f"No processor found for type: {content_type}")
+            return None
+
+        # Call the correct processor's description generation method
+        description, entity_info = await processor.generate_description_only(
+            modal_content=item,
+            content_type=content_type,
+            item_info=self._get_item_info(item, index),
+            entity_name=None,  # Let LLM auto-generate
+        )
+
+        return self._build_description_data(
+            item,
+            index,
+            file_path,
+            chunk_order_offset,
+            processor,
+            description,
+            entity_info,
         )
 
+    @staticmethod
+    def _get_item_info(item: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Item information used for context extraction"""
+        return {
+            "page_idx": item.get("page_idx", 0),
+            "index": index,
+            "type": item.get("type", "unknown"),
+        }
+
+    def _build_description_data(
+        self,
+        item: Dict[str, Any],
+        index: int,
+        file_path: str,
+        chunk_order_offset: int,
+        processor,
+        description: str,
+        entity_info: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Assemble the description data consumed by the storage stages"""
+        return {
+            "index": index,
+            "content_type": item.get("type", "unknown"),
+            "description": description,
+            "entity_info": entity_info,
+            "original_item": item,
+            "item_info": self._get_item_info(item, index),
+            "chunk_order_index": chunk_order_offset + index,
+            "processor": processor,  # Keep reference to the processor used
+            "file_path": file_path,  # Add file_path to the result
+        }
+
+    async def _store_multimodal_descriptions_type_aware(
+        self,
+        multimodal_data_list: List[Dict[str, Any]],
+        file_path: str,
+        doc_id: str,
+    ) -> Dict[int, str]:
+        """
+        Turn generated descriptions into chunks, entities and relations (stages 2-6)
+
+        Args:
+            multimodal_data_list: Results of `_generate_multimodal_description`
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+
+        Returns:
+            Dict[int, str]: Chunk ID created for each item index
+        """
         # Stage 2: Convert to LightRAG chunks format
         lightrag_chunks = self._convert_to_lightrag_chunks_type_aware(
             multimodal_data_list, file_path, doc_id
@@ -853,14 +1932,16 @@ class ProcessorMixin:
         # Stage 3: Store chunks to LightRAG storage
         await self._store_chunks_to_lightrag_storage_type_aware(lightrag_chunks)
 
+        # List the chunks on the document right away, so that deleting a
+        # document whose processing was interrupted also removes them
+        chunk_ids = list(lightrag_chunks.keys())
+        await self._update_doc_status_with_chunks_type_aware(doc_id, chunk_ids)
+
         # Stage 3.5: Store multimodal main entities to entities_vdb and full_entities
         await self._store_multimodal_main_entities(
             multimodal_data_list, lightrag_chunks, file_path, doc_id
         )
 
-        # Track chunk IDs for doc_status update
-        chunk_ids = list(lightrag_chunks.keys())
-
         # Stage 4: Use LightRAG's batch entity relation extraction
         chunk_results = await self._batch_extract_entities_lightrag_style_type_aware(
             lightrag_chunks
@@ -876,8 +1957,15 @@ class ProcessorMixin:
             enhanced_chunk_results, file_path, doc_id
         )
 
-        # Stage 7: Update doc_status with integrated chunks_list
-        await self._update_doc_status_with_chunks_type_aware(doc_id, chunk_ids)
+        return {
+            data["index"]: compute_mdhash_id(
+                self._apply_chunk_template(
+                    data["content_type"], data["original_item"], data["description"]
+                ),
+                prefix="chunk-",
+            )
+            for data in multimodal_data_list
+        }
 
     def _convert_to_lightrag_chunks_type_aware(
         self, multimodal_data_list: List[Dict[str, Any]], file_path: str, doc_id: str
@@ -1450,6 +2538,8 @@ class ProcessorMixin:
         split_by_character: str | None = None,
         split_by_character_only: bool = False,
         doc_id: str | None = None,
+        stream: bool | None = None,
+        source_id: str | None = None,
         **kwargs,
     ):
         """
@@ -1463,6 +2553,10 @@ class ProcessorMixin:
             split_by_character: Optional character to split the text by
             split_by_character_only: If True, split only by the specified character
             doc_id: Optional document ID, if not provided will be generated from content
+            stream: Start multimodal captioning while the document is still being
+                parsed (defaults to config.stream_processing)
+            source_id: Stable identity of the document across versions for
+                incremental re-ingestion (defaults to the resolved file path)
             **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
         """
         # Ensure LightRAG is initialized
@@ -1475,6 +2569,27 @@ class ProcessorMixin:
             parse_method = self.config.parse_method
         if display_stats is None:
             display_stats = self.config.display_content_stats
+        if stream is None:
+            stream = self.config.stream_processing
+
+        # Incremental re-ingestion diffs the complete content list, so it does not stream
+        if stream and not self.config.incremental_reingest:
+            cache_key = await self._generate_cache_key(Path(file_path), parse_method, **kwargs)
+            cached_result = await self._get_cached_result(
+                cache_key, Path(file_path), parse_method, **kwargs
+            )
+            # A cached parse has nothing to overlap with
+            if cached_result is None:
+                await self._process_document_complete_streaming(
+                    file_path,
+                    output_dir=output_dir,
+                    parse_method=parse_method,
+                    split_by_character=split_by_character,
+                    split_by_character_only=split_by_character_only,
+                    doc_id=doc_id,
+                    **kwargs,
+                )
+                return
 
         self.logger.info(f"Starting complete document processing: {file_path}")
 
@@ -1483,6 +2598,19 @@ class ProcessorMixin:
             file_path, output_dir, parse_method, display_stats, **kwargs
         )
 
+        # Step 1.5: Only re-process what changed since the file's previous version
+        if self.config.incremental_reingest and doc_id is None:
+            await self._process_document_incremental(
+                file_path,
+                content_list,
+                content_based_doc_id,
+                split_by_character=split_by_character,
+                split_by_character_only=split_by_character_only,
+                source_id=source_id,
+            )
+            self.logger.info(f"Document {file_path} processing complete!")
+            return
+
         # Use provided doc_id or fall back to content-based doc_id
         if doc_id is None:
             doc_id = content_based_doc_id
@@ -1524,6 +2652,186 @@ class ProcessorMixin:
 
         self.logger.info(f"Document {file_path} processing complete!")
 
+    async def _process_document_complete_streaming(
+        self,
+        file_path: str,
+        output_dir: str,
+        parse_method: str,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        doc_id: str | None = None,
+        **kwargs,
+    ):
+        """
+        Streaming variant of `process_document_complete`
+
+        Blocks from `parse_document_stream` are collected into a growing content
+        list that serves as the context source. Multimodal items are pushed
+        through a bounded queue to description workers as soon as the pages
+        needed for their context have arrived, so VLM/LLM captioning overlaps
+        with parsing. Each worker takes every item waiting in the queue and
+        describes them together through `_describe_multimodal_items`, so image
+        deduplication, batched requests and context-first scheduling apply
+        within each such round. Text insertion needs the complete document (and its
+        content-based doc_id), so it starts when parsing ends and runs
+        alongside the remaining captioning. Chunk, entity and relation storage
+        (stages 2-6) runs last.
+
+        Args:
+            file_path: Path to the file to process
+            output_dir: Output directory
+            parse_method: Parse method
+            split_by_character: Optional character to split the text by
+            split_by_character_only: If True, split only by the specified character
+            doc_id: Optional document ID, if not provided will be generated from content
+            **kwargs: Additional parameters for parser
+        """
+        self.logger.info(f"Starting streaming document processing: {file_path}")
+
+        content_list: List[Dict[str, Any]] = []
+        # Processors read this list by reference, so it grows as pages arrive
+        if hasattr(self, "set_content_source_for_context"):
+            self.set_content_source_for_context(
+                content_list, self.config.content_format
+            )
+
+        # Items wait until the pages their context window needs have arrived
+        context_pages = (
+            self.config.context_window if self.config.context_mode == "page" else 0
+        )
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max(1, self.config.stream_buffer_size)
+        )
+        worker_count = max(1, getattr(self.lightrag, "max_parallel_insert", 2))
+        multimodal_items: List[Dict[str, Any]] = []
+        multimodal_data_list: List[Dict[str, Any]] = []
+
+        async def produce():
+            held_back: List[Tuple[int, Dict[str, Any]]] = []
+            try:
+                async for batch in self.parse_document_stream(
+                    file_path, output_dir, parse_method, **kwargs
+                ):
+                    content_list.extend(batch)
+                    last_page = max(
+                        (
+                            b.get("page_idx", 0)
+                            for b in batch
+                            if isinstance(b.get("page_idx"), int)
+                        ),
+                        default=0,
+                    )
+                    for block in batch:
+                        if block.get("type", "text") != "text":
+                            held_back.append((len(multimodal_items), block))
+                            multimodal_items.append(block)
+
+                    still_held = []
+                    for entry in held_back:
+                        if entry[1].get("page_idx", 0) + context_pages <= last_page:
+                            await queue.put(entry)
+                        else:
+                            still_held.append(entry)
+                    held_back = still_held
+
+                for entry in held_back:
+                    await queue.put(entry)
+            finally:
+                for _ in range(worker_count):
+                    await queue.put(None)
+
+        # Shared by all workers so that rounds do not multiply the concurrency
+        semaphore = asyncio.Semaphore(worker_count)
+
+        async def describe():
+            finished = False
+            while not finished:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                # Describe everything released so far in one round
+                schedule = [entry]
+                while not queue.empty():
+                    entry = queue.get_nowait()
+                    if entry is None:
+                        finished = True
+                        break
+                    schedule.append(entry)
+                try:
+                    results = await self._describe_multimodal_items(
+                        schedule, file_path, semaphore=semaphore
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        f"Error generating descriptions for {len(schedule)} multimodal items: {e}"
+                    )
+                    continue
+                multimodal_data_list.extend(results)
+
+        workers = [asyncio.create_task(describe()) for _ in range(worker_count)]
+        try:
+            # Step 1: Parse while workers caption multimodal items
+            await produce()
+
+            if doc_id is None:
+                doc_id = self._generate_content_based_doc_id(content_list)
+            text_content, _ = separate_content(content_list)
+
+            # Step 2: Insert text while the remaining items are captioned
+            if text_content.strip():
+                await insert_text_content(
+                    self.lightrag,
+                    input=text_content,
+                    file_paths=os.path.basename(file_path),
+                    split_by_character=split_by_character,
+                    split_by_character_only=split_by_character_only,
+                    ids=doc_id,
+                )
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        # Step 3: Store multimodal chunks, entities and relations
+        if not multimodal_items:
+            await self._mark_multimodal_processing_complete(doc_id)
+            self.logger.info(f"Document {file_path} processing complete!")
+            return
+
+        doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+        if doc_status and doc_status.get("metadata", {}).get("multimodal_processed"):
+            self.logger.info(
+                f"Document {doc_id} multimodal content is already processed"
+            )
+            return
+
+        self.logger.info(
+            f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items while parsing"
+        )
+        if multimodal_data_list:
+            existing_chunks_count = doc_status.get("chunks_count", 0) if doc_status else 0
+            multimodal_data_list.sort(key=lambda data: data["index"])
+            for data in multimodal_data_list:
+                data["chunk_order_index"] = existing_chunks_count + data["index"]
+
+            try:
+                await self._store_multimodal_descriptions_type_aware(
+                    multimodal_data_list, file_path, doc_id
+                )
+            except Exception as e:
+                self.logger.error(f"Error in multimodal processing: {e}")
+                self.logger.warning("Falling back to individual multimodal processing")
+                await self._process_multimodal_content_individual(
+                    multimodal_items, file_path, doc_id
+                )
+        else:
+            self.logger.warning("No valid multimodal descriptions generated")
+
+        await self._mark_multimodal_processing_complete(doc_id)
+        self.logger.info(f"Document {file_path} processing complete!")
+
     async def process_document_complete_lightrag_api(
         self,
         file_path: str,
@@ -88,6 +88,39 @@ Image details:
 
 Focus on providing accurate, detailed visual analysis that incorporates the context and would be useful for knowledge retrieval."""
 
+# Image analysis prompt with a stable prefix: instructions, then page context, then item fields
+PROMPTS[
+    "vision_prompt_context_first"
+] = """Please analyze the image described at the end of this message in detail, considering the surrounding context that follows. Provide a JSON response with the following structure:
+
+{{
+    "detailed_description": "A comprehensive and detailed visual description of the image following these guidelines:
+    - Describe the overall composition and layout
+    - Identify all objects, people, text, and visual elements
+    - Explain relationships between elements and how they relate to the surrounding context
+    - Note colors, lighting, and visual style
+    - Describe any actions or activities shown
+    - Include technical details if relevant (charts, diagrams, etc.)
+    - Reference connections to the surrounding content when relevant
+    - Always use specific names instead of pronouns",
+    "entity_info": {{
+        "entity_name": "the Entity Name given in the image details",
+        "entity_type": "image",
+        "summary": "concise summary of the image content, its significance, and relationship to surrounding content (max 100 words)"
+    }}
+}}
+
+Focus on providing accurate, detailed visual analysis that incorporates the context and would be useful for knowledge retrieval.
+
+Context from surrounding content:
+{context}
+
+Image details:
+- Entity Name: {entity_name}
+- Image Path: {image_path}
+- Captions: {captions}
+- Footnotes: {footnotes}"""
+
 # Image analysis prompt with text fallback
 PROMPTS["text_prompt"] = """Based on the following image information, provide analysis:
 
@@ -97,6 +130,38 @@ Footnotes: {footnotes}
 
 {vision_prompt}"""
 
+# Multi-image analysis prompt: one request describes several images
+PROMPTS[
+    "vision_batch_prompt"
+] = """Please analyze each of the {count} images below in detail. Every image is preceded by its ID, its details and the context from its surrounding content. Analyze each image independently and provide a JSON response with one entry per image ID, using exactly these IDs: {image_ids}
+
+{{
+    "<image ID>": {{
+        "detailed_description": "A comprehensive and detailed visual description of the image following these guidelines:
+        - Describe the overall composition and layout
+        - Identify all objects, people, text, and visual elements
+        - Explain relationships between elements and how they relate to the surrounding context
+        - Note colors, lighting, and visual style
+        - Describe any actions or activities shown
+        - Include technical details if relevant (charts, diagrams, etc.)
+        - Always use specific names instead of pronouns",
+        "entity_info": {{
+            "entity_name": "unique descriptive name for this image",
+            "entity_type": "image",
+            "summary": "concise summary of the image content, its significance, and relationship to surrounding content (max 100 words)"
+        }}
+    }}
+}}
+
+Focus on providing accurate, detailed visual analysis that would be useful for knowledge retrieval."""
+
+# Per-image section of the multi-image analysis prompt
+PROMPTS["vision_batch_item"] = """Image ID: {image_id}
+- Captions: {captions}
+- Footnotes: {footnotes}
+Context from surrounding content:
+{context}"""
+
 # Table analysis prompt template
 PROMPTS[
     "table_prompt"
@@ -159,6 +224,75 @@ Footnotes: {table_footnote}
 
 Focus on extracting meaningful insights and relationships from the tabular data in the context of the surrounding content."""
 
+# Table analysis prompt with a stable prefix: instructions, then page context, then item fields
+PROMPTS[
+    "table_prompt_context_first"
+] = """Please analyze the table described at the end of this message considering the surrounding context that follows, and provide a JSON response with the following structure:
+
+{{
+    "detailed_description": "A comprehensive analysis of the table including:
+    - Table structure and organization
+    - Column headers and their meanings
+    - Key data points and patterns
+    - Statistical insights and trends
+    - Relationships between data elements
+    - Significance of the data presented in relation to surrounding context
+    - How the table supports or illustrates concepts from the surrounding content
+    Always use specific names and values instead of general references.",
+    "entity_info": {{
+        "entity_name": "the Entity Name given in the table information",
+        "entity_type": "table",
+        "summary": "concise summary of the table's purpose, key findings, and relationship to surrounding content (max 100 words)"
+    }}
+}}
+
+Focus on extracting meaningful insights and relationships from the tabular data in the context of the surrounding content.
+
+Context from surrounding content:
+{context}
+
+Table Information:
+Entity Name: {entity_name}
+Image Path: {table_img_path}
+Caption: {table_caption}
+Body: {table_body}
+Footnotes: {table_footnote}"""
+
+# Multi-table analysis prompt: one request analyzes several tables
+PROMPTS[
+    "table_batch_prompt"
+] = """Please analyze each of the {count} tables below. Every table is given with its ID, its content and the context from its surrounding content. Analyze each table independently and provide a JSON response with one entry per table ID, using exactly these IDs: {item_ids}
+
+{{
+    "<table ID>": {{
+        "detailed_description": "A comprehensive analysis of the table including:
+        - Table structure and organization
+        - Column headers and their meanings
+        - Key data points and patterns
+        - Statistical insights and trends
+        - Relationships between data elements
+        - Significance of the data presented in relation to surrounding context
+        Always use specific names and values instead of general references.",
+        "entity_info": {{
+            "entity_name": "descriptive name for this table",
+            "entity_type": "table",
+            "summary": "concise summary of the table's purpose, key findings, and relationship to surrounding content (max 100 words)"
+        }}
+    }}
+}}
+
+Focus on extracting meaningful insights and relationships from the tabular data.
+
+{items}"""
+
+# Per-table section of the multi-table analysis prompt
+PROMPTS["table_batch_item"] = """Table ID: {item_id}
+Caption: {table_caption}
+Body: {table_body}
+Footnotes: {table_footnote}
+Context from surrounding content:
+{context}"""
+
 # Equation analysis prompt template
 PROMPTS[
     "equation_prompt"
@@ -219,6 +353,73 @@ Format: {equation_format}
 
 Focus on providing mathematical insights and explaining the equation's significance within the broader context."""
 
+# Equation analysis prompt with a stable prefix: instructions, then page context, then item fields
+PROMPTS[
+    "equation_prompt_context_first"
+] = """Please analyze the mathematical equation given at the end of this message considering the surrounding context that follows, and provide a JSON response with the following structure:
+
+{{
+    "detailed_description": "A comprehensive analysis of the equation including:
+    - Mathematical meaning and interpretation
+    - Variables and their definitions in the context of surrounding content
+    - Mathematical operations and functions used
+    - Application domain and context based on surrounding material
+    - Physical or theoretical significance
+    - Relationship to other mathematical concepts mentioned in the context
+    - Practical applications or use cases
+    - How the equation relates to the broader discussion or framework
+    Always use specific mathematical terminology.",
+    "entity_info": {{
+        "entity_name": "the Entity Name given in the equation information",
+        "entity_type": "equation",
+        "summary": "concise summary of the equation's purpose, significance, and role in the surrounding context (max 100 words)"
+    }}
+}}
+
+Focus on providing mathematical insights and explaining the equation's significance within the broader context.
+
+Context from surrounding content:
+{context}
+
+Equation Information:
+Entity Name: {entity_name}
+Equation: {equation_text}
+Format: {equation_format}"""
+
+# Multi-equation analysis prompt: one request analyzes several equations
+PROMPTS[
+    "equation_batch_prompt"
+] = """Please analyze each of the {count} mathematical equations below. Every equation is given with its ID, its content and the context from its surrounding content. Analyze each equation independently and provide a JSON response with one entry per equation ID, using exactly these IDs: {item_ids}
+
+{{
+    "<equation ID>": {{
+        "detailed_description": "A comprehensive analysis of the equation including:
+        - Mathematical meaning and interpretation
+        - Variables and their definitions in the context of surrounding content
+        - Mathematical operations and functions used
+        - Application domain and context
+        - Physical or theoretical significance
+        - Relationship to other mathematical concepts
+        Always use specific mathematical terminology.",
+        "entity_info": {{
+            "entity_name": "descriptive name for this equation",
+            "entity_type": "equation",
+            "summary": "concise summary of the equation's purpose, significance, and role in the surrounding context (max 100 words)"
+        }}
+    }}
+}}
+
+Focus on providing mathematical insights and explaining each equation's significance.
+
+{items}"""
+
+# Per-equation section of the multi-equation analysis prompt
+PROMPTS["equation_batch_item"] = """Equation ID: {item_id}
+Equation: {equation_text}
+Format: {equation_format}
+Context from surrounding content:
+{context}"""
+
 # Generic content analysis prompt template
 PROMPTS[
     "generic_prompt"
@@ -271,6 +472,35 @@ Content: {content}
 
 Focus on extracting meaningful information that would be useful for knowledge retrieval and understanding the content's role in the broader context."""
 
+# Generic content analysis prompt with a stable prefix: instructions, then page context, then item fields
+PROMPTS[
+    "generic_prompt_context_first"
+] = """Please analyze the {content_type} content given at the end of this message considering the surrounding context that follows, and provide a JSON response with the following structure:
+
+{{
+    "detailed_description": "A comprehensive analysis of the content including:
+    - Content structure and organization
+    - Key information and elements
+    - Relationships between components
+    - Context and significance in relation to surrounding content
+    - How this content connects to or supports the broader discussion
+    - Relevant details for knowledge retrieval
+    Always use specific terminology appropriate for {content_type} content.",
+    "entity_info": {{
+        "entity_name": "the Entity Name given with the content",
+        "entity_type": "{content_type}",
+        "summary": "concise summary of the content's purpose, key points, and relationship to surrounding context (max 100 words)"
+    }}
+}}
+
+Focus on extracting meaningful information that would be useful for knowledge retrieval and understanding the content's role in the broader context.
+
+Context from surrounding content:
+{context}
+
+Entity Name: {entity_name}
+Content: {content}"""
+
 # Modal chunk templates
 PROMPTS["image_chunk"] = """
 Image Content Analysis:
@@ -5,6 +5,7 @@ Contains all query-related methods for both text and multimodal queries
 """
 
 import json
+import asyncio
 import hashlib
 import re
 from typing import Dict, List, Any
@@ -17,6 +18,7 @@ from raganything.utils import (
     encode_image_to_base64,
     validate_image_file,
 )
+from raganything.image_preprocessor import image_mime_type
 
 
 class QueryMixin:
@@ -442,7 +444,9 @@ class QueryMixin:
 
         if image_path and Path(image_path).exists():
             # If image exists, use vision model to generate description
-            image_base64 = processor._encode_image_to_base64(image_path)
+            image_base64 = await asyncio.to_thread(
+                processor._encode_image_to_base64, image_path
+            )
             if image_base64:
                 prompt = PROMPTS["QUERY_IMAGE_DESCRIPTION"]
                 description = await processor.modal_caption_func(
@@ -642,7 +646,7 @@ class QueryMixin:
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{images_base64[image_num]}"
+                                    "url": f"data:{image_mime_type(images_base64[image_num])};base64,{images_base64[image_num]}"
                                 },
                             }
                         )
@@ -31,8 +31,24 @@ from raganything.config import RAGAnythingConfig
 from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
+from raganything.incremental import IncrementalMixin
 from raganything.utils import get_processor_supports
-from raganything.parser import MineruParser, DoclingParser
+from raganything.caption_cache import CaptionCache
+from raganything.shared_kv_storage import SharedFileKVStorage
+from raganything.parser import MineruParser, get_parser
+from raganything.mineru_worker import (
+    configure_mineru_worker_pool,
+    release_mineru_worker_pool,
+)
+from raganything.office_converter import (
+    configure_office_converter_pool,
+    release_office_converter_pool,
+)
+from raganything.image_preprocessor import configure_image_preprocessor
+from raganything.mineru_cloud import (
+    configure_mineru_cloud_client,
+    close_mineru_cloud_clients,
+)
 
 # Import specialized processors
 from raganything.modalprocessors import (
@@ -46,7 +62,7 @@ from raganything.modalprocessors import (
 
 
 @dataclass
-class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
+class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin, IncrementalMixin):
     """Multimodal Document Processing Pipeline - Complete document parsing and insertion pipeline"""
 
     # Core Components
@@ -92,6 +108,33 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     parse_cache: Optional[Any] = field(default=None, init=False)
     """Parse result cache storage using LightRAG KV storage."""
 
+    doc_fingerprints: Optional[Any] = field(default=None, init=False)
+    """Per-file page and block fingerprints used for incremental re-ingestion."""
+
+    caption_cache: Optional[CaptionCache] = field(default=None, init=False)
+    """Content-addressed cache of image, table and equation captions."""
+
+    parse_cache_stats: Dict[str, int] = field(
+        default_factory=lambda: {"hits": 0, "misses": 0, "stores": 0, "evictions": 0},
+        init=False,
+    )
+    """Parse cache hit, miss, store and eviction counters."""
+
+    _parse_cache_blob_dir: Optional[Path] = field(default=None, init=False)
+    """Directory holding the compressed content lists referenced by the parse cache."""
+
+    _parse_cache_last_flush: float = field(default=0.0, init=False)
+    """Time the parse cache KV was last written to disk."""
+
+    _parse_cache_usage: Optional[Dict[str, int]] = field(default=None, init=False)
+    """Parse result count, blob bytes and path index count, kept in memory between eviction passes."""
+
+    _mineru_worker_pool: Optional[Any] = field(default=None, init=False)
+    """Process-wide MinerU worker pool this instance holds a reference to."""
+
+    _office_converter_pool: Optional[Any] = field(default=None, init=False)
+    """Process-wide LibreOffice converter pool this instance holds a reference to."""
+
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
 
@@ -108,10 +151,42 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         self.logger = logger
 
         # Set up document parser
-        self.doc_parser = (
-            DoclingParser() if self.config.parser == "docling" else MineruParser()
+        self.doc_parser = get_parser(self.config.parser)
+
+        # Set up the warm MinerU worker pool if requested
+        if self.config.parser == "mineru" and self.config.mineru_worker_pool_size > 0:
+            self._mineru_worker_pool = configure_mineru_worker_pool(
+                self.config.mineru_worker_pool_size,
+                self.config.mineru_worker_max_jobs,
+            )
+
+        # Set up the persistent LibreOffice converter pool if requested
+        if self.config.office_converter_pool_size > 0:
+            self._office_converter_pool = configure_office_converter_pool(
+                self.config.office_converter_pool_size,
+                self.config.office_converter_max_jobs,
+                self.config.office_converter_max_pending,
+            )
+
+        # Configure the shared image preprocessor used for OCR and VLM payloads
+        configure_image_preprocessor(
+            ocr_max_edge=self.config.image_ocr_max_edge,
+            vlm_max_edge=self.config.image_vlm_max_edge,
+            vlm_format=self.config.image_vlm_format,
+            vlm_quality=self.config.image_vlm_quality,
+            cache_max_bytes=self.config.image_cache_max_mb * 1024 * 1024,
         )
 
+        # Configure the shared MinerU cloud API client
+        if self.config.parser == "mineru" and self.config.mineru_use_api:
+            configure_mineru_cloud_client(
+                batch_size=self.config.mineru_api_batch_size,
+                batch_window=self.config.mineru_api_batch_window,
+                upload_concurrency=self.config.mineru_api_upload_concurrency,
+                poll_max_interval=self.config.mineru_api_poll_max_interval,
+                timeout=self.config.mineru_api_timeout,
+            )
+
         # Register close method for cleanup
         atexit.register(self.close)
 
@@ -156,6 +231,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             include_headers=self.config.include_headers,
             include_captions=self.config.include_captions,
             filter_content_types=self.config.context_filter_content_types,
+            prompt_layout=self.config.prompt_layout,
         )
 
     def _create_context_extractor(self) -> ContextExtractor:
@@ -211,6 +287,10 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             context_extractor=self.context_extractor,
         )
 
+        for processor in self.modal_processors.values():
+            processor.caption_cache = self.caption_cache
+            processor.track_prompt_tokens = self.config.prompt_token_stats
+
         self.logger.info("Multimodal processors initialized with context support")
         self.logger.info(f"Available processors: {list(self.modal_processors.keys())}")
         self.logger.info(f"Context configuration: {self._create_context_config()}")
@@ -263,16 +343,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                         self.logger.info(
                             "Initializing parse cache for pre-provided LightRAG instance"
                         )
-                        self.parse_cache = (
-                            self.lightrag.key_string_value_json_storage_cls(
-                                namespace="parse_cache",
-                                workspace=self.lightrag.workspace,
-                                global_config=self.lightrag.__dict__,
-                                embedding_func=self.embedding_func,
-                            )
-                        )
+                        self.parse_cache = self._create_parse_cache()
                         await self.parse_cache.initialize()
 
+                    # Initialize fingerprint storage for incremental re-ingestion
+                    await self._initialize_doc_fingerprints()
+                    await self._initialize_caption_cache()
+
                     # Initialize processors if not already done
                     if not self.modal_processors:
                         self._initialize_processors()
@@ -325,14 +402,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 await initialize_pipeline_status()
 
                 # Initialize parse cache storage using LightRAG's KV storage
-                self.parse_cache = self.lightrag.key_string_value_json_storage_cls(
-                    namespace="parse_cache",
-                    workspace=self.lightrag.workspace,
-                    global_config=self.lightrag.__dict__,
-                    embedding_func=self.embedding_func,
-                )
+                self.parse_cache = self._create_parse_cache()
                 await self.parse_cache.initialize()
 
+                # Initialize fingerprint storage for incremental re-ingestion
+                await self._initialize_doc_fingerprints()
+                await self._initialize_caption_cache()
+
                 # Initialize processors after LightRAG is ready
                 self._initialize_processors()
 
@@ -381,11 +457,43 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 tasks.append(self.parse_cache.finalize())
                 self.logger.debug("Scheduled parse cache finalization")
 
+            # Finalize document fingerprints if they exist
+            if self.doc_fingerprints is not None:
+                tasks.append(self.doc_fingerprints.finalize())
+
+            # Finalize caption cache if it exists
+            if self.caption_cache is not None:
+                tasks.append(self.caption_cache.finalize())
+
             # Finalize LightRAG storages if LightRAG is initialized
             if self.lightrag is not None:
                 tasks.append(self.lightrag.finalize_storages())
                 self.logger.debug("Scheduled LightRAG storages finalization")
 
+            # Release the shared worker pools; the last instance using a pool stops it
+            if self._mineru_worker_pool is not None:
+                tasks.append(
+                    asyncio.to_thread(
+                        release_mineru_worker_pool, self._mineru_worker_pool
+                    )
+                )
+                self._mineru_worker_pool = None
+                self.logger.debug("Scheduled MinerU worker pool release")
+
+            if self._office_converter_pool is not None:
+                tasks.append(
+                    asyncio.to_thread(
+                        release_office_converter_pool, self._office_converter_pool
+                    )
+                )
+                self._office_converter_pool = None
+                self.logger.debug("Scheduled office converter pool release")
+
+            # Close the MinerU cloud API sessions opened on this event loop
+            if self.config.mineru_use_api:
+                tasks.append(close_mineru_cloud_clients())
+                self.logger.debug("Scheduled MinerU cloud API client shutdown")
+
             # Run all finalization tasks concurrently
             if tasks:
                 await asyncio.gather(*tasks)
@@ -417,22 +525,138 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             self.logger.info(f"Parser '{self.config.parser}' installation verified")
         return True
 
+    def _create_parse_cache(self):
+        """
+        Create the parse cache storage using LightRAG's KV storage class
+
+        The KV storage holds entry metadata; parsed content lists are written
+        to compressed blobs in a ``parse_cache_blobs`` directory beside it.
+
+        Cache keys are content digests, so when ``parse_cache_dir`` is set every
+        instance on the host shares one cache under a fixed workspace instead of
+        keeping one per knowledge base. That cache uses a per-entry file storage
+        with atomic writes, since several processes may update it at once.
+
+        Returns:
+            The parse cache storage (not yet initialized)
+        """
+        if self.config.parse_cache_dir:
+            shared_dir = Path(self.config.parse_cache_dir) / "raganything_shared"
+            self._parse_cache_blob_dir = shared_dir / "parse_cache_blobs"
+            return SharedFileKVStorage(shared_dir / "parse_cache")
+
+        global_config = self.lightrag.__dict__
+        workspace = self.lightrag.workspace
+
+        # Content lists are stored next to the KV file, one blob per entry
+        self._parse_cache_blob_dir = (
+            Path(global_config["working_dir"]) / (workspace or "") / "parse_cache_blobs"
+        )
+        return self.lightrag.key_string_value_json_storage_cls(
+            namespace="parse_cache",
+            workspace=workspace,
+            global_config=global_config,
+            embedding_func=self.embedding_func,
+        )
+
+    async def _initialize_doc_fingerprints(self):
+        """Create the document fingerprint storage when incremental re-ingestion is enabled"""
+        if not self.config.incremental_reingest or self.doc_fingerprints is not None:
+            return
+        self.doc_fingerprints = self.lightrag.key_string_value_json_storage_cls(
+            namespace="doc_fingerprints",
+            workspace=self.lightrag.workspace,
+            global_config=self.lightrag.__dict__,
+            embedding_func=self.embedding_func,
+        )
+        await self.doc_fingerprints.initialize()
+
+    async def _initialize_caption_cache(self):
+        """Create the caption cache storage when caption caching is enabled"""
+        if not self.config.enable_caption_cache or self.caption_cache is not None:
+            return
+        if not self.config.caption_model_name:
+            # A model function's name does not change with the model behind it
+            self.logger.warning(
+                "Caption cache disabled: ENABLE_CAPTION_CACHE requires CAPTION_MODEL_NAME "
+                "to identify the caption models"
+            )
+            return
+        storage = self.lightrag.key_string_value_json_storage_cls(
+            namespace="caption_cache",
+            workspace=self.lightrag.workspace,
+            global_config=self.lightrag.__dict__,
+            embedding_func=self.embedding_func,
+        )
+        await storage.initialize()
+        self.caption_cache = CaptionCache(
+            storage,
+            model_name=self.config.caption_model_name,
+            include_context=self.config.caption_cache_include_context,
+            max_entries=self.config.caption_cache_max_entries,
+            flush_interval=self.config.parse_cache_flush_interval,
+        )
+
     def get_config_info(self) -> Dict[str, Any]:
         """Get current configuration information"""
         config_info = {
             "directory": {
                 "working_dir": self.config.working_dir,
                 "parser_output_dir": self.config.parser_output_dir,
+                "parse_cache_dir": self.config.parse_cache_dir,
             },
             "parsing": {
                 "parser": self.config.parser,
                 "parse_method": self.config.parse_method,
                 "display_content_stats": self.config.display_content_stats,
+                "native_text_parsing": self.config.native_text_parsing,
+                "native_office_parsing": self.config.native_office_parsing,
+                "mineru_use_api": self.config.mineru_use_api,
+                "mineru_api_batch_size": self.config.mineru_api_batch_size,
+                "mineru_api_batch_window": self.config.mineru_api_batch_window,
+                "mineru_api_poll_max_interval": self.config.mineru_api_poll_max_interval,
+                "mineru_worker_pool_size": self.config.mineru_worker_pool_size,
+                "mineru_worker_max_jobs": self.config.mineru_worker_max_jobs,
+                "mineru_group_size": self.config.mineru_group_size,
+                "pdf_preflight": self.config.pdf_preflight,
+                "pdf_preflight_min_range_pages": self.config.pdf_preflight_min_range_pages,
+                "pdf_preflight_max_ranges": self.config.pdf_preflight_max_ranges,
+                "office_converter_pool_size": self.config.office_converter_pool_size,
+                "office_converter_max_jobs": self.config.office_converter_max_jobs,
+                "mineru_shard_pages": self.config.mineru_shard_pages,
+                "mineru_max_shard_workers": self.config.mineru_max_shard_workers,
+                "stream_processing": self.config.stream_processing,
+                "incremental_reingest": self.config.incremental_reingest,
+                "stream_buffer_size": self.config.stream_buffer_size,
+            },
+            "parse_cache": {
+                "max_entries": self.config.parse_cache_max_entries,
+                "max_mb": self.config.parse_cache_max_mb,
+                "flush_interval": self.config.parse_cache_flush_interval,
+                "stats": dict(self.parse_cache_stats),
             },
             "multimodal_processing": {
                 "enable_image_processing": self.config.enable_image_processing,
                 "enable_table_processing": self.config.enable_table_processing,
                 "enable_equation_processing": self.config.enable_equation_processing,
+                "image_ocr_max_edge": self.config.image_ocr_max_edge,
+                "image_vlm_max_edge": self.config.image_vlm_max_edge,
+                "image_vlm_format": self.config.image_vlm_format,
+                "image_vlm_quality": self.config.image_vlm_quality,
+                "image_cache_max_mb": self.config.image_cache_max_mb,
+                "enable_caption_cache": self.config.enable_caption_cache,
+                "caption_cache_include_context": self.config.caption_cache_include_context,
+                "caption_cache_max_entries": self.config.caption_cache_max_entries,
+                "caption_model_name": self.config.caption_model_name,
+                "enable_image_dedup": self.config.enable_image_dedup,
+                "image_dedup_max_distance": self.config.image_dedup_max_distance,
+                "image_caption_batch_size": self.config.image_caption_batch_size,
+                "image_caption_batch_max_kb": self.config.image_caption_batch_max_kb,
+                "llm_analysis_batch_size": self.config.llm_analysis_batch_size,
+                "batch_table_max_chars": self.config.batch_table_max_chars,
+                "caption_cache_stats": dict(self.caption_cache.stats)
+                if self.caption_cache
+                else {},
             },
             "context_extraction": {
                 "context_window": self.config.context_window,
@@ -441,6 +665,8 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "include_headers": self.config.include_headers,
                 "include_captions": self.config.include_captions,
                 "filter_content_types": self.config.context_filter_content_types,
+                "prompt_layout": self.config.prompt_layout,
+                "prompt_token_stats": self.config.prompt_token_stats,
             },
             "batch_processing": {
                 "max_concurrent_files": self.config.max_concurrent_files,
@@ -563,6 +789,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                     "class": processor.__class__.__name__,
                     "supports": get_processor_supports(proc_type),
                     "enabled": True,
+                    "prompt_stats": processor.get_prompt_stats(),
                 }
 
         return base_info
@@ -0,0 +1,109 @@
+"""
+Key-value storage that several processes can share safely
+
+LightRAG's JSON KV storage keeps the namespace in memory and rewrites the whole
+file on flush, so two processes using the same directory overwrite each
+other's entries. This storage keeps one JSON file per entry instead and writes
+it through an atomic rename: a write never loses another process's entries, and
+readers never see a partially written file. It backs the parse cache when
+``parse_cache_dir`` points several RAGAnything instances at one directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class SharedFileKVStorage:
+    """
+    Per-entry file KV storage with the subset of the LightRAG KV interface
+    used by the parse cache
+
+    Every write goes to disk immediately, so ``index_done_callback`` has
+    nothing left to flush.
+    """
+
+    def __init__(self, directory: str | Path):
+        """
+        Args:
+            directory: Directory holding one file per entry
+        """
+        self.directory = Path(directory)
+
+    def _entry_path(self, key: str) -> Path:
+        # Keys may contain any characters; the file name is derived from them
+        return (
+            self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+        )
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=".entry-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    async def initialize(self) -> None:
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+
+    async def finalize(self) -> None:
+        """Nothing to flush: entries are written when they are stored"""
+
+    async def index_done_callback(self) -> None:
+        """Nothing to flush: entries are written when they are stored"""
+
+    async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        record = await asyncio.to_thread(self._read, self._entry_path(id))
+        return record["value"] if record else None
+
+    async def get_by_ids(self, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        return [await self.get_by_id(id) for id in ids]
+
+    async def get_all(self) -> Dict[str, Dict[str, Any]]:
+        def read_all() -> Dict[str, Dict[str, Any]]:
+            entries = {}
+            for path in self.directory.glob("*.json"):
+                record = self._read(path)
+                if record:
+                    entries[record["key"]] = record["value"]
+            return entries
+
+        return await asyncio.to_thread(read_all)
+
+    async def upsert(self, data: Dict[str, Dict[str, Any]]) -> None:
+        def write_all() -> None:
+            for key, value in data.items():
+                self._write(key, value)
+
+        await asyncio.to_thread(write_all)
+
+    async def delete(self, ids: List[str]) -> None:
+        def remove_all() -> None:
+            for id in ids:
+                try:
+                    self._entry_path(id).unlink()
+                except FileNotFoundError:
+                    pass
+
+        await asyncio.to_thread(remove_all)
@@ -4,10 +4,10 @@ Utility functions for RAGAnything
 Contains helper functions for content separation, text insertion, and other utilities
 """
 
-import base64
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
 from lightrag.utils import logger
+from raganything.image_preprocessor import get_image_preprocessor
 
 
 def separate_content(
@@ -60,6 +60,9 @@ def encode_image_to_base64(image_path: str) -> str:
     """
     Encode image file to base64 string
 
+    The image is orientation-fixed, downscaled and re-encoded by the shared
+    image preprocessor, and the result is cached by content hash.
+
     Args:
         image_path: Path to the image file
 
@@ -67,9 +70,7 @@ def encode_image_to_base64(image_path: str) -> str:
         str: Base64 encoded string, empty string if encoding fails
     """
     try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-        return encoded_string
+        return get_image_preprocessor().encode_for_vlm(image_path)
     except Exception as e:
         logger.error(f"Failed to encode image {image_path}: {e}")
         return ""
@@ -0,0 +1,356 @@
+"""
+Shared machinery for pools of long-lived worker processes
+
+Used by the MinerU worker pool and the LibreOffice converter pool. A pool
+hands idle workers to callers through a thread-safe queue, so it can be shared
+by several event loops; coroutines wait for an idle worker on their own event
+loop instead of in an executor thread. Workers are health-checked when
+acquired, replaced when they die and recycled after ``max_jobs_per_worker``
+jobs to bound memory growth. ``SharedPool`` holds the process-wide instance of
+a pool type and shuts it down when its last user releases it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+
+class WorkerPoolUnavailable(RuntimeError):
+    """Raised when a pool cannot run a job and the caller should use its fallback"""
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+WorkerT = TypeVar("WorkerT")
+PoolT = TypeVar("PoolT", bound="WorkerPool")
+
+
+class WorkerPool(Generic[WorkerT]):
+    """
+    Base class for pools of worker processes
+
+    Workers must provide ``start()``, ``is_alive()``, ``ping()``, ``stop()``
+    and a ``jobs_done`` counter. Subclasses implement ``_create_worker`` and
+    ``settings`` and run their jobs between ``_acquire`` and ``_release``.
+    """
+
+    # Prefix of log messages, e.g. "[MinerU]"
+    log_prefix = "[Pool]"
+
+    # Exception raised when the pool cannot take a job
+    unavailable_error = WorkerPoolUnavailable
+
+    # Seconds between checks of the closed flag while waiting for a worker
+    ACQUIRE_POLL_INTERVAL = 0.5
+
+    def __init__(self, size: int = 1, max_jobs_per_worker: int = 0):
+        """
+        Args:
+            size: Number of worker processes
+            max_jobs_per_worker: Restart a worker after this many jobs (0 disables recycling)
+        """
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        self._idle: "queue.Queue[WorkerT]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._unavailable_reason: Optional[str] = None
+        # Coroutines waiting for an idle worker, woken from any thread
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._waiters_lock = threading.Lock()
+        self.stats = {"jobs": 0, "failures": 0, "restarts": 0, "recycled": 0}
+
+    @property
+    def available(self) -> bool:
+        return not self._closed and self._unavailable_reason is None
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Options the pool was created with, compared by ``SharedPool.configure``"""
+        return {"size": self.size, "max_jobs_per_worker": self.max_jobs_per_worker}
+
+    def _create_worker(self) -> WorkerT:
+        """Return a new, not yet started worker"""
+        raise NotImplementedError
+
+    def _new_worker(self) -> WorkerT:
+        worker = self._create_worker()
+        worker.start()
+        return worker
+
+    def start(self) -> None:
+        """Start all workers; blocks until they are ready"""
+        with self._lock:
+            if self._started or not self.available:
+                return
+            try:
+                for _ in range(self.size):
+                    self._idle.put(self._new_worker())
+            except WorkerPoolUnavailable as e:
+                self._unavailable_reason = str(e)
+                logging.warning(f"{self.log_prefix} Worker pool disabled: {e}")
+                self._drain()
+                return
+            self._started = True
+            logging.info(
+                f"{self.log_prefix} Started worker pool with {self.size} workers"
+            )
+
+    def health_check(self) -> int:
+        """
+        Ping every idle worker and replace the ones that do not answer
+
+        Returns:
+            int: Number of workers that were replaced
+        """
+        replaced = 0
+        checked = []
+        while True:
+            try:
+                checked.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in checked:
+            if not worker.ping():
+                worker = self._replace(worker)
+                replaced += 1
+            self._put_idle(worker)
+        return replaced
+
+    def _put_idle(self, worker: WorkerT) -> None:
+        """Return a worker to the idle queue and wake waiting coroutines"""
+        self._idle.put(worker)
+        self._notify_waiters()
+
+    def _notify_waiters(self) -> None:
+        # Every waiter retries; those that find no idle worker wait again
+        with self._waiters_lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                pass
+
+    def _replace(self, worker: WorkerT) -> WorkerT:
+        """
+        Stop a worker and start a new one in its place
+
+        When the new worker cannot start, an unstarted worker is returned so
+        the pool size stays stable and the next acquire retries the start.
+        """
+        worker.stop()
+        if self._closed:
+            # Nothing will run on it; _release stops the unstarted worker
+            return self._create_worker()
+        self.stats["restarts"] += 1
+        try:
+            return self._new_worker()
+        except WorkerPoolUnavailable as e:
+            logging.error(f"{self.log_prefix} Could not restart worker: {e}")
+            self.stats["failures"] += 1
+            return self._create_worker()
+
+    def _acquire(self) -> WorkerT:
+        """
+        Take the next idle worker, replacing it if it does not answer a ping
+
+        Waits in short intervals so that callers blocked on a busy pool notice
+        a shutdown instead of waiting forever.
+
+        Raises:
+            WorkerPoolUnavailable: If the pool is closed or no worker is healthy
+        """
+        self.start()
+        if not self.available:
+            raise self.unavailable_error(
+                self._unavailable_reason or "Worker pool closed"
+            )
+
+        while True:
+            if self._closed:
+                raise self.unavailable_error("Worker pool closed")
+            try:
+                worker = self._idle.get(timeout=self.ACQUIRE_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        return self._check_acquired(worker)
+
+    async def _wait_for_idle(self) -> WorkerT:
+        """
+        Take the next idle worker without holding a thread while waiting
+
+        The worker is not health-checked yet: pass it to `_check_acquired`,
+        from a thread, before running a job on it.
+
+        Raises:
+            WorkerPoolUnavailable: If the pool is closed
+        """
+        if not self._started:
+            await asyncio.to_thread(self.start)
+        if not self.available:
+            raise self.unavailable_error(
+                self._unavailable_reason or "Worker pool closed"
+            )
+
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._closed:
+                raise self.unavailable_error("Worker pool closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            waiter = loop.create_future()
+            with self._waiters_lock:
+                self._waiters.append((loop, waiter))
+            try:
+                # A worker released before the waiter was registered
+                if self._idle.empty() and not self._closed:
+                    await waiter
+            finally:
+                with self._waiters_lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _check_acquired(self, worker: WorkerT) -> WorkerT:
+        """
+        Ping a worker taken from the idle queue, replacing it if it does not answer
+
+        Raises:
+            WorkerPoolUnavailable: If the pool is closed or no worker is healthy
+        """
+        if self._closed:
+            worker.stop()
+            raise self.unavailable_error("Worker pool closed")
+        if not worker.ping():
+            worker = self._replace(worker)
+            if not worker.is_alive():
+                self._put_idle(worker)
+                raise self.unavailable_error("No healthy worker available")
+        return worker
+
+    def _release(self, worker: WorkerT) -> None:
+        """Return a worker to the pool, recycling it once it has served enough jobs"""
+        if (
+            not self._closed
+            and self.max_jobs_per_worker
+            and worker.jobs_done >= self.max_jobs_per_worker
+        ):
+            logging.info(
+                f"{self.log_prefix} Recycling worker after {worker.jobs_done} jobs"
+            )
+            self.stats["recycled"] += 1
+            worker = self._replace(worker)
+        if self._closed:
+            worker.stop()
+        else:
+            self._put_idle(worker)
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy workers stop when their job returns"""
+        self._closed = True
+        self._drain()
+        self._notify_waiters()
+        logging.info(f"{self.log_prefix} Worker pool shut down")
+
+
+class SharedPool(Generic[PoolT]):
+    """
+    Process-wide instance of a worker pool type
+
+    Every ``configure`` call that returns a pool counts as one user, and the
+    pool is shut down when the last user calls ``release``, so one owner
+    finishing does not stop the pool for the others. The pool is also shut
+    down at interpreter exit.
+    """
+
+    def __init__(self):
+        self._pool: Optional[PoolT] = None
+        self._users = 0
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def configure(
+        self, settings: Dict[str, Any], factory: Callable[[], PoolT]
+    ) -> Optional[PoolT]:
+        """
+        Create the pool, or keep the existing one if its settings are unchanged
+
+        A pool with different settings is shut down first. A size of 0 only
+        shuts the pool down. Each returned pool must be handed back to
+        ``release`` once the caller no longer needs it.
+
+        Args:
+            settings: Settings of the wanted pool, including "size"
+            factory: Creates the pool from these settings
+
+        Returns:
+            Optional[PoolT]: The active pool, or None if disabled
+        """
+        with self._lock:
+            if self._pool is not None:
+                if (
+                    settings["size"] > 0
+                    and self._pool.available
+                    and self._pool.settings == settings
+                ):
+                    self._users += 1
+                    return self._pool
+                self._pool.shutdown()
+                self._pool = None
+                self._users = 0
+            if settings["size"] > 0:
+                self._pool = factory()
+                self._users = 1
+            return self._pool
+
+    def release(self, pool: Optional[PoolT]) -> None:
+        """
+        Drop one user of a pool returned by ``configure``
+
+        The pool is shut down when it has no users left. Releasing a pool that
+        was already replaced or shut down does nothing.
+        """
+        with self._lock:
+            if pool is None or pool is not self._pool:
+                return
+            self._users -= 1
+            if self._users <= 0:
+                self._pool.shutdown()
+                self._pool = None
+                self._users = 0
+
+    def get(self) -> Optional[PoolT]:
+        """Return the pool if one is configured and usable"""
+        pool = self._pool
+        if pool is not None and pool.available:
+            return pool
+        return None
+
+    def shutdown(self) -> None:
+        """Stop the pool if one exists, whatever its number of users"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+                self._users = 0
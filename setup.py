@@ -63,7 +63,22 @@ extras_require = {
     "image": ["Pillow>=10.0.0"],  # For image format conversion (BMP, TIFF, GIF, WebP)
     "text": ["reportlab>=4.0.0"],  # For text file to PDF conversion (TXT, MD)
     "office": [],  # Office document processing requires LibreOffice (external program)
-    "all": ["Pillow>=10.0.0", "reportlab>=4.0.0"],  # All optional features
+    "docling": ["ijson>=3.2.0"],  # Streaming Docling JSON conversion
+    "pymupdf": ["pymupdf>=1.24.0"],  # Text-layer PDF parser (PARSER=pymupdf)
+    "office-native": [
+        "python-docx>=1.1.0",
+        "python-pptx>=0.6.21",
+        "openpyxl>=3.1.0",
+    ],  # Native DOCX/PPTX/XLSX extraction without LibreOffice
+    "all": [
+        "Pillow>=10.0.0",
+        "reportlab>=4.0.0",
+        "ijson>=3.2.0",
+        "python-docx>=1.1.0",
+        "python-pptx>=0.6.21",
+        "openpyxl>=3.1.0",
+        "pymupdf>=1.24.0",
+    ],  # All optional features
     "markdown": [
         "markdown>=3.4.0",
         "weasyprint>=60.0",